@@ -0,0 +1,104 @@
+"""
+Benchmark for loading an Open Data dataset at startup.
+
+Compares parsing the UTF-16 CSV with pd.read_csv(engine="pyarrow") against loading the
+memory-mapped Arrow IPC copy that download_datasets keeps next to it. Each load runs in a
+fresh subprocess so neither path benefits from warm interpreter state; only the load itself
+is timed, not the interpreter start or imports. The OS page cache is not dropped (that needs
+root), so numbers reflect parse/decode cost rather than cold disk reads.
+
+Usage: python benchmarks/bench_dataset_load.py [--rows N] [--csv path/to/course_schedule.csv] [--rounds R]
+"""
+
+import argparse
+import hashlib
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+BENCH_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BENCH_ROOT)
+from utils.concordia_api_utils import ConcordiaAPIUtils, SCHEDULE_COLUMNS, CATALOG_NBR
+
+LOAD_SCRIPT = """
+import sys, time
+sys.path.append({root!r})
+import pandas as pd
+from utils.concordia_api_utils import ConcordiaAPIUtils
+api = ConcordiaAPIUtils(cache_dir={cache_dir!r})
+start = time.perf_counter()
+if {use_arrow!r}:
+    df = api._read_arrow_cache({arrow_path!r}, {digest!r})
+else:
+    df = pd.read_csv({csv_path!r}, engine="pyarrow", encoding="utf-16")
+assert df is not None and len(df) == {rows!r}
+print(time.perf_counter() - start)
+"""
+
+
+def build_dataset(num_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    num_courses = max(1, num_rows // 12)
+    course_idx = rng.integers(0, num_courses, size=num_rows)
+    data = {column: rng.choice(["", "Y", "N", "LEC", "H937"], size=num_rows) for column in SCHEDULE_COLUMNS.values()}
+    data["Course ID"] = 1000 + course_idx
+    data["Subject"] = np.array([f"S{i % 400:03d}" for i in range(num_courses)])[course_idx]
+    data[CATALOG_NBR] = np.array([str(200 + i // 400) for i in range(num_courses)])[course_idx]
+    data["Enrollment Capacity"] = rng.integers(0, 300, size=num_rows)
+    return pd.DataFrame(data)
+
+
+def sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def time_load(use_arrow, rounds, **params):
+    script = LOAD_SCRIPT.format(root=BENCH_ROOT, use_arrow=use_arrow, **params)
+    timings = []
+    for _ in range(rounds):
+        out = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--csv", help="Use a downloaded UTF-16 Open Data CSV instead of synthetic rows")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        csv_path = args.csv
+        if not csv_path:
+            csv_path = os.path.join(cache_dir, "course_schedule.csv")
+            build_dataset(args.rows).to_csv(csv_path, index=False, encoding="utf-16")
+        digest = sha256_of(csv_path)
+
+        api = ConcordiaAPIUtils(cache_dir=cache_dir)
+        df = api._load_dataset("course_schedule", csv_path, digest)
+        arrow_path = os.path.join(cache_dir, "course_schedule.arrow")
+        print(f"Dataset: {len(df)} rows, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+              f"Arrow {os.path.getsize(arrow_path) / 1e6:.1f} MB")
+
+        params = dict(cache_dir=cache_dir, csv_path=csv_path, arrow_path=arrow_path, digest=digest, rows=len(df))
+        csv_times = time_load(False, args.rounds, **params)
+        arrow_times = time_load(True, args.rounds, **params)
+
+    csv_median, arrow_median = statistics.median(csv_times), statistics.median(arrow_times)
+    print(f"UTF-16 CSV (read_csv):    median {csv_median:.3f}s  min {min(csv_times):.3f}s")
+    print(f"Arrow IPC (memory-map):   median {arrow_median:.3f}s  min {min(arrow_times):.3f}s")
+    print(f"Speedup: {csv_median / arrow_median:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Microbenchmarks for the regex hot paths of the transcript parser and parsing_utils.
+
+Each case times one call, in ns, of the previous implementation (re.match/re.sub with string patterns, and the
+seven-substitution clean_text) against the current one built on utils.regex_utils, over real inputs: the words
+of the sample transcripts in backend/performance/test-pdfs and the text of the catalog HTML fixtures.
+Both implementations are checked to return the same results first.
+
+Usage: python benchmarks/bench_regex.py [--pdf-dir dir] [--repeat R]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+BENCH_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BENCH_ROOT)
+import fitz  # PyMuPDF
+from bs4 import BeautifulSoup
+from unidecode import unidecode
+from parser import transcript_parser
+from utils import parsing_utils
+from utils.regex_utils import DECIMAL_TWO_PLACES_RE
+
+DEFAULT_PDF_DIR = os.path.join(BENCH_ROOT, "..", "performance", "test-pdfs", "transcripts")
+HTML_FIXTURE_DIR = os.path.join(BENCH_ROOT, "tests", "fixtures", "html")
+
+
+def legacy_is_course_code(text):
+    if not text:
+        return False
+    text = text.strip()
+    if re.match(r'^[A-Z]{2,4}$', text):
+        return text not in transcript_parser.EXCLUDED_COURSE_CODES
+    return False
+
+
+def legacy_is_course_number(text):
+    if not text:
+        return False
+    return re.match(r'^\d{3}$', text.strip()) is not None
+
+
+def legacy_extract_term_from_text(text):
+    pattern = r'^(Winter|Summer|Fall|Spring|Fall/Winter|Winter/Summer)\s+(\d{4}(?:-\d{2})?)$'
+    match = re.match(pattern, text.strip())
+    if match:
+        return {'term': match.group(1), 'year': match.group(2)}
+    return None
+
+
+def legacy_is_decimal(text):
+    return re.match(r'^\d+\.\d{2}$', text) is not None
+
+
+def legacy_clean_text(text):
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = text.replace('B Eng', 'BEng')
+    text = text.replace('B Comp Sc', 'BCompSc')
+    text = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', text)
+    text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)
+    text = text.replace('–', "EM_DASH")
+    text = unidecode(text)
+    text = text.replace("EM_DASH", '–')
+    text = text.replace("--", "–")
+    text = re.sub(r'(\d+)\s*\.\s*(?=\d)', r'\1.', text)
+    text = re.sub(r'\s*([,:;])\s*', r'\1 ', text)
+    text = re.sub(r'\s*(\.)(?!\d)\s*', r'\1 ', text)
+    text = re.sub(r'\s+', ' ', text.strip())
+    return text
+
+
+def load_transcript_words(pdf_dir):
+    words = []
+    for path in sorted(glob.glob(os.path.join(pdf_dir, "*.pdf"))):
+        with fitz.open(path) as doc:
+            for page in doc:
+                words.extend(word[4].strip() for word in page.get_text("words"))
+    return words
+
+
+def load_catalog_texts():
+    texts = []
+    for path in sorted(glob.glob(os.path.join(HTML_FIXTURE_DIR, "*.html"))):
+        with open(path) as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        texts.extend(text for text in soup.stripped_strings if "EM_DASH" not in text)
+    return texts
+
+
+def ns_per_call(fn, inputs, repeat):
+    def run():
+        for value in inputs:
+            fn(value)
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(inputs) * 1e9
+
+
+def compare(label, legacy, current, inputs, repeat):
+    assert [legacy(value) for value in inputs] == [current(value) for value in inputs], f"{label}: results differ"
+    legacy_ns, current_ns = ns_per_call(legacy, inputs, repeat), ns_per_call(current, inputs, repeat)
+    print(f"{label:<24} {legacy_ns:9.0f} ns  {current_ns:9.0f} ns  {legacy_ns / current_ns:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf-dir", default=DEFAULT_PDF_DIR)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    words = load_transcript_words(args.pdf_dir)
+    catalog_texts = load_catalog_texts()
+    print(f"{len(words)} transcript words, {len(catalog_texts)} catalog strings")
+    print(f"{'':<24} {'legacy':>12}  {'current':>12}  speedup")
+    compare("is_course_code", legacy_is_course_code, transcript_parser.is_course_code, words, args.repeat)
+    compare("is_course_number", legacy_is_course_number, transcript_parser.is_course_number, words, args.repeat)
+    compare("extract_term_from_text", legacy_extract_term_from_text, transcript_parser.extract_term_from_text,
+            words, args.repeat)
+    compare("decimal check", legacy_is_decimal, lambda text: DECIMAL_TWO_PLACES_RE.match(text) is not None,
+            words, args.repeat)
+    compare("clean_text", legacy_clean_text, parsing_utils.clean_text, catalog_texts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark for formatting the course schedule dataset during ingestion.
+
+Compares the original path (fillna + to_dict per course group, a 42-key dict per section row,
+then json.dumps) with the columnar formatter that renames and pads the whole DataFrame once
+and assembles each course's JSON from pre-encoded rows. Reports CPU time and peak traced memory.
+
+Usage: python benchmarks/bench_schedule_formatting.py [--rows N] [--csv path/to/course_schedule.csv]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.concordia_api_utils import ConcordiaAPIUtils, SCHEDULE_COLUMNS, CATALOG_NBR
+
+
+def build_dataset(num_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    num_courses = max(1, num_rows // 12)
+    course_idx = rng.integers(0, num_courses, size=num_rows)
+    data = {column: rng.choice(["", "Y", "N", "LEC", "H937"], size=num_rows) for column in SCHEDULE_COLUMNS.values()}
+    data["Course ID"] = 1000 + course_idx
+    data["Subject"] = np.array([f"S{i % 400:03d}" for i in range(num_courses)])[course_idx]
+    data[CATALOG_NBR] = np.array([str(200 + i // 400) for i in range(num_courses)])[course_idx]
+    data["Enrollment Capacity"] = rng.integers(0, 300, size=num_rows)
+    data["Waitlist Capacity"] = np.where(rng.random(num_rows) < 0.1, np.nan, 10.0)
+    return pd.DataFrame(data)
+
+
+def row_dict_path(api, df):
+    for course_code, group in df.groupby("course_code"):
+        raw_sections = group.drop(columns=["course_code"]).fillna("").to_dict(orient="records")
+        yield course_code, json.dumps(api.format_course_schedule_response(raw_sections))
+
+
+def columnar_path(api, df):
+    return api.iter_course_schedule_json(df, key_column="course_code")
+
+
+def consume(fn, *args):
+    # Stream the values like write_to_redis does instead of keeping them all
+    return sum(len(value) for _, value in fn(*args))
+
+
+def measure(fn, *args):
+    start = time.process_time()
+    consume(fn, *args)
+    elapsed = time.process_time() - start
+
+    tracemalloc.start()
+    consume(fn, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--csv", help="Use a downloaded CU_SR_OPEN_DATA_SCHED.csv instead of synthetic rows")
+    args = parser.parse_args()
+
+    if args.csv:
+        df = pd.read_csv(args.csv, engine="pyarrow", encoding="utf-16")
+    else:
+        df = build_dataset(args.rows)
+    df["course_code"] = df["Subject"].str.strip() + df[CATALOG_NBR].astype(str).str.strip()
+    print(f"Dataset: {len(df)} rows, {df['course_code'].nunique()} courses")
+
+    api = ConcordiaAPIUtils(cache_dir="")
+    before = dict(row_dict_path(api, df))
+    after = dict(columnar_path(api, df))
+    assert before.keys() == after.keys()
+    assert all(json.loads(before[k]) == json.loads(after[k]) for k in before), "Formatted schedules differ"
+    del before, after
+
+    before_cpu, before_peak = measure(row_dict_path, api, df)
+    after_cpu, after_peak = measure(columnar_path, api, df)
+    print(f"Row dicts: {before_cpu:7.2f}s CPU, peak {before_peak / 2**20:7.1f} MiB")
+    print(f"Columnar:  {after_cpu:7.2f}s CPU, peak {after_peak / 2**20:7.1f} MiB")
+    print(f"Speedup:   {before_cpu / after_cpu:7.1f}x, peak memory {before_peak / after_peak:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
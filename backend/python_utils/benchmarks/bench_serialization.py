@@ -0,0 +1,105 @@
+"""
+Benchmark for encoding the catalog endpoints' response bodies.
+
+Compares what /get-all-courses and /scrape-all-degrees used to do, jsonify(serialize(...)) (model_dump,
+a second recursive walk, then Flask's JSON encoder), against models.serialize_json, which encodes the
+list of models in one pass with pydantic's serializer. Both outputs are decoded and checked to be equal.
+
+Courses come from a course catalog snapshot (--snapshot, e.g. the cache's course_catalog_snapshot.json)
+or are generated synthetically; degrees are the expected fixtures in tests/fixtures/expected, repeated
+--degree-copies times.
+
+Usage: python benchmarks/bench_serialization.py [--snapshot path] [--courses N] [--degree-copies N] [--rounds R]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BENCH_ROOT)
+from flask import Flask
+from models import (
+    Course, CourseCatalogSnapshot, MinCoursesFromSetParams, ProgramRequirements, Rule, RuleType,
+    serialize, serialize_json,
+)
+
+EXPECTED_FIXTURE_DIR = os.path.join(BENCH_ROOT, "tests", "fixtures", "expected")
+
+
+def build_courses(num_courses):
+    courses = []
+    for i in range(num_courses):
+        prereqs = [f"S{(i + k) % 400:03d} {200 + (i + k) // 400}" for k in range(1, 3)]
+        courses.append(Course(
+            _id=f"S{i % 400:03d} {200 + i // 400}",
+            title=f"Synthetic Course {i}",
+            credits=3.0,
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6,
+            offeredIn=["Fall 2025", "Winter 2026"],
+            prereqCoreqText=f"Course {prereqs[0]} previously or concurrently; {prereqs[1]} previously.",
+            notes="Students who have received credit for a similar course may not take this course for credit.",
+            components=["Lecture", "Tutorial"],
+            rules=[Rule(type=RuleType.PREREQUISITE, params=MinCoursesFromSetParams(courseList=prereqs, minCourses=1))],
+        ))
+    return courses
+
+
+def load_degrees(copies):
+    degrees = []
+    for path in sorted(glob.glob(os.path.join(EXPECTED_FIXTURE_DIR, "*.json"))):
+        with open(path) as f:
+            degrees.append(ProgramRequirements.model_validate(json.load(f)))
+    return degrees * copies
+
+
+def time_encoding(encode, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        body = encode()
+        timings.append(time.perf_counter() - start)
+    return timings, body
+
+
+def compare(label, items, rounds, app):
+    def old_path():
+        with app.app_context():
+            return app.json.response(serialize(items)).get_data()
+
+    old_times, old_body = time_encoding(old_path, rounds)
+    new_times, new_body = time_encoding(lambda: serialize_json(items), rounds)
+    assert json.loads(old_body) == json.loads(new_body), f"{label}: encodings differ"
+
+    old_median, new_median = statistics.median(old_times), statistics.median(new_times)
+    print(f"{label} ({len(items)} items, {len(new_body) / 1e6:.1f} MB)")
+    print(f"  jsonify(serialize(...)):  median {old_median * 1000:8.1f} ms  min {min(old_times) * 1000:8.1f} ms")
+    print(f"  serialize_json:           median {new_median * 1000:8.1f} ms  min {min(new_times) * 1000:8.1f} ms")
+    print(f"  Speedup: {old_median / new_median:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot", help="Course catalog snapshot to encode instead of synthetic courses")
+    parser.add_argument("--courses", type=int, default=7000)
+    parser.add_argument("--degree-copies", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.snapshot:
+        with open(args.snapshot) as f:
+            courses = CourseCatalogSnapshot.model_validate_json(f.read()).courses
+    else:
+        courses = build_courses(args.courses)
+
+    app = Flask(__name__)
+    compare("Courses", courses, args.rounds, app)
+    compare("Degrees", load_degrees(args.degree_copies), args.rounds, app)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark for fetching and parsing catalog subject pages during a course scrape.
+
+Serves the fixture HTML pages in tests/fixtures/html from a local HTTP stand-in that adds a fixed
+per-request latency (to mimic the round trip to concordia.ca), then runs
+CourseDataScraper._extract_courses_from_subjects over them with different subject-fetch
+concurrency settings. Sequential fetching pays the sum of all latencies; the thread pool overlaps
+them, bounded by the per-host limit in web_utils.
+
+Usage: python benchmarks/bench_subject_fetch.py [--subjects N] [--latency-ms MS] [--concurrency 1 2 4 8]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+BENCH_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BENCH_ROOT)
+import utils.web_utils as web_utils
+from models import AnchorLink
+from scraper.course_data_scraper import CourseDataScraper
+
+FIXTURE_DIR = os.path.join(BENCH_ROOT, "tests", "fixtures", "html")
+
+
+def make_handler(pages, latency):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = pages[int(self.path.strip("/").split(".")[0]) % len(pages)]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subjects", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(pages, args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    subjects = [AnchorLink(text=f"Subject {i}", url=f"{base_url}/{i}.html") for i in range(args.subjects)]
+    print(f"{args.subjects} subject pages from {len(pages)} fixtures, {args.latency_ms:.0f} ms simulated latency, "
+          f"per-host limit {web_utils.max_requests_per_host}")
+
+    scraper = CourseDataScraper()
+    scraper.course_terms = {}
+    baseline = None
+    try:
+        for concurrency in args.concurrency:
+            # Let the per-host limit follow the pool size so the setting under test is the only bottleneck
+            with patch.object(CourseDataScraper, "SUBJECT_FETCH_CONCURRENCY", concurrency), \
+                    patch.object(web_utils, "max_requests_per_host", concurrency), \
+                    patch.dict(web_utils._host_semaphores, clear=True):
+                start = time.perf_counter()
+                scraper._extract_courses_from_subjects(subjects)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"concurrency {concurrency:>2}: {elapsed:6.2f}s  ({baseline / elapsed:.1f}x)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
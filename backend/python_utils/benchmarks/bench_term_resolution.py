@@ -0,0 +1,88 @@
+"""
+Benchmark for the term-resolution pass of CourseDataScraper.scrape_all_courses.
+
+Every scraped course calls ConcordiaAPIUtils.get_term, which looks up the course in the
+course_section dataset (falling back to course_schedule). This compares the original
+boolean-mask scan over the whole DataFrame, the prebuilt (Subject, Catalog Nbr) index, and the
+bulk get_terms_for_all_courses pass that CourseDataScraper now uses.
+
+Usage: python benchmarks/bench_term_resolution.py [--courses N] [--rows-per-course N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.concordia_api_utils import ConcordiaAPIUtils, CATALOG_NBR
+
+
+def build_dataset(num_courses, rows_per_course, seed=0):
+    rng = np.random.default_rng(seed)
+    subjects = np.array([f"S{i // 1000:03d}" for i in range(num_courses)])
+    catalogs = np.array([str(200 + i % 1000) for i in range(num_courses)])
+    course_idx = np.repeat(np.arange(num_courses), rows_per_course)
+    term_codes = rng.choice(["2241", "2242", "2243", "2244", "2245"], size=len(course_idx))
+    return pd.DataFrame({
+        "Subject": subjects[course_idx],
+        CATALOG_NBR: catalogs[course_idx],
+        "Term Code": term_codes,
+    }), [f"{s} {c}" for s, c in zip(subjects, catalogs)]
+
+
+class MaskScanConcordiaAPIUtils(ConcordiaAPIUtils):
+    """The original lookup: a full boolean-mask scan of the DataFrame per (subject, catalog)."""
+
+    def _get_from_csv(self, csv_name, subject=None, catalog=None):
+        df = self.data_cache.get(csv_name)
+        matches = df[(df["Subject"] == subject) & (df[CATALOG_NBR] == catalog)]
+        if matches.empty:
+            return []
+        return self._sanitize_data(matches.to_dict('records'))
+
+
+def resolve_all_terms(api, course_codes):
+    start = time.perf_counter()
+    terms = {code: api.get_term(code) for code in course_codes}
+    return time.perf_counter() - start, terms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=3000)
+    parser.add_argument("--rows-per-course", type=int, default=8)
+    args = parser.parse_args()
+
+    df, course_codes = build_dataset(args.courses, args.rows_per_course)
+    print(f"Dataset: {len(df)} rows, {len(course_codes)} courses")
+
+    ConcordiaAPIUtils.data_cache["course_section"] = df
+    ConcordiaAPIUtils.data_cache["course_schedule"] = df
+
+    before, before_terms = resolve_all_terms(MaskScanConcordiaAPIUtils(cache_dir=""), course_codes)
+
+    indexed_api = ConcordiaAPIUtils(cache_dir="")
+    start = time.perf_counter()
+    indexed_api._build_index("course_section", df)
+    indexed_api._build_index("course_schedule", df)
+    index_build = time.perf_counter() - start
+    after, after_terms = resolve_all_terms(indexed_api, course_codes)
+
+    start = time.perf_counter()
+    bulk_terms = indexed_api.get_terms_for_all_courses()
+    bulk = time.perf_counter() - start
+
+    assert before_terms == after_terms, "Indexed lookup returned different terms"
+    assert before_terms == bulk_terms, "Bulk resolution returned different terms"
+    print(f"Mask scan:      {before:8.3f}s ({before / len(course_codes) * 1e6:8.1f} us/course)")
+    print(f"Indexed lookup: {after:8.3f}s ({after / len(course_codes) * 1e6:8.1f} us/course), index build {index_build:.3f}s")
+    print(f"Bulk pass:      {bulk:8.3f}s ({bulk / len(course_codes) * 1e6:8.1f} us/course)")
+    print(f"Speedup:        {before / (after + index_build):8.1f}x indexed, {before / bulk:8.1f}x bulk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark for transcript parsing, timed per page.
+
+For every PDF in --pdf-dir (the sample transcripts in backend/performance/test-pdfs/transcripts by default),
+reports the median per-page cost of PyMuPDF word extraction (page.get_text("words")), of the single
+tokenization pass (tokenize_words) and of the whole parse_transcript call divided by the page count.
+
+--synthetic-pages also generates a long transcript of that many pages (terms, course tables and term GPAs laid
+out like the real ones) and times it alongside, to check that parse time stays near-linear in transcript length.
+
+--baseline takes the path of another transcript_parser.py (e.g. one checked out from an older commit with
+`git show <rev>:backend/python_utils/parser/transcript_parser.py > /tmp/old_parser.py`); it is timed the same
+way and its output is checked to be equal to the current parser's.
+
+Usage: python benchmarks/bench_transcript_parse.py [--pdf-dir dir] [--synthetic-pages N] [--baseline path] [--rounds R]
+"""
+
+import argparse
+import glob
+import importlib.util
+import itertools
+import os
+import statistics
+import sys
+import time
+
+BENCH_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BENCH_ROOT)
+import fitz  # PyMuPDF
+from parser import transcript_parser
+
+DEFAULT_PDF_DIR = os.path.join(BENCH_ROOT, "..", "performance", "test-pdfs", "transcripts")
+SYNTHETIC_TERMS = ["Winter", "Summer", "Fall"]
+SYNTHETIC_GRADES = ["A+", "A", "A-", "B+", "B", "C", "PASS"]
+# Course table header over the synthetic rows' columns (credits at 300, grade at 340, ...)
+SYNTHETIC_TABLE_HEADER = [(50, "COURSE"), (140, "DESCRIPTION"), (300, "ATTEMPTED"), (340, "GRADE"), (380, "GPA"),
+                          (420, "AVG"), (460, "SIZE")]
+
+
+def build_synthetic_transcript(num_pages, terms_per_page=3, courses_per_term=6):
+    """A transcript PDF with num_pages pages of terms, each with course rows and a term GPA line."""
+    doc = fitz.open()
+    course_numbers = itertools.count(200)
+    term_index = 0
+    for page_num in range(num_pages):
+        page = doc.new_page()
+        y = 60
+        if page_num == 0:
+            for line in ["Student Record", "Jane Doe", "Student ID: 40000000", "Undergraduate Academic Program History",
+                         "Active in Program", "09/01/2015", "Admit Term", "Fall 2015",
+                         "Bachelor of Engineering, Software Engineering"]:
+                page.insert_text((50, y), line, fontsize=8)
+                y += 12
+        for _ in range(terms_per_page):
+            year = 2015 + term_index // len(SYNTHETIC_TERMS)
+            page.insert_text((50, y), f"{SYNTHETIC_TERMS[term_index % len(SYNTHETIC_TERMS)]} {year}", fontsize=8)
+            y += 14
+            for x, text in SYNTHETIC_TABLE_HEADER:
+                page.insert_text((x, y), text, fontsize=8)
+            y += 12
+            for k in range(courses_per_term):
+                number = next(course_numbers)
+                grade = SYNTHETIC_GRADES[(number + k) % len(SYNTHETIC_GRADES)]
+                subject = ["COMP", "SOEN", "ENGR", "MATH"][number % 4]
+                for x, text in [(50, subject), (80, str(number % 1000)), (110, "S"), (140, "Synthetic"),
+                                (185, "Course"), (300, "3.00"), (340, grade), (380, "3.70"), (420, "3.10"),
+                                (460, "45")]:
+                    page.insert_text((x, y), text, fontsize=8)
+                y += 12
+            page.insert_text((50, y), "Term GPA 3.45", fontsize=8)
+            y += 16
+            term_index += 1
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def load_baseline(path):
+    spec = importlib.util.spec_from_file_location("baseline_transcript_parser", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def median_ms(fn, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def bench_pdf(name, pdf_bytes, rounds, baseline):
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        num_pages = len(doc)
+        pages = [doc[page_num] for page_num in range(num_pages)]
+        words = [page.get_text("words") for page in pages]
+        extract_ms = median_ms(lambda: [page.get_text("words") for page in pages], rounds)
+        tokenize_ms = median_ms(lambda: [transcript_parser.tokenize_words(w) for w in words], rounds)
+    finally:
+        doc.close()
+
+    parse_ms = median_ms(lambda: transcript_parser.parse_transcript(pdf_bytes), rounds)
+    num_words = sum(len(w) for w in words)
+    print(f"{name} ({num_pages} pages, {num_words} words)")
+    print(f"  extract words:      {extract_ms / num_pages:7.2f} ms/page")
+    print(f"  tokenize_words:     {tokenize_ms / num_pages:7.2f} ms/page")
+    print(f"  parse_transcript:   {parse_ms / num_pages:7.2f} ms/page")
+
+    if baseline:
+        assert baseline.parse_transcript(pdf_bytes) == transcript_parser.parse_transcript(pdf_bytes), \
+            f"{name}: baseline output differs"
+        baseline_ms = median_ms(lambda: baseline.parse_transcript(pdf_bytes), rounds)
+        print(f"  baseline parse:     {baseline_ms / num_pages:7.2f} ms/page  (speedup {baseline_ms / parse_ms:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf-dir", default=DEFAULT_PDF_DIR)
+    parser.add_argument("--synthetic-pages", type=int, default=20, help="0 to skip the synthetic transcript")
+    parser.add_argument("--baseline", help="Path of another transcript_parser.py to compare against")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    for path in sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf"))):
+        with open(path, "rb") as f:
+            bench_pdf(os.path.basename(path), f.read(), args.rounds, baseline)
+    if args.synthetic_pages:
+        bench_pdf(f"synthetic-{args.synthetic_pages}-pages", build_synthetic_transcript(args.synthetic_pages),
+                  args.rounds, baseline)
+
+
+if __name__ == "__main__":
+    main()
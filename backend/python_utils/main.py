@@ -1,40 +1,126 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
 from dotenv import load_dotenv
 import os
 import json
 import time
 import threading
+import itertools
 from datetime import datetime, timezone
-from parser.transcript_parser import parse_transcript
+from functools import partial
+from parser.transcript_parser import parse_transcript, InvalidTranscriptError
 from scraper.degree_data_scraper import DegreeDataScraper
 from scraper.course_data_scraper import init_course_scraper_instance, get_course_scraper_instance
 from utils.concordia_api_utils import init_concordia_api_instance, get_concordia_api_instance
+from utils.job_utils import JobStore
+from utils.process_pool_utils import ProcessPool
+from utils.archive_utils import archive_format, read_pdf_members
+from utils.response_cache import ResponseCache
+from utils.transcript_cache import TranscriptCache, transcript_digest
+from utils.upload_utils import UploadTooLargeError, format_size, read_limited
 from utils.logging_utils import get_logger
-from models import serialize
+from models import serialize, serialize_json
 
 app = Flask(__name__)
 logger = get_logger("MainApp")
 initialized = False
+warmup_thread = None
 
 DOWNLOAD_INTERVAL_SECONDS = 24 * 60 * 60  # 24 hours
+DOWNLOAD_RETRY_SECONDS = 5 * 60  # Retry delay for a failed download while there are no datasets to serve
 LAST_RUN_FILENAME = "last_download_timestamp.json"
+CATALOG_REFRESH_INTERVAL_SECONDS = int(os.getenv("COURSE_CATALOG_REFRESH_SECONDS", str(24 * 60 * 60)))
+RETRY_AFTER_SECONDS = 30  # Suggested client back-off while a module is still warming up
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Transcript parsing runs in a pool of worker processes (0 = inline on the request thread), each replaced
+# after a number of transcripts; a transcript taking longer than the timeout is abandoned. The processes are
+# spawned on the first transcript, per gunicorn worker, so the default stays small (cpu_count() in a container
+# is the host's core count)
+TRANSCRIPT_PARSER_PROCESSES = int(os.getenv("TRANSCRIPT_PARSER_PROCESSES", "2"))
+TRANSCRIPT_PARSE_TIMEOUT_SECONDS = float(os.getenv("TRANSCRIPT_PARSE_TIMEOUT_SECONDS", "60"))
+TRANSCRIPT_PARSER_MAX_TASKS_PER_CHILD = int(os.getenv("TRANSCRIPT_PARSER_MAX_TASKS_PER_CHILD", "200"))
+TRANSCRIPT_BATCH_MAX_FILES = int(os.getenv("TRANSCRIPT_BATCH_MAX_FILES", "500"))  # PDFs per /parse-transcripts request
+# Upload limits: bytes per transcript PDF, bytes per batch request (or decompressed archive), pages per transcript
+TRANSCRIPT_MAX_UPLOAD_BYTES = int(os.getenv("TRANSCRIPT_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+TRANSCRIPT_BATCH_MAX_UPLOAD_BYTES = int(os.getenv("TRANSCRIPT_BATCH_MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+TRANSCRIPT_MAX_PAGES = int(os.getenv("TRANSCRIPT_MAX_PAGES", "40"))
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # Room for multipart boundaries and headers around a single file
 
 # Global variables
 course_scraper_instance = None
 degree_data_scraper_instance = None
 concordia_api_instance = None
+job_store = None
+response_cache = ResponseCache()
+transcript_cache = TranscriptCache()
+transcript_parser_pool = ProcessPool("Transcript parser", TRANSCRIPT_PARSER_PROCESSES, TRANSCRIPT_PARSE_TIMEOUT_SECONDS,
+                                     TRANSCRIPT_PARSER_MAX_TASKS_PER_CHILD, warm_up_modules=("parser.transcript_parser",))
 
 ERROR_DEGREE_SCRAPER_NOT_INITIALIZED = {"error": "Degree scraper not initialized yet"}
 ERROR_COURSE_SCRAPER_NOT_INITIALIZED = {"error": "Course scraper not initialized yet"}
 ERROR_CONCORDIA_API_NOT_INITIALIZED = {"error": "Concordia API Util not initialized yet"}
 ERROR_SCRAPING_DEGREE_DATA = {"error": "Error scraping degree data. Please try again later."}
+ERROR_RETRIEVING_COURSE_DATA = {"error": "Error retrieving course data. Please try again later."}
+ERROR_JOB_NOT_FOUND = {"error": "Job not found"}
+ERROR_PARSING_TRANSCRIPT = {"error": "Error parsing transcript. Please try again later."}
+ERROR_TRANSCRIPT_PARSE_TIMEOUT = {"error": "Transcript took too long to parse"}
+ERROR_TRANSCRIPT_TOO_LARGE = {"error": f"Transcript is larger than the {format_size(TRANSCRIPT_MAX_UPLOAD_BYTES)} limit"}
+ERROR_BATCH_TOO_LARGE = {"error": f"Upload is larger than the {format_size(TRANSCRIPT_BATCH_MAX_UPLOAD_BYTES)} limit"}
 
 # Module status tracking
+# init -> loading -> ready, "stale" while serving cached data from a previous run, "failed" if warm-up raised
+# (or the initial dataset download failed, until a retry succeeds)
 module_status = {
     "concordia_api": "init",
     "course_scraper": "init", 
     "degree_scraper": "init"
 }
+SERVING_STATUSES = ("ready", "stale")
+
+def not_ready_response(error):
+    return jsonify(error), 503, {"Retry-After": str(RETRY_AFTER_SECONDS)}
+
+def is_serving(module):
+    return module_status[module] in SERVING_STATUSES
+
+def json_response(data):
+    return Response(serialize_json(data), mimetype="application/json")
+
+def catalog_version():
+    """Changes whenever a course catalog scrape finishes (or a snapshot of one is loaded)."""
+    return getattr(course_scraper_instance, "scraped_at", None)
+
+def degree_requirements_version():
+    """Changes whenever the degree requirements are invalidated or expire (see DegreeDataScraper.requirements_version)."""
+    return degree_data_scraper_instance.requirements_version() if degree_data_scraper_instance else None
+
+def cached_json_response(key, build, get_version=catalog_version):
+    """
+    Serves build()'s JSON body from response_cache, built once per key and get_version() (the catalog version
+    by default). Supports If-None-Match (304) and gzip when the client accepts it.
+    """
+    entry = response_cache.get(key, get_version, lambda: serialize_json(build()))
+    use_gzip = request.accept_encodings["gzip"] > 0
+    response = Response(entry.gzip_body if use_gzip else entry.body, mimetype="application/json")
+    response.set_etag(f"{entry.etag}-gzip" if use_gzip else entry.etag)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response.make_conditional(request)
+
+def ndjson_response(items, error):
+    """
+    Streams items as newline-delimited JSON, one item per line, encoded like json_response.
+    The status is sent before the first item, so a failure part-way through ends the stream with an error line.
+    """
+    def generate():
+        try:
+            for item in items:
+                yield serialize_json(item) + b"\n"
+        except Exception as e:
+            logger.error(f"Error while streaming response: {str(e)}")
+            yield serialize_json(error) + b"\n"
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
 
 def get_timestamp_filepath():
     return os.path.join(cache_path, LAST_RUN_FILENAME)
@@ -67,11 +153,17 @@ def run_download_datasets():
         logger.info("Running scheduled download_datasets...")
         concordia_api_instance.download_datasets()
         write_last_run_timestamp()
+        module_status["concordia_api"] = "ready"
         logger.info("download_datasets completed successfully.")
+        mark_course_scraper_ready()
     except Exception as e:
         logger.error(f"download_datasets failed: {e}")
-    finally:
-        schedule_next_download(DOWNLOAD_INTERVAL_SECONDS)
+        if not is_serving("concordia_api"):
+            # Nothing to serve until a download succeeds, so retry soon instead of in a day
+            module_status["concordia_api"] = "failed"
+            schedule_next_download(DOWNLOAD_RETRY_SECONDS)
+            return
+    schedule_next_download(DOWNLOAD_INTERVAL_SECONDS)
 
 def schedule_next_download(delay_seconds):
     next_run_at = datetime.fromtimestamp(
@@ -92,68 +184,219 @@ def start_download_scheduler():
         logger.info(f"Last download was recent — next run in {delay:.0f}s.")
         schedule_next_download(delay)
 
+def run_catalog_refresh():
+    if not is_serving("concordia_api"):
+        # A scrape without the datasets would publish empty offeredIn terms
+        logger.info("Concordia datasets not loaded yet, postponing course catalog refresh")
+        schedule_catalog_refresh(DOWNLOAD_RETRY_SECONDS)
+        return
+    try:
+        logger.info("Refreshing course catalog snapshot...")
+        course_scraper_instance.refresh_all_courses()
+        logger.info("Course catalog refresh completed successfully.")
+    except Exception as e:
+        logger.error(f"Course catalog refresh failed: {e}")
+    finally:
+        schedule_catalog_refresh(CATALOG_REFRESH_INTERVAL_SECONDS)
+
+def schedule_catalog_refresh(delay_seconds):
+    logger.info(f"Next course catalog refresh scheduled in {delay_seconds:.0f}s")
+    t = threading.Timer(delay_seconds, run_catalog_refresh)
+    t.daemon = True
+    t.start()
+
+def start_catalog_refresh_scheduler():
+    scraped_at = course_scraper_instance.scraped_at
+    if scraped_at is None:
+        schedule_catalog_refresh(0)
+    else:
+        schedule_catalog_refresh(max(0, CATALOG_REFRESH_INTERVAL_SECONDS - (time.time() - scraped_at)))
+
+def checked_transcript_parser():
+    """parse_transcript rejecting PDFs over the page limit, or without the Student Record heading, up front."""
+    return partial(parse_transcript, max_pages=TRANSCRIPT_MAX_PAGES, require_student_record=True)
+
+def parse_transcript_in_pool(pdf_bytes):
+    return transcript_parser_pool.run(checked_transcript_parser(), pdf_bytes)
+
+def transcript_cache_bypassed():
+    # Cache-Control: no-cache (or no-store) parses the upload again without reading or storing a cached result
+    return bool(request.cache_control.no_cache or request.cache_control.no_store)
+
 @app.route('/parse-transcript', methods=['POST'])
 def parse_transcript_api():
-    if 'file' not in request.files:
-        return jsonify({"error": "No file provided"}), 400
+    # Oversized bodies are rejected while they stream in, before the form parser spools them
+    request.max_content_length = TRANSCRIPT_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+    try:
+        if 'file' not in request.files:
+            return jsonify({"error": "No file provided"}), 400
+    except RequestEntityTooLarge:
+        return jsonify(ERROR_TRANSCRIPT_TOO_LARGE), 413
     
     file = request.files['file']
     if not file.filename.lower().endswith(".pdf"):
         return jsonify({"error": "Uploaded file must be a PDF"}), 400
 
     try:
-        pdf_bytes = file.read()
-        parsed_data = parse_transcript(pdf_bytes)
+        pdf_bytes = read_limited(file.stream, TRANSCRIPT_MAX_UPLOAD_BYTES, "Transcript")
+    except UploadTooLargeError:
+        return jsonify(ERROR_TRANSCRIPT_TOO_LARGE), 413
+
+    try:
+        parsed_data = transcript_cache.get_or_parse(pdf_bytes, parse_transcript_in_pool, bypass=transcript_cache_bypassed())
         return jsonify(parsed_data)
+    except InvalidTranscriptError as e:
+        return jsonify({"error": str(e)}), 422
+    except TimeoutError:
+        logger.error(f"Transcript parsing timed out after {TRANSCRIPT_PARSE_TIMEOUT_SECONDS}s")
+        return jsonify(ERROR_TRANSCRIPT_PARSE_TIMEOUT), 504
     except Exception as e:
         logger.error(f"Error parsing transcript: {str(e)}")
-        return jsonify({"error": "Error parsing transcript. Please try again later."}), 500
+        return jsonify(ERROR_PARSING_TRANSCRIPT), 500
+
+def read_transcript_batch():
+    """
+    Returns [(filename, pdf bytes)] of a batch upload, in submission order: the PDFs of the multipart "files" field,
+    of a zip/tar in the multipart "archive" field, or of a zip/tar request body. Raises ValueError for a bad upload,
+    UploadTooLargeError or RequestEntityTooLarge for one over the limits.
+    """
+    request.max_content_length = TRANSCRIPT_BATCH_MAX_UPLOAD_BYTES
+    read_archive = partial(read_pdf_members, max_files=TRANSCRIPT_BATCH_MAX_FILES,
+                           max_file_bytes=TRANSCRIPT_MAX_UPLOAD_BYTES, max_total_bytes=TRANSCRIPT_BATCH_MAX_UPLOAD_BYTES)
+    archive = request.files.get("archive")
+    if archive is not None:
+        fmt = archive_format(archive.filename, archive.mimetype)
+        if fmt is None:
+            raise ValueError("Archive must be a zip or tar file")
+        return read_archive(archive.stream, fmt)
+    fmt = archive_format(mimetype=request.mimetype)
+    if fmt is not None:
+        return read_archive(request.stream, fmt)
+
+    files = request.files.getlist("files")
+    if len(files) > TRANSCRIPT_BATCH_MAX_FILES:
+        raise ValueError(f"At most {TRANSCRIPT_BATCH_MAX_FILES} files can be parsed at once")
+    for file in files:
+        if not file.filename.lower().endswith(".pdf"):
+            raise ValueError(f"Uploaded file must be a PDF: {file.filename}")
+    return [(file.filename, read_limited(file.stream, TRANSCRIPT_MAX_UPLOAD_BYTES, file.filename)) for file in files]
+
+def iter_transcript_batch(uploads, ordered, bypass_cache):
+    """
+    Yields one result or error item per upload, in upload order when ordered; otherwise cached transcripts
+    come first and the others follow as the transcript parser pool finishes them.
+    """
+    digests = [transcript_digest(pdf_bytes) for _, pdf_bytes in uploads]
+    cached = {}
+    for index, digest in enumerate(digests):
+        if bypass_cache:
+            transcript_cache.count_bypassed()
+        elif (parsed_data := transcript_cache.get(digest)) is not None:
+            cached[index] = parsed_data
+    pending = [index for index in range(len(uploads)) if index not in cached]
+
+    def parsed_results():
+        for position, parsed_data, error in transcript_parser_pool.iter_results(
+                checked_transcript_parser(), [uploads[index][1] for index in pending], ordered=ordered):
+            index = pending[position]
+            if error is None and not bypass_cache:
+                transcript_cache.put(digests[index], parsed_data)
+            yield index, parsed_data, error
+
+    if ordered:
+        parsed = parsed_results()
+        results = ((index, cached[index], None) if index in cached else next(parsed) for index in range(len(uploads)))
+    else:
+        results = itertools.chain(((index, parsed_data, None) for index, parsed_data in cached.items()), parsed_results())
+    for index, parsed_data, error in results:
+        item = {"index": index, "filename": uploads[index][0]}
+        if error is None:
+            item["data"] = parsed_data
+        elif isinstance(error, TimeoutError):
+            logger.error(f"Transcript parsing timed out after {TRANSCRIPT_PARSE_TIMEOUT_SECONDS}s: {item['filename']}")
+            item.update(ERROR_TRANSCRIPT_PARSE_TIMEOUT)
+        elif isinstance(error, InvalidTranscriptError):
+            item["error"] = str(error)
+        else:
+            logger.error(f"Error parsing transcript {item['filename']}: {str(error)}")
+            item.update(ERROR_PARSING_TRANSCRIPT)
+        yield item
+
+def transcript_batch_response(stream):
+    try:
+        uploads = read_transcript_batch()
+    except UploadTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except RequestEntityTooLarge:
+        return jsonify(ERROR_BATCH_TOO_LARGE), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not uploads:
+        return jsonify({"error": "No PDF files provided"}), 400
+    logger.info(f"Parsing a batch of {len(uploads)} transcripts")
+    if stream:
+        return ndjson_response(iter_transcript_batch(uploads, False, transcript_cache_bypassed()), ERROR_PARSING_TRANSCRIPT)
+    return json_response(list(iter_transcript_batch(uploads, True, transcript_cache_bypassed())))
+
+@app.route('/parse-transcripts', methods=['POST'])
+def parse_transcripts_api():
+    return transcript_batch_response(stream=False)
+
+@app.route('/parse-transcripts/stream', methods=['POST'])
+def stream_transcripts_api():
+    return transcript_batch_response(stream=True)
 
 @app.route('/degree-names', methods=['GET'])
 def get_degree_names():
-    if degree_data_scraper_instance is None:
-        return ERROR_DEGREE_SCRAPER_NOT_INITIALIZED, 503
+    if degree_data_scraper_instance is None or not is_serving("degree_scraper"):
+        return not_ready_response(ERROR_DEGREE_SCRAPER_NOT_INITIALIZED)
 
     try:
-        degree_data = degree_data_scraper_instance.get_degree_names()
-        return jsonify(serialize(degree_data))
+        return cached_json_response(("degree-names",), degree_data_scraper_instance.get_degree_names,
+                                    degree_requirements_version)
     except Exception as e:
         logger.error(f"Error retrieving degree names: {str(e)}")
         return ERROR_SCRAPING_DEGREE_DATA, 500
 
 @app.route('/scrape-degree', methods=['GET'])
 def scrape_degree_api():
-    if degree_data_scraper_instance is None:
-        return ERROR_DEGREE_SCRAPER_NOT_INITIALIZED, 503
+    if degree_data_scraper_instance is None or not is_serving("degree_scraper"):
+        return not_ready_response(ERROR_DEGREE_SCRAPER_NOT_INITIALIZED)
 
     name = request.args.get('name')
     if not name:
         return jsonify({"error": "Degree name parameter is required"}), 400    
     
     try:
-        degree_data = degree_data_scraper_instance.scrape_degree_by_name(name)
-        return jsonify(serialize(degree_data))
+        return cached_json_response(("scrape-degree", name), lambda: degree_data_scraper_instance.scrape_degree_by_name(name),
+                                    degree_requirements_version)
     except Exception as e:
         logger.error(f"Error scraping degree data for degree name {name}: {str(e)}")
         return ERROR_SCRAPING_DEGREE_DATA, 500
 
 @app.route('/scrape-all-degrees', methods=['GET'])
 def scrape_all_degrees_api():
-    if degree_data_scraper_instance is None:
-        return ERROR_DEGREE_SCRAPER_NOT_INITIALIZED, 503
+    if degree_data_scraper_instance is None or not is_serving("degree_scraper"):
+        return not_ready_response(ERROR_DEGREE_SCRAPER_NOT_INITIALIZED)
 
     try:
         degree_data = degree_data_scraper_instance.scrape_all_degrees()
-        return jsonify(serialize(degree_data))
+        return json_response(degree_data)
     except Exception as e:
         logger.error(f"Error scraping all degree data: {str(e)}")
         return ERROR_SCRAPING_DEGREE_DATA, 500
 
+@app.route('/scrape-all-degrees/stream', methods=['GET'])
+def stream_all_degrees_api():
+    if degree_data_scraper_instance is None or not is_serving("degree_scraper"):
+        return not_ready_response(ERROR_DEGREE_SCRAPER_NOT_INITIALIZED)
+
+    return ndjson_response(degree_data_scraper_instance.iter_all_degrees(), ERROR_SCRAPING_DEGREE_DATA)
 
 @app.route('/get-course', methods=['GET'])
 def get_course_api():
-    if course_scraper_instance is None:
-        return ERROR_COURSE_SCRAPER_NOT_INITIALIZED, 503
+    if course_scraper_instance is None or not is_serving("course_scraper"):
+        return not_ready_response(ERROR_COURSE_SCRAPER_NOT_INITIALIZED)
 
     code = request.args.get('code')
     if not code:
@@ -161,27 +404,103 @@ def get_course_api():
     
     try:
         course_data = course_scraper_instance.get_courses_by_ids([code], return_full_object=True)[0]
-        return jsonify(serialize(course_data))
+        return json_response(course_data)
     except Exception as e:
         logger.error(f"Error retrieving course data for code {code}: {str(e)}")
         return jsonify({"error": "Error retrieving course data. Please try again later."}), 500
 
 @app.route('/get-all-courses', methods=['GET'])
 def get_all_courses_api():
-    if course_scraper_instance is None:
-        return ERROR_COURSE_SCRAPER_NOT_INITIALIZED, 503
+    if course_scraper_instance is None or not is_serving("course_scraper"):
+        return not_ready_response(ERROR_COURSE_SCRAPER_NOT_INITIALIZED)
         
     try:
-        courses = course_scraper_instance.get_all_courses(return_full_object=True)
-        return jsonify(serialize(courses))
+        return cached_json_response(("get-all-courses",), lambda: course_scraper_instance.get_all_courses(return_full_object=True))
     except Exception as e:
         logger.error(f"Error retrieving all courses: {str(e)}")
         return jsonify({"error": "Error retrieving course data. Please try again later."}), 500
 
+@app.route('/get-all-courses/stream', methods=['GET'])
+def stream_all_courses_api():
+    if course_scraper_instance is None or not is_serving("course_scraper"):
+        return not_ready_response(ERROR_COURSE_SCRAPER_NOT_INITIALIZED)
+
+    try:
+        courses = course_scraper_instance.get_all_courses(return_full_object=True)
+    except Exception as e:
+        logger.error(f"Error retrieving all courses: {str(e)}")
+        return jsonify(ERROR_RETRIEVING_COURSE_DATA), 500
+    return ndjson_response(courses, ERROR_RETRIEVING_COURSE_DATA)
+
+@app.route('/invalidate-course-catalog', methods=['POST'])
+def invalidate_course_catalog_api():
+    if course_scraper_instance is None or not is_serving("course_scraper"):
+        return not_ready_response(ERROR_COURSE_SCRAPER_NOT_INITIALIZED)
+
+    try:
+        course_scraper_instance.invalidate_snapshot()
+        # Degree requirements are shared for a day too; drop them so they are rescraped with the new catalog
+        if degree_data_scraper_instance is not None:
+            degree_data_scraper_instance.invalidate_shared_requirements()
+    except Exception as e:
+        logger.error(f"Error invalidating course catalog snapshot: {str(e)}")
+        return jsonify({"error": "Error invalidating course catalog. Please try again later."}), 500
+
+    # The current catalog keeps being served until the rescrape replaces it
+    threading.Thread(target=course_scraper_instance.refresh_all_courses, daemon=True).start()
+    return jsonify({"status": "refreshing"}), 202
+
+def start_job_response(job_type, run):
+    job = job_store.start_job(job_type, run)
+    status_url = f"/jobs/{job['id']}"
+    return jsonify({**job, "statusUrl": status_url, "resultUrl": f"{status_url}/result"}), 202, {"Location": status_url}
+
+@app.route('/jobs/scrape-all-degrees', methods=['POST'])
+def start_scrape_all_degrees_job():
+    if degree_data_scraper_instance is None or not is_serving("degree_scraper"):
+        return not_ready_response(ERROR_DEGREE_SCRAPER_NOT_INITIALIZED)
+
+    def run(report_progress):
+        on_progress = lambda done, total: report_progress(degreesDone=done, degreesTotal=total)
+        return serialize_json(degree_data_scraper_instance.scrape_all_degrees(on_progress=on_progress))
+
+    return start_job_response("scrape-all-degrees", run)
+
+@app.route('/jobs/get-all-courses', methods=['POST'])
+def start_get_all_courses_job():
+    if course_scraper_instance is None or not is_serving("course_scraper"):
+        return not_ready_response(ERROR_COURSE_SCRAPER_NOT_INITIALIZED)
+
+    def run(report_progress):
+        courses = course_scraper_instance.get_all_courses(return_full_object=True)
+        report_progress(courses=len(courses))
+        return serialize_json(courses)
+
+    return start_job_response("get-all-courses", run)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job_api(job_id):
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify(ERROR_JOB_NOT_FOUND), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result_api(job_id):
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify(ERROR_JOB_NOT_FOUND), 404
+    if job["status"] != "succeeded":
+        return jsonify({"error": f"Job is {job['status']}, no result available", "status": job["status"]}), 409
+    result_path = job_store.get_result_path(job_id)
+    if result_path is None:
+        return jsonify(ERROR_JOB_NOT_FOUND), 404
+    return send_file(result_path, mimetype="application/json")
+
 @app.route('/get-course-schedule', methods=['GET'])
 def get_course_schedule():
-    if concordia_api_instance is None:
-        return ERROR_CONCORDIA_API_NOT_INITIALIZED, 503
+    if concordia_api_instance is None or not is_serving("concordia_api"):
+        return not_ready_response(ERROR_CONCORDIA_API_NOT_INITIALIZED)
 
     subject = request.args.get('subject')
     catalog = request.args.get('catalog')
@@ -199,45 +518,91 @@ def get_course_schedule():
 def health_check():
     return jsonify({"status": "ok"})
 
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        "transcript_cache": dict(transcript_cache.stats),
+        "response_cache": dict(response_cache.stats),
+    })
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    ready = all(is_serving(module) for module in module_status)
+    body = {"ready": ready, "modules": dict(module_status)}
+    if not ready:
+        return jsonify(body), 503, {"Retry-After": str(RETRY_AFTER_SECONDS)}
+    return jsonify(body)
+
 def initialize():
-    global initialized
+    """Starts warm-up in a background thread so the worker can bind and answer /health and /ready right away."""
+    global initialized, warmup_thread
     if not initialized:
-        init_instances()
+        warmup_thread = threading.Thread(target=init_instances, daemon=True)
+        warmup_thread.start()
         initialized = True
 
 def init_instances():
-    global course_scraper_instance, degree_data_scraper_instance, concordia_api_instance
-
-    # Step 1: Initialize Concordia API
+    """Initializes each module on its own, so one failing at boot doesn't keep the others from serving."""
+    for module, init in (("concordia_api", init_concordia_api),
+                         ("course_scraper", init_course_scraper),
+                         ("degree_scraper", init_degree_scraper)):
+        try:
+            init()
+        except Exception as e:
+            logger.error(f"Warm-up of {module} failed: {e}")
+            module_status[module] = "failed"
+    logger.info("Module initialization finished")
+
+def init_concordia_api():
+    global concordia_api_instance
     if concordia_api_instance is None:
         logger.info("Initializing Concordia API...")
+        module_status["concordia_api"] = "loading"
         init_concordia_api_instance(cache_dir=cache_path)
         concordia_api_instance = get_concordia_api_instance()
         logger.info("Concordia API instance created")
-        module_status["concordia_api"] = "ready"
 
-        logger.info("Running initial dataset download (blocking)...")
-        concordia_api_instance.download_datasets()
-        write_last_run_timestamp()
-
-        schedule_next_download(DOWNLOAD_INTERVAL_SECONDS)
-
-    # Step 2: Initialize Course Data Scraper  
+        if concordia_api_instance.load_cached_datasets():
+            # Serve the datasets from the previous run and refresh them in the background when due
+            logger.info("Loaded cached datasets, serving them until the next download")
+            module_status["concordia_api"] = "ready" if seconds_until_next_run() > 0 else "stale"
+            start_download_scheduler()
+        else:
+            # The download runs (and is retried on failure) in the background, while the scrapers initialize
+            logger.info("No cached datasets, starting initial dataset download...")
+            t = threading.Thread(target=run_download_datasets, daemon=True)
+            t.start()
+
+def init_course_scraper():
+    global course_scraper_instance
     if course_scraper_instance is None:
         logger.info("Initializing Course Data Scraper...")
-        init_course_scraper_instance()
+        module_status["course_scraper"] = "loading"
+        init_course_scraper_instance(cache_dir=cache_path)
         course_scraper_instance = get_course_scraper_instance()
         logger.info("Course scraper instance created")
+        if course_scraper_instance.load_snapshot():
+            logger.info("Loaded course catalog snapshot")
+        mark_course_scraper_ready()
+
+def mark_course_scraper_ready():
+    """
+    The course scraper serves (and scrapes) only once the Concordia datasets are loaded, since they give every
+    course its offeredIn terms; until then it stays "loading". Called again when the first download finishes.
+    """
+    if course_scraper_instance is not None and is_serving("concordia_api") and not is_serving("course_scraper"):
         module_status["course_scraper"] = "ready"
-    
-    # Step 3: Initialize Degree Data Scraper
+        logger.info("Course scraper ready")
+        start_catalog_refresh_scheduler()
+
+def init_degree_scraper():
+    global degree_data_scraper_instance
     if degree_data_scraper_instance is None:
         logger.info("Initializing Degree Data Scraper...")
+        module_status["degree_scraper"] = "loading"
         degree_data_scraper_instance = DegreeDataScraper()
-        logger.info("Degree scraper instance created")        
+        logger.info("Degree scraper instance created")
         module_status["degree_scraper"] = "ready"
-    
-    logger.info("All modules initialized successfully")
 
 # Initialize configuration
 def get_config():
@@ -248,6 +613,7 @@ def get_config():
 cache_path, env_file = get_config()
 if cache_path:
     os.makedirs(cache_path, exist_ok=True)
+job_store = JobStore(cache_path)
 if env_file:
     load_dotenv(env_file)
 
@@ -1,6 +1,8 @@
+import json
+from functools import lru_cache
 from typing import Optional, Union
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 class DegreeType(Enum):
     STANDALONE = "Standalone"
@@ -140,6 +142,11 @@ class ProgramRequirements(BaseModel):
     degree: Degree
     coursePools: list[CoursePool]    
 
+class CourseCatalogSnapshot(BaseModel):
+    version: int
+    scrapedAt: float  # Unix timestamp of the scrape the snapshot was taken from
+    courses: list[Course]
+
 # ECP degree ID constants
 class ECPDegreeIDs:
     ENGR_ECP_ID = "Extended Credit Program - Engineering"
@@ -179,4 +186,22 @@ def serialize(obj):
         for k, v in d.items():
             d[k] = serialize(v)
         return d
-    return obj
\ No newline at end of file
+    return obj
+
+@lru_cache(maxsize=None)
+def _model_list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+def serialize_json(obj) -> bytes:
+    """
+    Encodes obj to JSON bytes with the same wire format as serialize (field aliases such as _id, enum values).
+    Models and lists of one model type are encoded in a single pass by pydantic's serializer, without building
+    the intermediate dicts; anything else goes through serialize and json.dumps.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump_json(by_alias=True).encode()
+    if isinstance(obj, list) and obj and isinstance(obj[0], BaseModel):
+        model = type(obj[0])
+        if all(type(item) is model for item in obj):
+            return _model_list_adapter(model).dump_json(obj, by_alias=True)
+    return json.dumps(serialize(obj), separators=(",", ":")).encode()
@@ -3,21 +3,57 @@ Python-based transcript parser using PyMuPDF for better PDF parsing.
 This script parses academic transcripts and outputs JSON.
 """
 
-import re
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from functools import lru_cache
 import fitz  # PyMuPDF
+from utils.regex_utils import (COURSE_CODE_RE, COURSE_NUMBER_RE, SECTION_RE, DECIMAL_TWO_PLACES_RE, YEAR_RE,
+                               LETTER_GRADE_RE, TERM_YEAR_RE, TERM_HEADER_RE, DATE_RE, GPA_VALUE_RE)
 
 # Constants
 BIRTHDATE = 'Birthdate:'
 CO_OP = '(Co-op)'
 TRANSFER_CREDITS = 'Transfer Credits'
-YEAR_PATTERN = r'^\d{4}$'
-DECIMAL_TWO_PLACES_PATTERN = r'^\d+\.\d{2}$'
+STUDENT_RECORD = 'Student Record'  # Heading of the first page of every transcript
+YEAR_PATTERN = YEAR_RE.pattern
+DECIMAL_TWO_PLACES_PATTERN = DECIMAL_TWO_PLACES_RE.pattern
+TERM_NAMES = {'Winter', 'Summer', 'Fall', 'Spring', 'Fall/Winter', 'Winter/Summer'}
+# Words that look like course codes but are transcript headers or notations
+EXCLUDED_COURSE_CODES = {'COURSE', 'GRADE', 'GPA', 'AVG', 'SIZE', 'OTHER',
+                         'NOTATION', 'CLASS', 'PROGRAM', 'EARNED', 'EX', 'TRC', 'NA',
+                         'TRANSFER', 'CREDITS', 'ATTEMPTED', 'DESCRIPTION', 'YEAR',
+                         'BEGINNING', 'END', 'RECORD', 'WEB', 'PAGE'}
+
+# Word classes set by classify_word (bit flags, a word can be in several classes)
+TOKEN_COURSE_CODE = 1 << 0      # COMP, SOEN (see is_course_code)
+TOKEN_COURSE_NUMBER = 1 << 1    # 232
+TOKEN_SECTION = 1 << 2          # S, EC, QQ
+TOKEN_DECIMAL = 1 << 3          # 3.00
+TOKEN_LETTER_GRADE = 1 << 4     # A+, b-
+TOKEN_GRADE = 1 << 5            # letter grades and PASS, EX, TRC, DISC
+TOKEN_TRANSFER_GRADE = 1 << 6   # EX, TRC
+TOKEN_YEAR = 1 << 7             # 2023
+TOKEN_TERM_NAME = 1 << 8        # Winter, Fall/Winter (first half of a term header)
+TOKEN_TERM_YEAR = 1 << 9        # 2023, 2025-26 (second half of a term header)
+TOKEN_TERM_HEADER = 1 << 10     # a whole term header in one word
+
+# Course table columns by header word. The stacked headers (CLASS AVG, CLASS SIZE, PROGRAM CREDITS EARNED)
+# are keyed by the one word each of them has only once per table
+COURSE_TABLE_HEADERS = {'DESCRIPTION': 'description', 'ATTEMPTED': 'credits', 'GRADE': 'grade',
+                        'NOTATION': 'notation', 'GPA': 'gpa', 'AVG': 'classAvg', 'SIZE': 'classSize',
+                        'PROGRAM': 'creditsEarned', 'OTHER': 'other'}
+HEADER_Y_RANGE = 8.0        # Stacked header lines sit within this distance of the COURSE DESCRIPTION line
+COLUMN_X_TOLERANCE = 4.0    # Values are left-aligned with their column header, give or take a few points
+ROW_Y_TOLERANCE = 2.0       # Words of one table row share their y0; wrapped titles sit ~4 points above and below
+
+class InvalidTranscriptError(ValueError):
+    """The PDF was rejected before parsing (not a transcript, or too many pages)."""
+
 
 def extract_term_from_text(text):
     """Extract term and year from text like 'Winter 2023' or 'Fall/Winter 2025-26'"""
-    pattern = r'^(Winter|Summer|Fall|Spring|Fall/Winter|Winter/Summer)\s+(\d{4}(?:-\d{2})?)$'
-    match = re.match(pattern, text.strip())
+    match = TERM_HEADER_RE.match(text.strip())
     if match:
         return {'term': match.group(1), 'year': match.group(2)}
     return None
@@ -29,13 +65,9 @@ def is_course_code(text):
         return False
     text = text.strip()
     # Course codes are typically 2-4 uppercase letters
-    if re.match(r'^[A-Z]{2,4}$', text):
+    if COURSE_CODE_RE.match(text):
         # Exclude common non-course words
-        excluded = {'COURSE', 'GRADE', 'GPA', 'AVG', 'SIZE', 'OTHER', 
-                   'NOTATION', 'CLASS', 'PROGRAM', 'EARNED', 'EX', 'TRC', 'NA', 
-                   'TRANSFER', 'CREDITS', 'ATTEMPTED', 'DESCRIPTION', 'YEAR',
-                   'BEGINNING', 'END', 'RECORD', 'WEB', 'PAGE'}
-        return text not in excluded
+        return text not in EXCLUDED_COURSE_CODES
     return False
 
 
@@ -43,7 +75,7 @@ def is_course_number(text):
     """Check if text looks like a course number (e.g., '232', '249')"""
     if not text:
         return False
-    return re.match(r'^\d{3}$', text.strip()) is not None
+    return COURSE_NUMBER_RE.match(text.strip()) is not None
 
 
 def is_section(text):
@@ -51,7 +83,7 @@ def is_section(text):
     if not text:
         return False
     text = text.strip()
-    return re.match(r'^[A-Z0-9]{1,3}$', text) is not None
+    return SECTION_RE.match(text) is not None
 
 
 def is_transfer_credit(course):
@@ -67,9 +99,170 @@ def is_transfer_credit(course):
     return grade == 'EX' or grade == 'TRC'
 
 
-def parse_transcript(pdf_bytes):
+@lru_cache(maxsize=4096)
+def classify_word(text):
+    """Return the TOKEN_* flags of a stripped word. Transcripts repeat the same few tokens
+    (subjects, grades, credits), so results are cached by text."""
+    flags = 0
+    if is_course_code(text):
+        flags |= TOKEN_COURSE_CODE
+    if is_course_number(text):
+        flags |= TOKEN_COURSE_NUMBER
+    if is_section(text):
+        flags |= TOKEN_SECTION
+    if DECIMAL_TWO_PLACES_RE.match(text):
+        flags |= TOKEN_DECIMAL
+    upper = text.upper()
+    if LETTER_GRADE_RE.match(text):
+        flags |= TOKEN_LETTER_GRADE | TOKEN_GRADE
+    elif upper in ('PASS', 'EX', 'TRC', 'DISC'):
+        flags |= TOKEN_GRADE
+    if upper in ('EX', 'TRC'):
+        flags |= TOKEN_TRANSFER_GRADE
+    if YEAR_RE.match(text):
+        flags |= TOKEN_YEAR
+    if text in TERM_NAMES:
+        flags |= TOKEN_TERM_NAME
+    if TERM_YEAR_RE.match(text):
+        flags |= TOKEN_TERM_YEAR
+    if extract_term_from_text(text):
+        flags |= TOKEN_TERM_HEADER
+    return flags
+
+
+class PageTokens:
+    """Words of one page, stripped and classified once, as parallel arrays indexed like the words:
+    texts (stripped text), uppers (upper-cased text), xs (x0 position), ys (y0 position),
+    flags (TOKEN_* bits) and values (float value of TOKEN_DECIMAL words, None otherwise)."""
+
+    __slots__ = ('texts', 'uppers', 'xs', 'ys', 'flags', 'values')
+
+    def __init__(self, texts, uppers, xs, ys, flags, values):
+        self.texts = texts
+        self.uppers = uppers
+        self.xs = xs
+        self.ys = ys
+        self.flags = flags
+        self.values = values
+
+    def __len__(self):
+        return len(self.texts)
+
+
+def tokenize_words(words):
+    """Tokenize the output of page.get_text("words") in a single pass"""
+    texts = [word[4].strip() for word in words]
+    flags = array('H', map(classify_word, texts))
+    return PageTokens(
+        texts=texts,
+        uppers=[text.upper() for text in texts],
+        xs=array('d', [word[0] for word in words]),
+        ys=array('d', [word[1] for word in words]),
+        flags=flags,
+        values=[float(text) if flag & TOKEN_DECIMAL else None for text, flag in zip(texts, flags)],
+    )
+
+
+def group_rows(ys):
+    """Words grouped into table rows: for each word, the indices of the words whose y0 is within
+    ROW_Y_TOLERANCE of the top of its row"""
+    rows_of_words = [None] * len(ys)
+    row = None
+    for index in sorted(range(len(ys)), key=ys.__getitem__):
+        if row is None or ys[index] - ys[row[0]] > ROW_Y_TOLERANCE:
+            row = []
+        row.append(index)
+        rows_of_words[index] = row
+    return rows_of_words
+
+
+class CourseTableLayout:
+    """Columns of one course table, learned once from its header. starts holds the x where each column
+    begins (sorted), fields the matching COURSE_TABLE_HEADERS field; words left of the first column
+    are in the course column."""
+
+    __slots__ = ('y', 'starts', 'fields')
+
+    def __init__(self, y, columns):
+        self.y = y
+        columns = sorted((x, field) for field, x in columns.items())
+        self.starts = [x - COLUMN_X_TOLERANCE for x, _ in columns]
+        self.fields = [field for _, field in columns]
+
+    def field_at(self, x):
+        index = bisect_right(self.starts, x) - 1
+        return self.fields[index] if index >= 0 else 'course'
+
+    def course_fields(self, tokens, row):
+        """Credits, grade and GPA of a course row (indices of its words), read from their columns"""
+        cells = {}
+        for j in sorted(row, key=tokens.xs.__getitem__):
+            cells.setdefault(self.field_at(tokens.xs[j]), j)
+        flags, values = tokens.flags, tokens.values
+        credits_idx, grade_idx, gpa_idx = cells.get('credits'), cells.get('grade'), cells.get('gpa')
+        course_credits = values[credits_idx] if credits_idx is not None and flags[credits_idx] & TOKEN_DECIMAL else None
+        grade = tokens.uppers[grade_idx] if grade_idx is not None and flags[grade_idx] & TOKEN_GRADE else None
+        gpa = None
+        if grade and gpa_idx is not None and flags[gpa_idx] & TOKEN_DECIMAL and values[gpa_idx] > 0:
+            gpa = values[gpa_idx]
+        return course_credits, grade, gpa
+
+
+def find_course_table_layouts(tokens):
+    """Layouts of the course tables on a page, sorted by y. A COURSE DESCRIPTION header needs ATTEMPTED and
+    GRADE columns, which leaves out the transfer credit table (no ATTEMPTED)."""
+    uppers, xs, ys = tokens.uppers, tokens.xs, tokens.ys
+    layouts = []
+    for i in range(len(tokens) - 1):
+        if uppers[i] != 'COURSE' or uppers[i + 1] != 'DESCRIPTION':
+            continue
+        columns = {}
+        for j in range(len(tokens)):
+            field = COURSE_TABLE_HEADERS.get(uppers[j])
+            if field and xs[j] > xs[i] and abs(ys[j] - ys[i]) <= HEADER_Y_RANGE:
+                columns.setdefault(field, xs[j])
+        if 'credits' in columns and 'grade' in columns:
+            layouts.append(CourseTableLayout(ys[i], columns))
+    layouts.sort(key=lambda layout: layout.y)
+    return layouts
+
+
+def lookahead_course_fields(tokens, i):
+    """Credits, grade and GPA of the course whose code is word i, from the words that follow it
+    (for pages without a course table header)"""
+    flags, values = tokens.flags, tokens.values
+    # Pattern is usually: course_code course_number section credits grade [gpa] [other]
+    grade = None
+    course_credits = None
+    gpa = None
+    for j in range(i + 3, min(i + 20, len(tokens))):
+        # Check for credits first (decimal numbers like 3.00, 0.00)
+        if course_credits is None and flags[j] & TOKEN_DECIMAL:
+            course_credits = values[j]
+            continue
+        
+        # Check for grade (after credits)
+        # Accept letter grades and special transcript notations.
+        if not grade and flags[j] & TOKEN_GRADE:
+            grade = tokens.uppers[j]
+        
+        # Check for GPA (decimal number after grade, usually > 0)
+        if grade and gpa is None and flags[j] & TOKEN_DECIMAL:
+            val = values[j]
+            if val > 0:  # GPA is usually > 0
+                gpa = val
+    return course_credits, grade, gpa
+
+
+def parse_transcript(pdf_bytes, max_pages=None, require_student_record=False):
     """Parse transcript PDF and return unified structured data
     
+    Args:
+        pdf_bytes: PDF content (bytes, bytearray or memoryview, opened without copying)
+        max_pages: Raise InvalidTranscriptError for PDFs with more pages, before reading any page
+        require_student_record: Raise InvalidTranscriptError unless the first page has the Student Record
+            heading, before the full parse runs
+
     Returns:
         dict: ParsedData structure with:
             - programInfo: Program information (degree, terms, coop, etc.)
@@ -94,17 +287,29 @@ def parse_transcript(pdf_bytes):
     
     # Track all courses with their positions
     all_courses = []  # List of dicts with page, y, course
+    transfer_course_codes = set()  # Course codes already in all_courses under TRANSFER_CREDITS
     
     # Track all term GPAs with their positions
     term_gpas = []  # List of dicts with page, y, gpa_value
     
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    # Course table continuing at the top of the next page
+    course_table_layout = None
+    
+    # PyMuPDF copies bytearray streams but not memoryviews
+    doc = fitz.open(stream=memoryview(pdf_bytes) if isinstance(pdf_bytes, bytearray) else pdf_bytes, filetype="pdf")
     
     try:
+        if max_pages is not None and len(doc) > max_pages:
+            raise InvalidTranscriptError(f"Transcript has {len(doc)} pages, more than the limit of {max_pages}")
+        if require_student_record and len(doc) == 0:
+            raise InvalidTranscriptError("PDF has no pages")
+
         # Extract student info and program history from first page
         if len(doc) > 0:
             first_page = doc[0]
             first_page_text = first_page.get_text()
+            if require_student_record and STUDENT_RECORD.lower() not in first_page_text.lower():
+                raise InvalidTranscriptError("PDF is not a student record transcript")
             first_page_lines = first_page_text.split('\n') if first_page_text else []
             
             # Extract student information. Only used to help identify patterns and sections of the transcript, not included in final output.
@@ -200,7 +405,7 @@ def parse_transcript(pdf_bytes):
                         current_program = {}
                     
                     date_str = first_page_lines[i + 1].strip()
-                    if re.match(r'\d{2}/\d{2}/\d{4}', date_str):
+                    if DATE_RE.match(date_str):
                         current_program['activeDate'] = date_str
                     i += 2
                     continue
@@ -241,7 +446,7 @@ def parse_transcript(pdf_bytes):
                         if i + 1 < len(first_page_lines):
                             next_line = first_page_lines[i + 1].strip()
                             # If next line doesn't look like a date or other field, it's likely the major
-                            if (not re.match(r'\d{2}/\d{2}/\d{4}', next_line) and 
+                            if (not DATE_RE.match(next_line) and 
                                 next_line != "Active in Program" and 
                                 next_line != "Admit Term" and
                                 next_line != "Matriculated" and
@@ -332,47 +537,42 @@ def parse_transcript(pdf_bytes):
         for page_num in range(len(doc)):
             page = doc[page_num]
             
-            # Get text and words with positions
-            text = page.get_text()
-            words = page.get_text("words")  # Returns list of (x0, y0, x1, y1, "text", block_no, line_no, word_no)
-            
-            if not text:
+            # Get words with positions: list of (x0, y0, x1, y1, "text", block_no, line_no, word_no)
+            words = page.get_text("words")
+            if not words:
                 continue
             
-            # First pass: find all term headers and their GPAs
-            for i, word in enumerate(words):
-                word_text = word[4].strip()  # word[4] is the text
-                
-                # Check for term header (might be split across words)
-                # Try current word + next word
-                if i + 1 < len(words):
-                    next_word = words[i + 1]
-                    combined = f"{word_text} {next_word[4].strip()}"
-                    term_info = extract_term_from_text(combined)
-                    if term_info:
-                        term_headers.append({
-                            'page': page_num,
-                            'lineIndex': int(word[1]),  # y0 position
-                            'term': term_info['term'],
-                            'year': term_info['year'],
-                            'gpa': None,
-                            'y': word[1]  # y0 position
-                        })
-                        i += 1
-                        continue
-                
-                # Also try just current word
-                term_info = extract_term_from_text(word_text)
-                if term_info:
-                    term_headers.append({
-                        'page': page_num,
-                        'lineIndex': int(word[1]),
-                        'term': term_info['term'],
-                        'year': term_info['year'],
-                        'gpa': None,
-                        'y': word[1]
-                    })
+            # Strip and classify every word once; the passes below only read these arrays
+            tokens = tokenize_words(words)
+            texts, uppers, ys, flags, values = tokens.texts, tokens.uppers, tokens.ys, tokens.flags, tokens.values
+            num_words = len(tokens)
+            
+            # First pass: find all term headers
+            page_headers_start = len(term_headers)
+            for i in range(num_words):
+                # Term header is usually split across two words ('Winter', '2023'),
+                # otherwise try the current word alone
+                if i + 1 < num_words and flags[i] & TOKEN_TERM_NAME and flags[i + 1] & TOKEN_TERM_YEAR:
+                    term_info = {'term': texts[i], 'year': texts[i + 1]}
+                elif flags[i] & TOKEN_TERM_HEADER:
+                    term_info = extract_term_from_text(texts[i])
+                else:
                     continue
+                term_headers.append({
+                    'page': page_num,
+                    'lineIndex': int(ys[i]),  # y0 position
+                    'term': term_info['term'],
+                    'year': term_info['year'],
+                    'gpa': None,
+                    'y': ys[i]  # y0 position
+                })
+            page_headers = term_headers[page_headers_start:]
+            
+            # Term headers of this page sorted by Y, to look up the term of each course by bisection
+            page_terms = sorted(page_headers, key=lambda th: th['y'])
+            page_term_ys = [th['y'] for th in page_terms]
+            # Term still open at the top of this page: the last one found on a previous page
+            previous_page_term = term_headers[page_headers_start - 1] if page_headers_start else None
             
             # Extract transfer credits from "Transfer Credits" or "Exemptions" section
             in_transfer_section = False
@@ -380,27 +580,26 @@ def parse_transcript(pdf_bytes):
             transfer_end_y = None
             
             # Find transfer credits/exemptions section
-            for word_idx, word in enumerate(words):
-                word_text = word[4].strip()
+            for word_idx, word_text in enumerate(texts):
                 # Check for "Transfer Credits" or "Exemptions" header
                 if 'Transfer' in word_text:
                     # Check if next word is "Credits"
-                    if word_idx + 1 < len(words) and 'Credits' in words[word_idx + 1][4].strip():
+                    if word_idx + 1 < num_words and 'Credits' in texts[word_idx + 1]:
                         in_transfer_section = True
-                        transfer_start_y = word[1]
+                        transfer_start_y = ys[word_idx]
                         # Find where transfer section ends (look for first term header or course section)
-                        for th in term_headers:
-                            if th['page'] == page_num and th['y'] > transfer_start_y:
+                        for th in page_headers:
+                            if th['y'] > transfer_start_y:
                                 transfer_end_y = th['y']
                                 break
                         break
                 elif 'Exempt' in word_text or 'Exemption' in word_text:
                     # Also check for exemptions section
                     in_transfer_section = True
-                    transfer_start_y = word[1]
+                    transfer_start_y = ys[word_idx]
                     # Find where exemptions section ends
-                    for th in term_headers:
-                        if th['page'] == page_num and th['y'] > transfer_start_y:
+                    for th in page_headers:
+                        if th['y'] > transfer_start_y:
                             transfer_end_y = th['y']
                             break
                     break
@@ -408,9 +607,8 @@ def parse_transcript(pdf_bytes):
             # Parse transfer credits if we're in that section
             if in_transfer_section:
                 word_idx = 0
-                while word_idx < len(words) - 5:
-                    word = words[word_idx]
-                    word_y = word[1]
+                while word_idx < num_words - 5:
+                    word_y = ys[word_idx]
                     
                     # Stop if we've passed the transfer section
                     if transfer_end_y and word_y > transfer_end_y:
@@ -422,12 +620,12 @@ def parse_transcript(pdf_bytes):
                     # Format 3: COURSE_CODE, COURSE_NUMBER, EX/TRC, NA, credits (no description)
                     
                     # Try Format 1 first: COURSE_CODE -> COURSE_NUMBER -> (description) -> EX/TRC -> NA -> credits
-                    if (word_idx + 5 < len(words) and
-                        is_course_code(words[word_idx][4].strip()) and
-                        is_course_number(words[word_idx + 1][4].strip())):
+                    if (word_idx + 5 < num_words and
+                        flags[word_idx] & TOKEN_COURSE_CODE and
+                        flags[word_idx + 1] & TOKEN_COURSE_NUMBER):
                         
-                        course_code = words[word_idx][4].strip()
-                        course_number = words[word_idx + 1][4].strip()
+                        course_code = texts[word_idx]
+                        course_number = texts[word_idx + 1]
                         
                         # Look for EX or TRC, NA/YEAR, credits pattern after course code/number
                         # Format: COURSE_CODE, COURSE_NUMBER, DESCRIPTION, EX/TRC, YEAR_ATTENDED, credits
@@ -438,20 +636,19 @@ def parse_transcript(pdf_bytes):
                         grade_value = None
                         year_attended = None
                         
-                        for j in range(word_idx + 2, min(word_idx + 15, len(words))):
-                            w_text = words[j][4].strip().upper()
-                            if (w_text == 'EX' or w_text == 'TRC') and grade_idx is None:
+                        for j in range(word_idx + 2, min(word_idx + 15, num_words)):
+                            if flags[j] & TOKEN_TRANSFER_GRADE and grade_idx is None:
                                 grade_idx = j
-                                grade_value = w_text
+                                grade_value = uppers[j]
                             elif grade_idx is not None and year_idx is None:
                                 # YEAR ATTENDED can be NA or a year (4 digits)
-                                if w_text == 'NA':
+                                if uppers[j] == 'NA':
                                     year_idx = j
                                     year_attended = None
-                                elif re.match(YEAR_PATTERN, words[j][4].strip()):
+                                elif flags[j] & TOKEN_YEAR:
                                     year_idx = j
-                                    year_attended = words[j][4].strip()
-                            elif re.match(DECIMAL_TWO_PLACES_PATTERN, words[j][4].strip()) and year_idx is not None and credits_idx is None:
+                                    year_attended = texts[j]
+                            elif flags[j] & TOKEN_DECIMAL and year_idx is not None and credits_idx is None:
                                 credits_idx = j
                                 break
                         
@@ -460,11 +657,8 @@ def parse_transcript(pdf_bytes):
                             # Extract description between course number and grade
                             course_title = ''
                             for j in range(word_idx + 2, grade_idx):
-                                desc_text = words[j][4].strip()
-                                if desc_text and not is_course_code(desc_text) and not is_course_number(desc_text):
-                                    course_title += desc_text + ' '
-                            
-                            credits_str = words[credits_idx][4].strip()
+                                if texts[j] and not flags[j] & (TOKEN_COURSE_CODE | TOKEN_COURSE_NUMBER):
+                                    course_title += texts[j] + ' '
                             
                             # For TRC: add to terms with "Transfer Credits" as term name
                             # For EX: add to transferCredits array (exemptions)
@@ -477,7 +671,7 @@ def parse_transcript(pdf_bytes):
                                     'courseCode': f'{course_code} {course_number}',
                                     'section': '',
                                     'courseTitle': course_title.strip(),
-                                    'credits': float(credits_str),
+                                    'credits': values[credits_idx],
                                     'grade': 'TRC',
                                     'notation': None,
                                     'gpa': None,
@@ -491,12 +685,13 @@ def parse_transcript(pdf_bytes):
                                 # Add to terms (will be grouped later)
                                 all_courses.append({
                                     'page': page_num,
-                                    'lineIndex': int(word[1]),
+                                    'lineIndex': int(word_y),
                                     'rowIndex': word_idx,
                                     'tableIndex': -1,
                                     'course': course_obj,
                                     'assignedTerm': {'term': TRANSFER_CREDITS, 'year': transfer_year}
                                 })
+                                transfer_course_codes.add(course_obj['courseCode'])
                             else:
                                 # EX grade - add to exempted courses
                                 course_code_clean = f'{course_code}{course_number}'
@@ -506,28 +701,25 @@ def parse_transcript(pdf_bytes):
                             continue
                     
                     # Try Format 2: EX/TRC -> NA/YEAR -> credits -> COURSE_CODE -> COURSE_NUMBER
-                    elif (word_idx + 5 < len(words) and
-                          words[word_idx][4].strip().upper() in ['EX', 'TRC'] and
-                          (words[word_idx + 1][4].strip().upper() == 'NA' or 
-                           re.match(YEAR_PATTERN, words[word_idx + 1][4].strip())) and
-                          re.match(DECIMAL_TWO_PLACES_PATTERN, words[word_idx + 2][4].strip()) and
-                          is_course_code(words[word_idx + 3][4].strip()) and
-                          is_course_number(words[word_idx + 4][4].strip())):
+                    elif (word_idx + 5 < num_words and
+                          flags[word_idx] & TOKEN_TRANSFER_GRADE and
+                          (uppers[word_idx + 1] == 'NA' or flags[word_idx + 1] & TOKEN_YEAR) and
+                          flags[word_idx + 2] & TOKEN_DECIMAL and
+                          flags[word_idx + 3] & TOKEN_COURSE_CODE and
+                          flags[word_idx + 4] & TOKEN_COURSE_NUMBER):
                         
-                        course_code = words[word_idx + 3][4].strip()
-                        course_number = words[word_idx + 4][4].strip()
-                        credits_str = words[word_idx + 2][4].strip()
-                        grade_value = words[word_idx][4].strip().upper()
-                        year_attended = None if words[word_idx + 1][4].strip().upper() == 'NA' else words[word_idx + 1][4].strip()
+                        course_code = texts[word_idx + 3]
+                        course_number = texts[word_idx + 4]
+                        grade_value = uppers[word_idx]
+                        year_attended = None if uppers[word_idx + 1] == 'NA' else texts[word_idx + 1]
                         
                         # Look for description after course number
                         course_title = ''
-                        for j in range(word_idx + 5, min(word_idx + 10, len(words))):
-                            desc_text = words[j][4].strip()
-                            if desc_text.upper() in ['EX', 'TRC'] or is_course_code(desc_text):
+                        for j in range(word_idx + 5, min(word_idx + 10, num_words)):
+                            if flags[j] & (TOKEN_TRANSFER_GRADE | TOKEN_COURSE_CODE):
                                 break
-                            if desc_text and not is_course_number(desc_text):
-                                course_title += desc_text + ' '
+                            if texts[j] and not flags[j] & TOKEN_COURSE_NUMBER:
+                                course_title += texts[j] + ' '
                         
                         # For TRC: add to terms with "Transfer Credits" as term name
                         # For EX: add to transferCredits array (exemptions)
@@ -538,7 +730,7 @@ def parse_transcript(pdf_bytes):
                                 'courseCode': f'{course_code} {course_number}',
                                 'section': '',
                                 'courseTitle': course_title.strip(),
-                                'credits': float(credits_str),
+                                'credits': values[word_idx + 2],
                                 'grade': 'TRC',
                                 'notation': None,
                                 'gpa': None,
@@ -551,12 +743,13 @@ def parse_transcript(pdf_bytes):
                             
                             all_courses.append({
                                 'page': page_num,
-                                'lineIndex': int(word[1]),
+                                'lineIndex': int(word_y),
                                 'rowIndex': word_idx,
                                 'tableIndex': -1,
                                 'course': course_obj,
                                 'assignedTerm': {'term': TRANSFER_CREDITS, 'year': transfer_year}
                             })
+                            transfer_course_codes.add(course_obj['courseCode'])
                         else:
                             # EX grade - add to exempted courses
                             course_code_clean = f'{course_code}{course_number}'
@@ -570,10 +763,10 @@ def parse_transcript(pdf_bytes):
             # Additional pass: catch any courses with EX or TRC grade that might have been missed
             # This is a universal check - any course with EX or TRC grade is a transfer credit
             transfer_word_idx = 0
-            while transfer_word_idx < len(words) - 5:
+            while transfer_word_idx < num_words - 5:
                 # Look for course pattern: COURSE_CODE, COURSE_NUMBER
-                if (is_course_code(words[transfer_word_idx][4].strip()) and
-                    is_course_number(words[transfer_word_idx + 1][4].strip())):
+                if (flags[transfer_word_idx] & TOKEN_COURSE_CODE and
+                    flags[transfer_word_idx + 1] & TOKEN_COURSE_NUMBER):
                     
                     # Look ahead for EX or TRC grade (might be after description, no section required)
                     grade_found = False
@@ -581,41 +774,33 @@ def parse_transcript(pdf_bytes):
                     grade_value = None
                     credits_value = 0.0
                     
-                    for j in range(transfer_word_idx + 2, min(transfer_word_idx + 15, len(words))):
-                        w_text = words[j][4].strip().upper()
-                        
+                    for j in range(transfer_word_idx + 2, min(transfer_word_idx + 15, num_words)):
                         # Check for EX or TRC grade
-                        if w_text in ['EX', 'TRC']:
+                        if flags[j] & TOKEN_TRANSFER_GRADE:
                             grade_found = True
                             grade_idx = j
-                            grade_value = w_text
+                            grade_value = uppers[j]
                             # Continue to find credits after grade
                         
                         # Check for credits (decimal numbers) - can be before or after grade
-                        if re.match(DECIMAL_TWO_PLACES_PATTERN, words[j][4].strip()):
-                            val = float(words[j][4].strip())
-                            # Use the credit value
-                            credits_value = val
+                        if flags[j] & TOKEN_DECIMAL:
+                            credits_value = values[j]
                     
                     # If grade found, handle based on grade type
                     if grade_found:
-                        course_code = words[transfer_word_idx][4].strip()
-                        course_number = words[transfer_word_idx + 1][4].strip()
-                        course_key = f'{course_code} {course_number}'
+                        course_key = f'{texts[transfer_word_idx]} {texts[transfer_word_idx + 1]}'
                         
                         # Extract description (between course number and grade)
                         course_title = ''
                         seen_words = set()  # Track words to avoid duplicates
                         if grade_idx:
                             for k in range(transfer_word_idx + 2, grade_idx):
-                                w_text = words[k][4].strip()
+                                w_text = texts[k]
                                 if (w_text and 
                                     w_text not in seen_words and
-                                    not is_course_code(w_text) and 
-                                    not is_course_number(w_text) and
-                                    not re.match(DECIMAL_TWO_PLACES_PATTERN, w_text) and
-                                    w_text.upper() not in ['EX', 'TRC', 'NA', 'PASS', 'DISC'] and
-                                    not re.match(r'^[A-F][+-]?$', w_text, re.IGNORECASE)):
+                                    not flags[k] & (TOKEN_COURSE_CODE | TOKEN_COURSE_NUMBER | TOKEN_DECIMAL |
+                                                    TOKEN_LETTER_GRADE) and
+                                    uppers[k] not in ['EX', 'TRC', 'NA', 'PASS', 'DISC']):
                                     course_title += w_text + ' '
                                     seen_words.add(w_text)
                         
@@ -623,13 +808,7 @@ def parse_transcript(pdf_bytes):
                         # For EX: add to transferCredits array (exemptions)
                         if grade_value == 'TRC':
                             # Check if already added to terms
-                            already_in_terms = any(
-                                c['course']['courseCode'] == course_key 
-                                for c in all_courses 
-                                if c.get('assignedTerm', {}).get('term') == TRANSFER_CREDITS
-                            )
-                            
-                            if not already_in_terms:
+                            if course_key not in transfer_course_codes:
                                 transfer_year = '2020'  # Default year if not found
                                 
                                 course_obj = {
@@ -649,12 +828,13 @@ def parse_transcript(pdf_bytes):
                                 
                                 all_courses.append({
                                     'page': page_num,
-                                    'lineIndex': int(words[transfer_word_idx][1]),
+                                    'lineIndex': int(ys[transfer_word_idx]),
                                     'rowIndex': transfer_word_idx,
                                     'tableIndex': -1,
                                     'course': course_obj,
                                     'assignedTerm': {'term': TRANSFER_CREDITS, 'year': transfer_year}
                                 })
+                                transfer_course_codes.add(course_obj['courseCode'])
                         else:
                             # EX grade - add to exempted courses
                             course_code_clean = course_key.replace(' ', '')
@@ -668,22 +848,18 @@ def parse_transcript(pdf_bytes):
                 transfer_word_idx += 1
             
             # Collect term GPAs (we'll match them to terms after processing all pages)
-            for word_idx, word in enumerate(words):
-                word_text = word[4].strip()
-                word_y = word[1]
-                
+            for word_idx, word_text in enumerate(texts):
                 # Check for "Term GPA" pattern
                 if 'Term' in word_text:
                     # Check if next word is "GPA" or "G PA"
-                    if word_idx + 1 < len(words):
-                        next_word = words[word_idx + 1][4].strip()
+                    if word_idx + 1 < num_words:
+                        next_word = texts[word_idx + 1]
                         if 'GPA' in next_word or 'G PA' in next_word:
                             # Found "Term GPA" - now find the GPA value
                             gpa_val = None
-                            for j in range(word_idx + 2, min(word_idx + 5, len(words))):
-                                gpa_word = words[j][4].strip()
+                            for j in range(word_idx + 2, min(word_idx + 5, num_words)):
                                 # Try to extract GPA value
-                                gpa_match = re.search(r'(\d+)\.?(\d*)', gpa_word)
+                                gpa_match = GPA_VALUE_RE.search(texts[j])
                                 if gpa_match:
                                     gpa_str = f"{gpa_match.group(1)}.{gpa_match.group(2) or '0'}"
                                     try:
@@ -695,62 +871,31 @@ def parse_transcript(pdf_bytes):
                             if gpa_val is not None:
                                 term_gpas.append({
                                     'page': page_num,
-                                    'y': word_y,
+                                    'y': ys[word_idx],
                                     'gpa': gpa_val
                                 })
             
             # Second pass: extract courses using word positions
+            # Rows are read by column where a course table header gives the layout
+            page_layouts = find_course_table_layouts(tokens)
+            page_layout_ys = [layout.y for layout in page_layouts]
+            rows_of_words = group_rows(ys) if page_layouts or course_table_layout else None
             i = 0
-            while i < len(words) - 2:
-                word1 = words[i]
-                word2 = words[i + 1] if i + 1 < len(words) else None
-                word3 = words[i + 2] if i + 2 < len(words) else None
-                
-                if not word2 or not word3:
-                    i += 1
-                    continue
-                
-                text1 = word1[4].strip()  # word[4] is the text
-                text2 = word2[4].strip()
-                text3 = word3[4].strip()
+            while i < num_words - 2:
+                text1 = texts[i]
+                text2 = texts[i + 1]
+                text3 = texts[i + 2]
                 
                 # Check for course pattern
-                if (is_course_code(text1) and is_course_number(text2) and is_section(text3)):
-                    excluded_codes = {'COURSE', 'GRADE', 'GPA', 'AVG', 'SIZE', 'OTHER', 
-                                     'NOTATION', 'CLASS', 'PROGRAM', 'EARNED', 'EX', 'TRC', 'NA', 
-                                     'TRANSFER', 'CREDITS', 'ATTEMPTED', 'DESCRIPTION', 'YEAR',
-                                     'BEGINNING', 'END', 'RECORD', 'WEB', 'PAGE'}
-                    if text1 in excluded_codes:
-                        i += 1
-                        continue
-                    
-                    # Look ahead for grade and credits
-                    # Pattern is usually: course_code course_number section credits grade [gpa] [other]
-                    grade = None
-                    course_credits = None
-                    gpa = None
-                    
-                    for j in range(i + 3, min(i + 20, len(words))):
-                        w = words[j]
-                        w_text = w[4].strip()
-                        
-                        # Check for credits first (decimal numbers like 3.00, 0.00)
-                        if course_credits is None and re.match(DECIMAL_TWO_PLACES_PATTERN, w_text):
-                            course_credits = float(w_text)
-                            continue
-                        
-                        # Check for grade (after credits)
-                        if not grade:
-                            # Accept letter grades and special transcript notations.
-                            if (re.match(r'^[A-F][+-]?$', w_text, re.IGNORECASE) or
-                                re.match(r'^PASS$|^EX$|^TRC$|^DISC$', w_text, re.IGNORECASE)):
-                                grade = w_text.upper()
-                        
-                        # Check for GPA (decimal number after grade, usually > 0)
-                        if grade and gpa is None and re.match(DECIMAL_TWO_PLACES_PATTERN, w_text):
-                            val = float(w_text)
-                            if val > 0:  # GPA is usually > 0
-                                gpa = val
+                if (flags[i] & TOKEN_COURSE_CODE and flags[i + 1] & TOKEN_COURSE_NUMBER and
+                        flags[i + 2] & TOKEN_SECTION):
+                    # Table the course row is in: the closest header above it, or the one continuing from the previous page
+                    layout_index = bisect_left(page_layout_ys, ys[i])
+                    layout = page_layouts[layout_index - 1] if layout_index else course_table_layout
+                    if layout:
+                        course_credits, grade, gpa = layout.course_fields(tokens, rows_of_words[i])
+                    else:
+                        course_credits, grade, gpa = lookahead_course_fields(tokens, i)
                     
                     # Allow courses with 0 credits if they have a grade (like CWTE courses with PASS)
                     if course_credits is None and not grade:
@@ -768,7 +913,7 @@ def parse_transcript(pdf_bytes):
                     # Skip if no credits and no grade (likely not a real course)
                     # Exception: CWTE courses are valid even with 0 credits and no visible grade
                     # (they may have notations like WKRT, RPT instead of grades)
-                    is_cwte = text1.upper() == 'CWTE'
+                    is_cwte = uppers[i] == 'CWTE'
                     if course['credits'] == 0 and not course['grade'] and not is_cwte:
                         i += 1
                         continue
@@ -776,14 +921,13 @@ def parse_transcript(pdf_bytes):
                     # For CWTE courses with 0 credits and no grade, check for valid notations
                     if is_cwte and course['credits'] == 0 and not course['grade']:
                         # Look for notations like WKRT, RPT that indicate it's a valid course
-                        for j in range(i + 3, min(i + 15, len(words))):
-                            w_text = words[j][4].strip().upper()
+                        for j in range(i + 3, min(i + 15, num_words)):
                             # Check if on same line
-                            if abs(words[j][1] - word1[1]) < 5:
+                            if abs(ys[j] - ys[i]) < 5:
                                 # Valid notations for CWTE courses
-                                if w_text in ['WKRT', 'RPT', 'PASS', 'EX']:
+                                if uppers[j] in ['WKRT', 'RPT', 'PASS', 'EX']:
                                     # Set notation as other field if available
-                                    course['other'] = w_text
+                                    course['other'] = uppers[j]
                                     break
                         # If no notation found, still allow it (CWTE courses are valid)
                         # But we'll keep it even without notation
@@ -802,10 +946,9 @@ def parse_transcript(pdf_bytes):
                         transfer_year = '2020'  # Default year
                         
                         # Look for year in nearby words
-                        for k in range(max(0, i - 5), min(i + 15, len(words))):
-                            w_text = words[k][4].strip()
-                            if re.match(YEAR_PATTERN, w_text):
-                                transfer_year = w_text
+                        for k in range(max(0, i - 5), min(i + 15, num_words)):
+                            if flags[k] & TOKEN_YEAR:
+                                transfer_year = texts[k]
                                 break
 
                         course['term'] = TRANSFER_CREDITS
@@ -814,45 +957,29 @@ def parse_transcript(pdf_bytes):
                         # Add to all_courses with assigned term
                         all_courses.append({
                             'page': page_num,
-                            'lineIndex': int(word1[1]),
+                            'lineIndex': int(ys[i]),
                             'rowIndex': i,
                             'tableIndex': -1,
                             'course': course,
                             'assignedTerm': {'term': TRANSFER_CREDITS, 'year': transfer_year}
                         })
+                        transfer_course_codes.add(course['courseCode'])
                         i += 3
                         continue
                     
                     # Find which term this course belongs to based on Y position
-                    course_y = word1[1]  # y0 position
+                    course_y = ys[i]  # y0 position
                     
                     # Find the term header that comes immediately before this course
                     # and the next term header that comes after
-                    best_term = None
-                    next_term_y = None
-                    
-                    # Get all term headers on this page, sorted by Y
-                    page_terms = [(th['y'], th) for th in term_headers if th['page'] == page_num and 'y' in th]
-                    page_terms.sort(key=lambda x: x[0])
-                    
-                    # Find the term header immediately before this course
-                    for term_y, th in reversed(page_terms):
-                        if term_y < course_y:
-                            best_term = th
-                            break
-                    
-                    # Find the next term header after this course (if any)
-                    for term_y, th in page_terms:
-                        if term_y > course_y:
-                            next_term_y = term_y
-                            break
+                    before = bisect_left(page_term_ys, course_y)
+                    best_term = page_terms[before - 1] if before else None
+                    after = bisect_right(page_term_ys, course_y)
+                    next_term_y = page_term_ys[after] if after < len(page_term_ys) else None
                     
                     # If no term found on this page, check previous pages
                     if not best_term:
-                        for th in reversed(term_headers):
-                            if th['page'] < page_num:
-                                best_term = th
-                                break
+                        best_term = previous_page_term
                     
                     # Only assign if we found a term and the course is between term headers
                     if best_term and (next_term_y is None or course_y < next_term_y):
@@ -868,6 +995,9 @@ def parse_transcript(pdf_bytes):
                     i += 3  # Skip past the course code, number, and section
                 else:
                     i += 1
+            
+            if page_layouts:
+                course_table_layout = page_layouts[-1]
     
     finally:
         doc.close()
@@ -878,32 +1008,16 @@ def parse_transcript(pdf_bytes):
     sorted_terms = sorted(term_headers, key=lambda th: (th['page'], th.get('y', 0)))
     sorted_gpas = sorted(term_gpas, key=lambda g: (g['page'], g['y']))
     
-    # Create a combined sorted list to understand the sequence
-    all_items = []
-    for th in sorted_terms:
-        all_items.append({'type': 'term', 'page': th['page'], 'y': th.get('y', 0), 'term': th})
-    for gpa in sorted_gpas:
-        all_items.append({'type': 'gpa', 'page': gpa['page'], 'y': gpa['y'], 'gpa': gpa})
-    all_items.sort(key=lambda x: (x['page'], x['y']))
+    sorted_term_positions = [(th['page'], th.get('y', 0)) for th in sorted_terms]
     
     # Match each GPA to the term that comes immediately before it
     for gpa_info in sorted_gpas:
-        gpa_page = gpa_info['page']
-        gpa_y = gpa_info['y']
         gpa_val = gpa_info['gpa']
-        gpa_position = (gpa_page, gpa_y)
+        gpa_position = (gpa_info['page'], gpa_info['y'])
         
         # Find the term that comes immediately before this GPA in the sequence
-        matching_term = None
-        
-        for item in all_items:
-            if item['type'] == 'term':
-                term_position = (item['page'], item['y'])
-                if term_position < gpa_position:
-                    matching_term = item['term']
-                elif term_position > gpa_position:
-                    # We've passed the GPA, stop looking
-                    break
+        before = bisect_left(sorted_term_positions, gpa_position)
+        matching_term = sorted_terms[before - 1] if before else None
         
         # Assign GPA to the matching term if it doesn't already have one
         if matching_term and not matching_term.get('gpa'):
@@ -912,6 +1026,10 @@ def parse_transcript(pdf_bytes):
     # Match courses to terms
     matched_courses = []
     seen_courses = set()  # Track (courseCode, section) to prevent duplicates
+    known_terms = {(th['term'], th['year']) for th in term_headers}
+    # Term headers sorted by position, for the fallback lookup by bisection
+    headers_by_line = sorted(term_headers, key=lambda th: (th['page'], th['lineIndex']))
+    header_line_positions = [(th['page'], th['lineIndex']) for th in headers_by_line]
     
     for course_info in all_courses:
         course = course_info['course']
@@ -944,11 +1062,7 @@ def parse_transcript(pdf_bytes):
         
         if assigned_term:
             # Verify the assigned term exists in term_headers
-            term_exists = any(
-                th['term'] == assigned_term['term'] and th['year'] == assigned_term['year']
-                for th in term_headers
-            )
-            if term_exists:
+            if (assigned_term['term'], assigned_term['year']) in known_terms:
                 matched_courses.append({
                     'course': course,
                     'term': assigned_term['term'],
@@ -959,17 +1073,11 @@ def parse_transcript(pdf_bytes):
         # Fallback: find the term header that comes immediately before this course
         course_position = (course_info['page'], course_info['lineIndex'])
         
+        # Term must come before course; the first header found at that position wins
+        before = bisect_left(header_line_positions, course_position)
         best_term = None
-        best_position = None
-        
-        for th in term_headers:
-            term_position = (th['page'], th['lineIndex'])
-            
-            # Term must come before course
-            if term_position < course_position:
-                if best_position is None or term_position > best_position:
-                    best_position = term_position
-                    best_term = th
+        if before:
+            best_term = headers_by_line[bisect_left(header_line_positions, header_line_positions[before - 1])]
         
         # If no term found, skip this course (it's likely a header or invalid)
         if not best_term:
@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.bs4_utils import get_all_links_from_div
 from scraper.gina_cody_degree_scraper import GinaCodyDegreeScraper
 from scraper.course_data_scraper import get_course_scraper_instance
+from scraper.shared_results import get_shared_result
 from models import Rule, RuleType, CoursePool, ECPDegreeIDs, ExcessCreditsOverflowParams, MaxCoursesFromSetParams, MaxCreditsFromSetParams
 from utils.parsing_utils import COURSE_REGEX
 
@@ -79,6 +80,8 @@ class CompDegreeScraper(GinaCodyDegreeScraper):
         comp_general_electives_pool.courses = list(allowed_courses)
 
 class CompVariantDegreeScraper(GinaCodyDegreeScraper):
+    BCOMPSC_REQUIREMENTS_URL = "https://www.concordia.ca/academics/undergraduate/calendar/current/section-71-gina-cody-school-of-engineering-and-computer-science/section-71-70-department-of-computer-science-and-software-engineering/section-71-70-2-degree-requirements-bcompsc-.html"
+
     def _get_program_node(self, soup):
         # First try without any replacement
         program_node = soup.find("div", class_="program-node", attrs={"title": self.degree_name})
@@ -95,7 +98,11 @@ class CompVariantDegreeScraper(GinaCodyDegreeScraper):
         raise ValueError(f"Program node for '{self.degree_name}' not found in the degree requirements page.")
 
     def _handle_failed_course_pools(self, failed_pools):
-        self.computer_science_requirements = CompDegreeScraper("BCompSc in Computer Science", "COMP", ECPDegreeIDs.COMP_ECP_ID, "https://www.concordia.ca/academics/undergraduate/calendar/current/section-71-gina-cody-school-of-engineering-and-computer-science/section-71-70-department-of-computer-science-and-software-engineering/section-71-70-2-degree-requirements-bcompsc-.html").scrape_degree()
+        # Every joint-major variant falls back to the same BCompSc requirements, so they are scraped once per run
+        self.computer_science_requirements = get_shared_result(
+            ("bcompsc_requirements", self.BCOMPSC_REQUIREMENTS_URL),
+            lambda: CompDegreeScraper("BCompSc in Computer Science", "COMP", ECPDegreeIDs.COMP_ECP_ID, self.BCOMPSC_REQUIREMENTS_URL).scrape_degree(),
+        )
         comp_science_pool_names = [p.name for p in self.computer_science_requirements.coursePools]
         for pool in failed_pools:
             if pool.name in comp_science_pool_names:
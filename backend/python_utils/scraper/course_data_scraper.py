@@ -1,5 +1,9 @@
 import sys
 import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 # Add the root folder (parent of scraper) to Python path
@@ -8,7 +12,8 @@ from utils.bs4_utils import get_all_links_from_div, get_soup
 from utils.parsing_utils import clean_text, parse_course_title_and_credits, parse_course_rules, split_sections, parse_course_components, get_course_sort_key
 from utils.logging_utils import get_logger
 from utils.concordia_api_utils import get_concordia_api_instance
-from models import AnchorLink, Course, serialize
+from utils.shared_cache import get_or_compute_shared, delete_shared
+from models import AnchorLink, Course, CourseCatalogSnapshot, serialize
 
 class CourseDataScraper:
     QUICK_LINKS_ROOT_URL = "https://www.concordia.ca/academics/undergraduate/calendar/current/quick-links.html"
@@ -20,14 +25,33 @@ class CourseDataScraper:
         "Institute for Co-operative Education Courses",
     }
     ALL_SEMESTERS = ["Fall", "Winter", "Summer"]
+    # Bump when the Course model changes so snapshots written by older code are rescraped
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_FILENAME = "course_catalog_snapshot.json"
+    # Subject pages fetched and parsed in parallel; 1 keeps the sequential scrape
+    SUBJECT_FETCH_CONCURRENCY = int(os.getenv("SCRAPER_SUBJECT_CONCURRENCY", "4"))
+    # Shared cache entries (see utils.shared_cache), so only one worker scrapes the catalog
+    SHARED_CATALOG_NAME = f"courses:v{SNAPSHOT_VERSION}"
+    SHARED_TERMS_TTL_SECONDS = 7 * 24 * 60 * 60
+    # A catalog another worker published this recently satisfies a scheduled refresh
+    SHARED_REFRESH_REUSE_SECONDS = 15 * 60
 
     all_courses: dict[str, Course] = {}
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
         self.logger = get_logger("CourseDataScraper")
+        self.course_terms: Optional[dict[str, list[str]]] = None
+        self.cache_dir = cache_dir
+        self.scraped_at: Optional[float] = None
+        self._scrape_lock = threading.Lock()
+        self._terms_lock = threading.Lock()
 
     def scrape_all_courses(self) -> None:
         self.logger.info("Scraping all courses from website...")
+        # Resolve the offered terms of every course once, from the latest datasets
+        self.course_terms = None
+        # Build the catalog in a new dict and publish it at the end so readers never see a partial scrape
+        courses: dict[str, Course] = {}
         faculty_links = self._scrape_faculty_links()
         # Get all course subjects for each faculty
         for link in faculty_links:
@@ -52,15 +76,105 @@ class CourseDataScraper:
                     unique_links.append(subject_link)
             subjects = unique_links
 
-            courses = self._extract_courses_from_subjects(subjects)
-            self.logger.info(f"Extracted {len(courses)} courses for faculty: {link.text}")
-            for course in courses:
-                self.all_courses[course._id] = course
+            faculty_courses = self._extract_courses_from_subjects(subjects)
+            self.logger.info(f"Extracted {len(faculty_courses)} courses for faculty: {link.text}")
+            for course in faculty_courses:
+                courses[course._id] = course
         self.logger.info("Patching CWT 101,201,301 and 401 courses with correct rules and credits...")
-        self._patch_cwt_courses()
+        self._patch_cwt_courses(courses)
         self.logger.info("Adding extra CWT 100,200,300 and 400 courses...")
-        self._add_extra_cwt_courses()
-        self.logger.info(f"Total courses scraped: {len(self.all_courses)}")
+        self._add_extra_cwt_courses(courses)
+        CourseDataScraper.all_courses = courses
+        self.scraped_at = time.time()
+        self.logger.info(f"Total courses scraped: {len(courses)}")
+        self.save_snapshot()
+
+    def refresh_all_courses(self) -> None:
+        """Rescrapes the catalog and replaces the snapshot, serving the current catalog until it is done."""
+        with self._scrape_lock:
+            self._scrape_shared(reuse_after=time.time() - self.SHARED_REFRESH_REUSE_SECONDS)
+
+    def _scrape_shared(self, reuse_after: Optional[float] = None) -> None:
+        """
+        Scrapes the catalog in one worker at a time and publishes it to the others through the shared cache.
+        A worker that finds a published catalog (scraped after reuse_after, if given) loads it instead of scraping.
+        """
+        scraped_here = False
+
+        def scrape() -> CourseCatalogSnapshot:
+            nonlocal scraped_here
+            self.scrape_all_courses()
+            scraped_here = True
+            return self._build_snapshot()
+
+        snapshot = get_or_compute_shared(
+            self.SHARED_CATALOG_NAME,
+            scrape,
+            encode=lambda snapshot: snapshot.model_dump_json(by_alias=True).encode(),
+            decode=CourseCatalogSnapshot.model_validate_json,
+            accept=lambda snapshot: reuse_after is None or snapshot.scrapedAt >= reuse_after,
+        )
+        if not scraped_here:
+            self._apply_snapshot(snapshot, "the shared cache")
+            self.save_snapshot()
+
+    def get_snapshot_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, self.SNAPSHOT_FILENAME)
+
+    def load_snapshot(self) -> bool:
+        path = self.get_snapshot_path()
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                snapshot = CourseCatalogSnapshot.model_validate_json(f.read())
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable course catalog snapshot {path}: {e}")
+            return False
+        if snapshot.version != self.SNAPSHOT_VERSION:
+            self.logger.info(f"Ignoring course catalog snapshot version {snapshot.version}, expected {self.SNAPSHOT_VERSION}")
+            return False
+        self._apply_snapshot(snapshot, path)
+        return True
+
+    def _apply_snapshot(self, snapshot: CourseCatalogSnapshot, source: str) -> None:
+        CourseDataScraper.all_courses = {course._id: course for course in snapshot.courses}
+        self.scraped_at = snapshot.scrapedAt
+        self.logger.info(f"Loaded {len(snapshot.courses)} courses from {source}")
+
+    def _build_snapshot(self) -> CourseCatalogSnapshot:
+        return CourseCatalogSnapshot(
+            version=self.SNAPSHOT_VERSION,
+            scrapedAt=self.scraped_at or time.time(),
+            courses=list(self.all_courses.values()),
+        )
+
+    def save_snapshot(self) -> None:
+        path = self.get_snapshot_path()
+        if not path:
+            return
+        snapshot = self._build_snapshot()
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot.model_dump_json(by_alias=True))
+            os.replace(tmp_path, path)
+            self.logger.info(f"Saved course catalog snapshot to {path}")
+        except OSError as e:
+            self.logger.warning(f"Failed to save course catalog snapshot {path}: {e}")
+
+    def invalidate_snapshot(self) -> None:
+        """
+        Deletes the on-disk and shared snapshots so the next load or refresh rescrapes;
+        the in-memory catalog is kept until replaced.
+        """
+        delete_shared(self.SHARED_CATALOG_NAME)
+        path = self.get_snapshot_path()
+        if path and os.path.exists(path):
+            os.remove(path)
+            self.logger.info(f"Deleted course catalog snapshot {path}")
     
     def get_courses_by_subjects(self, subjects: list[str], inclusive: bool = True, return_full_object: bool = False) -> list[Course] | list[str]:
         self._scrape_if_needed()
@@ -91,8 +205,11 @@ class CourseDataScraper:
         return sorted(self.all_courses.values(), key=lambda course: get_course_sort_key(course._id))
 
     def _scrape_if_needed(self) -> None:
-        if not self.all_courses:
-            self.scrape_all_courses()
+        if self.all_courses:
+            return
+        with self._scrape_lock:
+            if not self.all_courses and not self.load_snapshot():
+                self._scrape_shared()
 
     def _scrape_faculty_links(self) -> list[AnchorLink]:
         # Get faculties
@@ -105,12 +222,20 @@ class CourseDataScraper:
 
     def _extract_courses_from_subjects(self, subjects) -> list[Course]:
         courses = []
-        for subject in subjects:
-            courses.extend(self._parse_course_objects(subject.url))
+        if self.SUBJECT_FETCH_CONCURRENCY <= 1 or len(subjects) <= 1:
+            for subject in subjects:
+                courses.extend(self._parse_course_objects(subject.url))
+            return courses
+
+        # Each worker fetches and parses one subject page; per-host request limits are enforced in web_utils.get
+        with ThreadPoolExecutor(max_workers=self.SUBJECT_FETCH_CONCURRENCY, thread_name_prefix="subject-fetch") as executor:
+            for subject_courses in executor.map(self._parse_course_objects, [subject.url for subject in subjects]):
+                courses.extend(subject_courses)
         return courses
 
     def _parse_course_objects(self, url: str) -> list[Course]:
-        soup = get_soup(url)
+        # Each subject page is read once per scrape, so keep it out of any active page cache
+        soup = get_soup(url, use_cache=False)
 
         courses: list[Course] = []
 
@@ -133,10 +258,7 @@ class CourseDataScraper:
             
             sections = split_sections(full_text)
             
-            if "CWT" in course_id:
-                offered_in = self.ALL_SEMESTERS
-            else:
-                offered_in = get_concordia_api_instance().get_term(course_id)
+            offered_in = self._get_offered_in(course_id)
 
             # Create Course object
             course = Course(
@@ -155,19 +277,47 @@ class CourseDataScraper:
 
         return courses
 
-    def _patch_cwt_courses(self) -> None:
+    def _get_offered_in(self, course_id: str) -> list[str]:
+        if "CWT" in course_id:
+            return self.ALL_SEMESTERS
+        if self.course_terms is None:
+            with self._terms_lock:
+                if self.course_terms is None:
+                    self.course_terms = self._load_course_terms()
+        return list(self.course_terms.get(course_id, []))
+
+    def _load_course_terms(self) -> dict[str, list[str]]:
+        # Every worker derives the same terms from the same datasets, so share them by dataset version
+        concordia_api = get_concordia_api_instance()
+        if not concordia_api.has_datasets():
+            # Without datasets every course would get empty offeredIn terms; nothing is kept, so the next call retries
+            raise RuntimeError("Concordia datasets are not loaded yet, cannot look up course terms")
+        dataset_version = concordia_api.get_dataset_version()
+        if dataset_version is None:
+            return concordia_api.get_terms_for_all_courses()
+        return get_or_compute_shared(
+            f"course_terms:{dataset_version}",
+            concordia_api.get_terms_for_all_courses,
+            encode=lambda terms: json.dumps(terms).encode(),
+            decode=json.loads,
+            ttl=self.SHARED_TERMS_TTL_SECONDS,
+        )
+
+    def _patch_cwt_courses(self, courses: Optional[dict[str, Course]] = None) -> None:
         # Patch CWT 101, 201, 301 and 401 courses with correct rules and credits
+        courses = self.all_courses if courses is None else courses
         cwt_courses = ["CWT 101", "CWT 201", "CWT 301", "CWT 401"]
         for course_id in cwt_courses:
-            if course_id in self.all_courses:
-                course = self.all_courses[course_id]
+            if course_id in courses:
+                course = courses[course_id]
                 course.credits = 0.0
                 course.prereqCoreqText = f"Must be completed concurrently: {course_id.replace('101', '100').replace('201', '200').replace('301', '300').replace('401', '400')}."
                 course.rules = parse_course_rules(course.prereqCoreqText, course.notes)
-                self.all_courses[course_id] = course
+                courses[course_id] = course
 
-    def _add_extra_cwt_courses(self) -> None:
+    def _add_extra_cwt_courses(self, courses: Optional[dict[str, Course]] = None) -> None:
         # Add CWT courses that are not listed in the quick links
+        courses = self.all_courses if courses is None else courses
         extra_cwt_courses = [
             Course(_id="CWT 100", title="Co-op Work Term 1", credits=0.0, description="Co-op Work Term 1", offeredIn=self.ALL_SEMESTERS, prereqCoreqText="Must be completed concurrently: CWT 101", rules=[], notes="", components=[]),
             Course(_id="CWT 200", title="Co-op Work Term 2", credits=0.0, description="Co-op Work Term 2", offeredIn=self.ALL_SEMESTERS, prereqCoreqText="Must be completed previously: CWT 100, CWT 101. Must be completed concurrently: CWT 201", rules=[], notes="", components=[]),
@@ -176,12 +326,12 @@ class CourseDataScraper:
         ]
         for course in extra_cwt_courses:
             course.rules = parse_course_rules(course.prereqCoreqText, course.notes)
-            self.all_courses[course._id] = course
+            courses[course._id] = course
 
 course_scraper_instance: Optional[CourseDataScraper] = None
-def init_course_scraper_instance() -> None:
+def init_course_scraper_instance(cache_dir: Optional[str] = None) -> None:
     global course_scraper_instance
-    course_scraper_instance = CourseDataScraper()
+    course_scraper_instance = CourseDataScraper(cache_dir=cache_dir)
 
 def get_course_scraper_instance() -> CourseDataScraper:
     global course_scraper_instance
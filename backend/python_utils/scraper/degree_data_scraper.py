@@ -1,22 +1,36 @@
 import os
 import sys
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from utils.bs4_utils import get_all_links_from_div
+from utils.bs4_utils import get_all_links_from_div, page_cache_scope
 from utils.parsing_utils import COURSE_REGEX
 from utils.logging_utils import get_logger
+from utils.shared_cache import bump_shared_generation, delete_shared, get_or_compute_shared, get_shared_generation
 from models import AnchorLink, DegreeScraperConfig, ECPDegreeIDs, ProgramRequirements
 from scraper.abstract_degree_scraper import AbstractDegreeScraper
+from scraper.shared_results import shared_results_scope
 from scraper.gina_cody_degree_scraper import GinaCodyDegreeScraper, AeroDegreeScraper, CyberScDegreeScraper
 from scraper.comp_sci_degree_scraper import CompDegreeScraper, CompCaDegreeScraper, CompDsDegreeScraper, CompHlsDegreeScraper
 from scraper.ecp_coop_degree_scraper import EngrEcpDegreeScraper, CompEcpDegreeScraper, CompHlsEcpDegreeScraper,CoopDegreeScraper
 
 class DegreeDataScraper():
     GINA_CODY_PROGRAMS_OFFERED_URL = "https://www.concordia.ca/academics/undergraduate/calendar/current/section-71-gina-cody-school-of-engineering-and-computer-science/section-71-10-gina-cody-school-of-engineering-and-computer-science.html#9919"
+    # Degree scrapers run concurrently by scrape_all_degrees; 1 keeps the sequential run
+    DEGREE_SCRAPE_CONCURRENCY = int(os.getenv("SCRAPER_DEGREE_CONCURRENCY", "4"))
+    # Scraped requirements are shared with the other workers (see utils.shared_cache) under a versioned key;
+    # bump the version when ProgramRequirements changes
+    SHARED_REQUIREMENTS_VERSION = 1
+    SHARED_REQUIREMENTS_TTL_SECONDS = int(os.getenv("SHARED_DEGREE_CACHE_SECONDS", str(24 * 60 * 60)))
+    SHARED_REQUIREMENTS_GENERATION = "degree_requirements"
 
     def __init__(self):
         self.logger = get_logger("DegreeDataScraper")
+        self.requirements_generation = 0
         self.degree_scraper_config: list[DegreeScraperConfig] = [
             DegreeScraperConfig(long_name="BEng in Aerospace Engineering Option: Aerodynamics and Propulsion", marker="BEng in Aerospace Engineering", short_name="AERO", ecp_degree_id=ECPDegreeIDs.ENGR_ECP_ID, scraper_class=AeroDegreeScraper),
             DegreeScraperConfig(long_name="BEng in Aerospace Engineering Option: Aerospace Structures and Materials", marker="BEng in Aerospace Engineering", short_name="AERO", ecp_degree_id=ECPDegreeIDs.ENGR_ECP_ID, scraper_class=AeroDegreeScraper),
@@ -76,12 +90,70 @@ class DegreeDataScraper():
         scraper = self.degree_scrapers.get(degree_name)
         if not scraper:
             raise ValueError(f"Degree scraper for '{degree_name}' not found.")
-        return scraper.scrape_degree()
+        # Pages shared by several pools (or by a variant and its base degree) are fetched and parsed once
+        with page_cache_scope(), shared_results_scope():
+            return self._scrape_degree(scraper)
     
-    def scrape_all_degrees(self) -> list[ProgramRequirements]:
-        responses = []
+    def scrape_all_degrees(self, on_progress: Optional[Callable[[int, int], None]] = None) -> list[ProgramRequirements]:
+        """Scrapes every degree, calling on_progress(degrees_done, degrees_total) as each one finishes."""
+        return list(self.iter_all_degrees(on_progress))
+
+    def iter_all_degrees(self, on_progress: Optional[Callable[[int, int], None]] = None) -> Iterator[ProgramRequirements]:
+        """Yields every degree in config order as soon as it (and the ones before it) are scraped."""
+        scrapers = list(self.degree_scrapers.values())
+        progress_lock = threading.Lock()
+        done = 0
+
+        def scrape(scraper: AbstractDegreeScraper) -> ProgramRequirements:
+            nonlocal done
+            response = self._scrape_degree(scraper)
+            if on_progress:
+                with progress_lock:
+                    done += 1
+                    on_progress(done, len(scrapers))
+            return response
+
+        with page_cache_scope(), shared_results_scope() as shared:
+            if self.DEGREE_SCRAPE_CONCURRENCY <= 1:
+                for scraper in scrapers:
+                    yield scrape(scraper)
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.DEGREE_SCRAPE_CONCURRENCY, thread_name_prefix="degree-scrape")
+                try:
+                    yield from executor.map(scrape, scrapers)
+                finally:
+                    # A consumer that stops early (e.g. a closed stream) does not wait for the remaining degrees
+                    executor.shutdown(wait=True, cancel_futures=True)
+            self.logger.info(f"Scraped {len(scrapers)} degrees, shared results: {shared.stats}")
+
+    def requirements_version(self) -> tuple:
+        """
+        Changes whenever the requirements may have: on invalidate_shared_requirements (in any worker, through the
+        shared generation) and every SHARED_REQUIREMENTS_TTL_SECONDS, as the shared requirements expire.
+        """
+        return (self.requirements_generation, get_shared_generation(self.SHARED_REQUIREMENTS_GENERATION),
+                int(time.time() // self.SHARED_REQUIREMENTS_TTL_SECONDS))
+
+    def invalidate_shared_requirements(self) -> None:
+        """Deletes every degree's shared requirements, so the next request for each one scrapes it again."""
+        self.requirements_generation += 1
+        bump_shared_generation(self.SHARED_REQUIREMENTS_GENERATION)
         for scraper in self.degree_scrapers.values():
+            delete_shared(self._shared_requirements_name(scraper))
+        self.logger.info(f"Invalidated shared requirements of {len(self.degree_scrapers)} degrees")
+
+    def _shared_requirements_name(self, scraper: AbstractDegreeScraper) -> str:
+        return f"degree_requirements:v{self.SHARED_REQUIREMENTS_VERSION}:{scraper.degree_name}"
+
+    def _scrape_degree(self, scraper: AbstractDegreeScraper) -> ProgramRequirements:
+        def scrape() -> ProgramRequirements:
             self.logger.info(f"Scraping degree: {scraper.degree_name}")
-            response = scraper.scrape_degree()
-            responses.append(response)
-        return responses
\ No newline at end of file
+            return scraper.scrape_degree()
+
+        return get_or_compute_shared(
+            self._shared_requirements_name(scraper),
+            scrape,
+            encode=lambda requirements: requirements.model_dump_json(by_alias=True).encode(),
+            decode=ProgramRequirements.model_validate_json,
+            ttl=self.SHARED_REQUIREMENTS_TTL_SECONDS,
+        )
\ No newline at end of file
@@ -8,6 +8,7 @@ from utils.parsing_utils import COURSE_REGEX, extract_name_and_credits
 from models import AnchorLink, CoursePool, DegreeType, RuleType
 from scraper.abstract_degree_scraper import AbstractDegreeScraper
 from scraper.course_data_scraper import get_course_scraper_instance
+from scraper.shared_results import get_shared_result
 
 class GinaCodyDegreeScraper(AbstractDegreeScraper):
     ENGINEERING_CORE_COURSES_URL = "https://www.concordia.ca/academics/undergraduate/calendar/current/section-71-gina-cody-school-of-engineering-and-computer-science/section-71-20-beng/section-71-20-5-degree-requirements.html#12215"
@@ -79,9 +80,11 @@ class GinaCodyDegreeScraper(AbstractDegreeScraper):
                 self.logger.warning(f"Warning: No special handling defined for failed course pool '{pool.name}' in '{self.program_requirements.degree.name}' degree")
     
     def _handle_engineering_core(self, pool: CoursePool):
-        courses_list = get_all_links_from_div(self.ENGINEERING_CORE_COURSES_URL, ["formatted-course"], include_regex=COURSE_REGEX)
-        for course in courses_list:
-            pool.courses.append(course.text)
+        courses_list = get_shared_result(
+            "engineering_core_courses",
+            lambda: [course.text for course in get_all_links_from_div(self.ENGINEERING_CORE_COURSES_URL, ["formatted-course"], include_regex=COURSE_REGEX)],
+        )
+        pool.courses.extend(courses_list)
         pool.creditsRequired -= 3
         # Creating General Education Humanities and Social Sciences Electives as separate pool
         gen_education_electives_pool = self._get_general_education_pool()
@@ -128,14 +131,18 @@ class GinaCodyDegreeScraper(AbstractDegreeScraper):
         allowed_course_subjects = ["ANTH", "FPST", "HIST", "PHIL", "RELI", "SOCI", "THEO", "WSDB", "ARTE", "ARTH", "JHIS", "MHIS"]
         other_allowed_courses = ["COMS 360", "EDUC 230", "ENCS 483", "ENGL 224", "ENGL 233", "GEOG 220", "INST 250", "LING 222", "LING 300", "URBS 230"]
         excluded_courses = ["ANTH 315", "PHIL 214", "PHIL 316", "PHIL 317", "SOCI 212", "SOCI 213", "SOCI 310"]
-        general_education_courses = get_course_scraper_instance().get_courses_by_subjects(allowed_course_subjects)
 
-        # Remove excluded courses
-        general_education_courses = [course for course in general_education_courses if course not in excluded_courses]
-        # Add other allowed courses (if not already present)
-        for course_id in other_allowed_courses:
-            if course_id not in general_education_courses:
-                general_education_courses.append(course_id)
+        def get_general_education_courses():
+            general_education_courses = get_course_scraper_instance().get_courses_by_subjects(allowed_course_subjects)
+            # Remove excluded courses
+            general_education_courses = [course for course in general_education_courses if course not in excluded_courses]
+            # Add other allowed courses (if not already present)
+            for course_id in other_allowed_courses:
+                if course_id not in general_education_courses:
+                    general_education_courses.append(course_id)
+            return general_education_courses
+
+        general_education_courses = get_shared_result("general_education_courses", get_general_education_courses)
 
         return CoursePool(
             _id=self.GENERAL_ELECTIVES,
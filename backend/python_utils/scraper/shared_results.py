@@ -0,0 +1,58 @@
+import copy
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Optional
+
+class SharedResults:
+    """
+    Intermediate results shared by the degree scrapers of one run (the BCompSc requirements, the Engineering
+    Core course list, the general education courses...). Each key is computed once, even when requested
+    concurrently, and every caller gets its own deep copy since scrapers modify the pools they receive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._results: dict[Hashable, Any] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._results:
+                with self._lock:
+                    self.stats["hits"] += 1
+            else:
+                with self._lock:
+                    self.stats["misses"] += 1
+                self._results[key] = compute()
+            return copy.deepcopy(self._results[key])
+
+_active_shared_results: Optional[SharedResults] = None
+_active_scopes = 0
+_scope_lock = threading.Lock()
+
+@contextmanager
+def shared_results_scope():
+    """Shares get_shared_result values until the outermost scope exits. Nested or concurrent scopes share one store."""
+    global _active_shared_results, _active_scopes
+    with _scope_lock:
+        if _active_shared_results is None:
+            _active_shared_results = SharedResults()
+        _active_scopes += 1
+        shared = _active_shared_results
+    try:
+        yield shared
+    finally:
+        with _scope_lock:
+            _active_scopes -= 1
+            if _active_scopes == 0:
+                _active_shared_results = None
+
+def get_shared_result(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Returns a copy of the run's shared value for key, computing it on first use; outside a scope just computes it."""
+    shared = _active_shared_results
+    if shared is None:
+        return compute()
+    return shared.get(key, compute)
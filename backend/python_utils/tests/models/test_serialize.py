@@ -1,14 +1,19 @@
 import unittest
 import sys
 import os
+import json
+import glob
 
 # Add the parent directory to the path to import the modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from models import (
-    serialize, DegreeType, AnchorLink, RuleType, Rule, MaxCoursesFromSetParams
+    serialize, serialize_json, DegreeType, AnchorLink, RuleType, Rule, MaxCoursesFromSetParams,
+    MinCoursesFromSetParams, Course, ProgramRequirements
 )
 
+EXPECTED_FIXTURE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../fixtures/expected"))
+
 
 class TestSerialize(unittest.TestCase):
     
@@ -48,5 +53,41 @@ class TestSerialize(unittest.TestCase):
         assert serialize([]) == []
 
 
+class TestSerializeJson(unittest.TestCase):
+
+    def test_course_matches_serialize(self):
+        """Test that the fast path keeps the _id alias and rule enum values"""
+        course = Course(
+            _id="COMP 352", title="Data Structures and Algorithms", credits=3, description="Stacks, queues...",
+            offeredIn=["Fall 2025", "Winter 2026"], prereqCoreqText="COMP 232; COMP 249.", notes="", components=["Lecture"],
+            rules=[Rule(type=RuleType.PREREQUISITE, params=MinCoursesFromSetParams(courseList=["COMP 232"], minCourses=1))],
+        )
+        encoded = json.loads(serialize_json(course))
+        assert encoded == serialize(course)
+        assert encoded["_id"] == "COMP 352"
+        assert encoded["rules"][0]["type"] == "prerequisite"
+        assert json.loads(serialize_json([course, course])) == serialize([course, course])
+
+    def test_program_requirements_match_fixtures(self):
+        """Test that every expected degree fixture round-trips through the fast path unchanged"""
+        degrees = []
+        for path in sorted(glob.glob(os.path.join(EXPECTED_FIXTURE_DIR, "*.json"))):
+            with open(path) as f:
+                expected = json.load(f)
+            degree = ProgramRequirements.model_validate(expected)
+            assert json.loads(serialize_json(degree)) == expected
+            degrees.append(degree)
+        assert json.loads(serialize_json(degrees)) == serialize(degrees)
+
+    def test_falls_back_to_serialize(self):
+        """Test values the pydantic fast path does not handle"""
+        link = AnchorLink(text="Test", url="http://test.com")
+        assert json.loads(serialize_json(["BEng in Software Engineering"])) == ["BEng in Software Engineering"]
+        assert json.loads(serialize_json([])) == []
+        assert json.loads(serialize_json({"degree": DegreeType.COOP, "links": [link]})) == {
+            "degree": "Co-op", "links": [{"text": "Test", "url": "http://test.com"}],
+        }
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
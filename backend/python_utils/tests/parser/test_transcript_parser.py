@@ -193,6 +193,58 @@ class TestIsTransferCredit:
         assert transcript_parser.is_transfer_credit({'grade': 'A'}) is False
 
 
+class TestTokenizeWords:
+    """Test classify_word and tokenize_words"""
+    
+    def test_classify_course_tokens(self):
+        assert transcript_parser.classify_word('COMP') & transcript_parser.TOKEN_COURSE_CODE
+        assert transcript_parser.classify_word('232') & transcript_parser.TOKEN_COURSE_NUMBER
+        assert transcript_parser.classify_word('EC') & transcript_parser.TOKEN_SECTION
+        assert not transcript_parser.classify_word('COURSE') & transcript_parser.TOKEN_COURSE_CODE
+    
+    def test_classify_grades(self):
+        flags = transcript_parser.classify_word('b+')
+        assert flags & transcript_parser.TOKEN_LETTER_GRADE
+        assert flags & transcript_parser.TOKEN_GRADE
+        flags = transcript_parser.classify_word('TRC')
+        assert flags & transcript_parser.TOKEN_GRADE
+        assert flags & transcript_parser.TOKEN_TRANSFER_GRADE
+        assert not flags & transcript_parser.TOKEN_LETTER_GRADE
+        assert transcript_parser.classify_word('PASS') & transcript_parser.TOKEN_GRADE
+        assert not transcript_parser.classify_word('G') & transcript_parser.TOKEN_GRADE
+    
+    def test_classify_numbers_and_terms(self):
+        assert transcript_parser.classify_word('3.00') & transcript_parser.TOKEN_DECIMAL
+        assert not transcript_parser.classify_word('3.0') & transcript_parser.TOKEN_DECIMAL
+        assert transcript_parser.classify_word('2023') & transcript_parser.TOKEN_YEAR
+        assert transcript_parser.classify_word('2025-26') & transcript_parser.TOKEN_TERM_YEAR
+        assert not transcript_parser.classify_word('2025-26') & transcript_parser.TOKEN_YEAR
+        assert transcript_parser.classify_word('Fall/Winter') & transcript_parser.TOKEN_TERM_NAME
+        assert transcript_parser.classify_word('Winter 2023') & transcript_parser.TOKEN_TERM_HEADER
+    
+    def test_tokenize_words_builds_parallel_arrays(self):
+        words = [
+            (0, 100, 30, 120, ' COMP ', 0, 0, 0),
+            (35, 100.5, 60, 120, '232', 0, 0, 1),
+            (80, 100, 100, 120, '3.00', 0, 0, 2),
+            (105, 100, 115, 120, 'a-', 0, 0, 3),
+        ]
+        tokens = transcript_parser.tokenize_words(words)
+        
+        assert len(tokens) == 4
+        assert tokens.texts == ['COMP', '232', '3.00', 'a-']
+        assert tokens.uppers == ['COMP', '232', '3.00', 'A-']
+        assert list(tokens.xs) == [0, 35, 80, 105]
+        assert list(tokens.ys) == [100, 100.5, 100, 100]
+        assert tokens.values == [None, None, 3.0, None]
+        assert tokens.flags[0] & transcript_parser.TOKEN_COURSE_CODE
+        assert tokens.flags[1] & transcript_parser.TOKEN_COURSE_NUMBER
+        assert tokens.flags[3] & transcript_parser.TOKEN_GRADE
+    
+    def test_tokenize_empty_page(self):
+        assert len(transcript_parser.tokenize_words([])) == 0
+
+
 class TestParseTranscript:
     """Test parse_transcript function with mocked PyMuPDF"""
     
@@ -1303,6 +1355,199 @@ class TestParseTranscript:
             assert 'Summer 2023' in semester['term']
         mock_doc.close.assert_called_once()
 
+    
+    @patch('parser.transcript_parser.fitz')
+    def test_parse_transcript_assigns_courses_to_nearest_term_above(self, mock_fitz):
+        """Test courses under several term headers on one page, and on the next page"""
+        mock_doc = MagicMock()
+        mock_doc.__len__ = Mock(return_value=2)
+        
+        def course_words(code, number, y):
+            return [
+                (0, y, 30, y + 20, code, 0, 0, 0),
+                (35, y, 60, y + 20, number, 0, 0, 1),
+                (65, y, 75, y + 20, 'S', 0, 0, 2),
+                (80, y, 100, y + 20, '3.00', 0, 0, 3),
+                (105, y, 115, y + 20, 'B', 0, 0, 4),
+            ]
+        
+        page1_words = (
+            [(0, 100, 50, 120, 'Fall', 0, 0, 0), (60, 100, 100, 120, '2022', 0, 0, 1)]
+            + course_words('COMP', '248', 130)
+            + [(0, 200, 50, 220, 'Winter', 0, 0, 0), (60, 200, 100, 220, '2023', 0, 0, 1)]
+            + course_words('COMP', '249', 230)
+            + course_words('SOEN', '228', 260)
+            + [(0, 300, 50, 320, 'Summer', 0, 0, 0), (60, 300, 100, 320, '2023', 0, 0, 1)]
+            + course_words('ENGR', '213', 330)
+        )
+        page2_words = course_words('ENGR', '233', 50)
+        
+        pages = []
+        for words in (page1_words, page2_words):
+            page = MagicMock()
+            page.get_text.side_effect = lambda mode=None, words=words: words if mode == "words" else 'text'
+            pages.append(page)
+        mock_doc.__getitem__ = lambda self, index: pages[index]
+        mock_fitz.open.return_value = mock_doc
+        
+        result = transcript_parser.parse_transcript(b'fake_pdf_bytes')
+        
+        semesters = {s['term']: [c['code'] for c in s['courses']] for s in result['semesters']}
+        assert semesters == {
+            'Fall 2022': ['COMP248'],
+            'Winter 2023': ['COMP249', 'SOEN228'],
+            'Summer 2023': ['ENGR213', 'ENGR233'],
+        }
+
+
+def table_header_words(y, shift=0):
+    """Words of a course table header (two stacked lines around y), with columns shifted right by shift"""
+    return [(x + (shift if x > 100 else 0), wy, x + 30, wy + 8, text, 0, 0, 0) for x, wy, text in [
+        (367, y - 4, 'CLASS'), (407, y - 4, 'CLASS'), (447, y - 4, 'PROGRAM'), (481, y - 4, 'CREDITS'),
+        (40, y, 'COURSE'), (116, y, 'DESCRIPTION'), (231, y, 'ATTEMPTED'), (276, y, 'GRADE'),
+        (306, y, 'NOTATION'), (345, y, 'GPA'), (531, y, 'OTHER'),
+        (367, y + 4, 'AVG'), (407, y + 4, 'SIZE'), (447, y + 4, 'EARNED'),
+    ]]
+
+
+def table_row_words(y, cells, shift=0):
+    """Words of a course row: cells maps x (before shift) to text; titles wrap above and below the row"""
+    return ([(40, y, 70, y + 8, cells.pop(40), 0, 0, 0), (74, y, 90, y + 8, cells.pop(74), 0, 0, 0),
+             (94, y, 110, y + 8, cells.pop(94), 0, 0, 0), (116 + shift, y - 4, 200, y + 4, 'WRAPPED', 0, 0, 0),
+             (116 + shift, y + 4, 200, y + 12, 'TITLE', 0, 0, 0)]
+            + [(x + shift, y, x + shift + 20, y + 8, text, 0, 0, 0) for x, text in cells.items()])
+
+
+class TestCourseTableLayout:
+    """Test the column-aware reading of course table rows"""
+
+    def test_group_rows_by_y(self):
+        rows = transcript_parser.group_rows([100, 96, 100.5, 104, 120, 119])
+        assert sorted(rows[0]) == [0, 2]
+        assert rows[0] is rows[2]
+        assert rows[1] == [1] and rows[3] == [3]
+        assert sorted(rows[4]) == [4, 5]
+
+    def test_layout_learned_from_header(self):
+        tokens = transcript_parser.tokenize_words(table_header_words(680, shift=-5))
+        layouts = transcript_parser.find_course_table_layouts(tokens)
+        assert len(layouts) == 1
+        layout = layouts[0]
+        assert layout.y == 680
+        assert layout.fields == ['description', 'credits', 'grade', 'notation', 'gpa', 'classAvg', 'classSize',
+                                 'creditsEarned', 'other']
+        assert layout.field_at(40) == 'course'
+        assert layout.field_at(226) == 'credits'
+        assert layout.field_at(402) == 'classSize'
+
+    def test_transfer_credit_header_is_not_a_course_table(self):
+        words = [(x, 415, x + 30, 423, text, 0, 0, 0) for x, text in [
+            (40, 'COURSE'), (136, 'DESCRIPTION'), (232, 'GRADE'), (285, 'YEAR'), (304, 'ATTENDED')]]
+        assert transcript_parser.find_course_table_layouts(transcript_parser.tokenize_words(words)) == []
+
+    def test_course_fields_read_by_column(self):
+        words = table_header_words(680) + table_row_words(702, {
+            40: 'COMP', 74: '232', 94: 'PP', 231: '3.00', 276: 'A', 345: '4.00', 367: '3.01', 407: '93', 447: '3.00'})
+        tokens = transcript_parser.tokenize_words(words)
+        layout = transcript_parser.find_course_table_layouts(tokens)[0]
+        rows = transcript_parser.group_rows(tokens.ys)
+        course_idx = tokens.texts.index('COMP')
+        assert layout.course_fields(tokens, rows[course_idx]) == (3.0, 'A', 4.0)
+
+    def test_pass_course_has_no_gpa(self):
+        words = table_header_words(680) + table_row_words(702, {
+            40: 'CWTE', 74: '100', 94: 'S', 231: '0.00', 276: 'PASS', 367: '3.00', 407: '40'})
+        tokens = transcript_parser.tokenize_words(words)
+        layout = transcript_parser.find_course_table_layouts(tokens)[0]
+        rows = transcript_parser.group_rows(tokens.ys)
+        assert layout.course_fields(tokens, rows[tokens.texts.index('CWTE')]) == (0.0, 'PASS', None)
+
+    @patch('parser.transcript_parser.fitz')
+    def test_parse_transcript_reads_rows_by_column(self, mock_fitz):
+        """An ungraded course does not take the grade of the next row, and tables with shifted columns and
+        rows continuing on the next page are read with their own header"""
+        mock_doc = MagicMock()
+        mock_doc.__len__ = Mock(return_value=2)
+        term_words = lambda y, term, year: [(36, y, 60, y + 8, term, 0, 0, 0), (63, y, 90, y + 8, year, 0, 0, 1)]
+        page1_words = (
+            term_words(100, 'Fall', '2024') + table_header_words(130)
+            + table_row_words(150, {40: 'COMP', 74: '472', 94: 'S', 231: '3.00', 447: '0.00'})
+            + table_row_words(170, {40: 'COMP', 74: '474', 94: 'S', 231: '3.00', 276: 'A', 345: '4.00'})
+            + term_words(300, 'Winter', '2025') + table_header_words(330, shift=-12)
+            + table_row_words(350, {40: 'SOEN', 74: '490', 94: 'S', 231: '3.00', 276: 'B+', 345: '3.30'}, shift=-12)
+        )
+        page2_words = table_row_words(40, {40: 'SOEN', 74: '491', 94: 'S', 231: '1.00', 276: 'A-', 345: '3.70'},
+                                      shift=-12)
+
+        pages = []
+        for words in (page1_words, page2_words):
+            page = MagicMock()
+            page.get_text.side_effect = lambda mode=None, words=words: words if mode == "words" else 'text'
+            pages.append(page)
+        mock_doc.__getitem__ = lambda self, index: pages[index]
+        mock_fitz.open.return_value = mock_doc
+
+        result = transcript_parser.parse_transcript(b'fake_pdf_bytes')
+
+        semesters = {s['term']: s['courses'] for s in result['semesters']}
+        assert semesters == {
+            'Fall 2024': [{'code': 'COMP472'}, {'code': 'COMP474', 'grade': 'A'}],
+            'Winter 2025': [{'code': 'SOEN490', 'grade': 'B+'}, {'code': 'SOEN491', 'grade': 'A-'}],
+        }
+
+
+class TestParseTranscriptUploadChecks:
+    """Test the checks parse_transcript runs on uploads before the full parse"""
+
+    @staticmethod
+    def make_pdf(pages):
+        import fitz
+        doc = fitz.open()
+        for text in pages:
+            doc.new_page().insert_text((50, 60), text, fontsize=8)
+        pdf_bytes = doc.tobytes()
+        doc.close()
+        return pdf_bytes
+
+    def test_rejects_pdf_over_page_limit(self):
+        pdf_bytes = self.make_pdf(['Student Record', 'Fall 2022', 'Winter 2023'])
+        with pytest.raises(transcript_parser.InvalidTranscriptError, match='3 pages'):
+            transcript_parser.parse_transcript(pdf_bytes, max_pages=2)
+        assert transcript_parser.parse_transcript(pdf_bytes, max_pages=3)['deficiencyCourses'] == []
+
+    def test_rejects_pdf_without_student_record_heading(self):
+        pdf_bytes = self.make_pdf(['Invoice 2023', 'Student Record'])
+        with pytest.raises(transcript_parser.InvalidTranscriptError, match='not a student record'):
+            transcript_parser.parse_transcript(pdf_bytes, require_student_record=True)
+        # Without the check the PDF is parsed as before
+        assert transcript_parser.parse_transcript(pdf_bytes)['deficiencyCourses'] == []
+
+    def test_student_record_heading_check_ignores_case(self):
+        pdf_bytes = self.make_pdf(['STUDENT RECORD\nFall 2022'])
+        assert transcript_parser.parse_transcript(pdf_bytes, require_student_record=True)['deficiencyCourses'] == []
+
+    @patch('parser.transcript_parser.fitz')
+    def test_student_record_check_runs_before_reading_words(self, mock_fitz):
+        mock_doc = MagicMock()
+        mock_doc.__len__ = Mock(return_value=2)
+        mock_page = MagicMock()
+        mock_page.get_text.return_value = 'Some other document'
+        mock_doc.__getitem__.return_value = mock_page
+        mock_fitz.open.return_value = mock_doc
+
+        with pytest.raises(transcript_parser.InvalidTranscriptError):
+            transcript_parser.parse_transcript(b'fake_pdf_bytes', require_student_record=True)
+
+        mock_page.get_text.assert_called_once_with()
+        mock_doc.close.assert_called_once()
+
+    def test_bytearray_is_opened_without_copy(self):
+        pdf_bytes = bytearray(self.make_pdf(['Student Record']))
+        with patch('parser.transcript_parser.fitz.open', wraps=__import__('fitz').open) as mock_open:
+            transcript_parser.parse_transcript(pdf_bytes, require_student_record=True)
+        stream = mock_open.call_args.kwargs['stream']
+        assert isinstance(stream, memoryview) and stream.obj is pdf_bytes
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
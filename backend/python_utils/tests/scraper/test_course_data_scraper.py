@@ -1,11 +1,15 @@
 from unittest.mock import patch, MagicMock
+import pytest
 import sys
 import os
+import threading
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from scraper.course_data_scraper import CourseDataScraper
-from models import Course, AnchorLink
+from models import Course, AnchorLink, CourseCatalogSnapshot, serialize
+from utils.parsing_utils import parse_course_rules
 
 
 class TestCourseDataScraper:
@@ -119,7 +123,7 @@ class TestCourseDataScraper:
         
         # Mock API instance
         mock_api = MagicMock()
-        mock_api.get_term.return_value = ["Fall", "Winter"]
+        mock_api.get_terms_for_all_courses.return_value = {"COMP 248": ["Fall", "Winter"]}
         mock_get_instance.return_value = mock_api
         
         scraper = CourseDataScraper()
@@ -127,6 +131,40 @@ class TestCourseDataScraper:
         
         assert len(result) == 1
         assert isinstance(result[0], Course)
+        assert result[0].offeredIn == ["Fall", "Winter"]
+        mock_api.get_term.assert_not_called()
+
+    @patch('scraper.course_data_scraper.get_concordia_api_instance')
+    def test_get_offered_in_resolves_all_terms_once(self, mock_get_instance):
+        """Test that offered terms come from one bulk lookup shared by all courses"""
+        mock_api = MagicMock()
+        mock_api.get_terms_for_all_courses.return_value = {"COMP 248": ["Fall"], "COMP 249": ["Winter"]}
+        mock_get_instance.return_value = mock_api
+
+        scraper = CourseDataScraper()
+        assert scraper._get_offered_in("COMP 248") == ["Fall"]
+        assert scraper._get_offered_in("COMP 249") == ["Winter"]
+        assert scraper._get_offered_in("COMP 999") == []
+        assert scraper._get_offered_in("CWT 101") == CourseDataScraper.ALL_SEMESTERS
+        mock_api.get_terms_for_all_courses.assert_called_once()
+
+    @patch('scraper.course_data_scraper.get_concordia_api_instance')
+    def test_get_offered_in_refuses_to_run_without_datasets(self, mock_get_instance):
+        """Test that terms are not looked up (or kept) before the datasets are loaded, and are once they are"""
+        mock_api = MagicMock()
+        mock_api.has_datasets.return_value = False
+        mock_api.get_dataset_version.return_value = None
+        mock_api.get_terms_for_all_courses.return_value = {"COMP 248": ["Fall"]}
+        mock_get_instance.return_value = mock_api
+
+        scraper = CourseDataScraper()
+        with pytest.raises(RuntimeError, match="datasets are not loaded"):
+            scraper._get_offered_in("COMP 248")
+        assert scraper.course_terms is None
+        mock_api.get_terms_for_all_courses.assert_not_called()
+
+        mock_api.has_datasets.return_value = True
+        assert scraper._get_offered_in("COMP 248") == ["Fall"]
 
     def test_patch_cwt_courses(self):
         """Test patching of CWT courses"""
@@ -207,3 +245,120 @@ class TestCourseDataScraper:
         assert mock_parse_objects.call_count == 2
         mock_parse_objects.assert_any_call("http://comp.com")
         mock_parse_objects.assert_any_call("http://math.com")
+
+    def _snapshot_course(self):
+        return Course(_id="COMP 249", title="OOP II", credits=3.5, description="Test", offeredIn=["Winter"],
+                      prereqCoreqText="Must be completed previously: COMP 248.",
+                      rules=parse_course_rules("Must be completed previously: COMP 248.", ""),
+                      notes="", components=["Lecture"])
+
+    def test_snapshot_round_trip(self, tmp_path):
+        scraper = CourseDataScraper(cache_dir=str(tmp_path))
+        course = self._snapshot_course()
+        scraper.all_courses["COMP 249"] = course
+        scraper.scraped_at = 1700000000.0
+        scraper.save_snapshot()
+
+        CourseDataScraper.all_courses = {}
+        reloaded = CourseDataScraper(cache_dir=str(tmp_path))
+        assert reloaded.load_snapshot() is True
+        assert reloaded.scraped_at == 1700000000.0
+        assert reloaded.all_courses["COMP 249"] == course
+        assert serialize(reloaded.all_courses["COMP 249"]) == serialize(course)
+
+    def test_load_snapshot_ignores_other_versions_and_corrupt_files(self, tmp_path):
+        scraper = CourseDataScraper(cache_dir=str(tmp_path))
+        scraper.all_courses["COMP 249"] = self._snapshot_course()
+        scraper.save_snapshot()
+        CourseDataScraper.all_courses = {}
+
+        with patch.object(CourseDataScraper, "SNAPSHOT_VERSION", CourseDataScraper.SNAPSHOT_VERSION + 1):
+            assert scraper.load_snapshot() is False
+        (tmp_path / CourseDataScraper.SNAPSHOT_FILENAME).write_text("{not json")
+        assert scraper.load_snapshot() is False
+        assert CourseDataScraper(cache_dir=None).load_snapshot() is False
+        assert CourseDataScraper.all_courses == {}
+
+    @patch.object(CourseDataScraper, "scrape_all_courses")
+    def test_scrape_if_needed_prefers_snapshot(self, mock_scrape, tmp_path):
+        scraper = CourseDataScraper(cache_dir=str(tmp_path))
+        scraper.all_courses["COMP 249"] = self._snapshot_course()
+        scraper.save_snapshot()
+        CourseDataScraper.all_courses = {}
+
+        assert scraper.get_all_courses() == ["COMP 249"]
+        mock_scrape.assert_not_called()
+
+    @patch.object(CourseDataScraper, "_extract_courses_from_subjects")
+    @patch.object(CourseDataScraper, "_scrape_faculty_links")
+    def test_scrape_all_courses_writes_snapshot(self, mock_faculty_links, mock_extract, tmp_path):
+        mock_faculty_links.return_value = [AnchorLink(text="Faculty of Arts and Science Courses", url="http://test1.com")]
+        mock_extract.return_value = [self._snapshot_course()]
+        with patch('scraper.course_data_scraper.get_all_links_from_div', return_value=[]):
+            scraper = CourseDataScraper(cache_dir=str(tmp_path))
+            scraper.refresh_all_courses()
+
+        assert "COMP 249" in CourseDataScraper.all_courses
+        assert "CWT 100" in CourseDataScraper.all_courses
+        with patch('scraper.course_data_scraper.delete_shared') as mock_delete_shared:
+            scraper.invalidate_snapshot()
+        assert not (tmp_path / CourseDataScraper.SNAPSHOT_FILENAME).exists()
+        mock_delete_shared.assert_called_once_with(CourseDataScraper.SHARED_CATALOG_NAME)
+
+    @patch.object(CourseDataScraper, "scrape_all_courses")
+    def test_scrape_if_needed_loads_catalog_published_by_another_worker(self, mock_scrape, tmp_path):
+        published = CourseCatalogSnapshot(version=CourseDataScraper.SNAPSHOT_VERSION, scrapedAt=1700000000.0,
+                                          courses=[self._snapshot_course()])
+        with patch('scraper.course_data_scraper.get_or_compute_shared', return_value=published) as mock_shared:
+            scraper = CourseDataScraper(cache_dir=str(tmp_path))
+            assert scraper.get_all_courses() == ["COMP 249"]
+
+        assert mock_shared.call_args.args[0] == CourseDataScraper.SHARED_CATALOG_NAME
+        mock_scrape.assert_not_called()
+        assert scraper.scraped_at == 1700000000.0
+        # Kept on disk too, for the next start of this worker
+        assert (tmp_path / CourseDataScraper.SNAPSHOT_FILENAME).exists()
+
+    def test_refresh_reuses_only_a_recently_published_catalog(self):
+        with patch('scraper.course_data_scraper.get_or_compute_shared') as mock_shared:
+            CourseDataScraper().refresh_all_courses()
+        accept = mock_shared.call_args.kwargs["accept"]
+        now = time.time()
+        assert accept(MagicMock(scrapedAt=now))
+        assert not accept(MagicMock(scrapedAt=now - CourseDataScraper.SHARED_REFRESH_REUSE_SECONDS - 60))
+
+    @patch('scraper.course_data_scraper.get_concordia_api_instance')
+    def test_course_terms_are_shared_by_dataset_version(self, mock_get_instance):
+        mock_api = mock_get_instance.return_value
+        mock_api.get_dataset_version.return_value = "abc123"
+        with patch('scraper.course_data_scraper.get_or_compute_shared', return_value={"COMP 248": ["Fall"]}) as mock_shared:
+            assert CourseDataScraper()._get_offered_in("COMP 248") == ["Fall"]
+        assert mock_shared.call_args.args[0] == "course_terms:abc123"
+        mock_api.get_terms_for_all_courses.assert_not_called()
+
+    def test_extract_courses_from_subjects_in_parallel_keeps_subject_order(self):
+        thread_names = set()
+
+        def parse(url):
+            thread_names.add(threading.current_thread().name)
+            time.sleep(0.05)
+            return [Course(_id=f"{url} 1", title="T", credits=3.0, description="", offeredIn=[],
+                           prereqCoreqText="", rules=[], notes="", components=[])]
+
+        subjects = [AnchorLink(text=f"S{i}", url=f"SUBJ{i}") for i in range(8)]
+        scraper = CourseDataScraper()
+        with patch.object(CourseDataScraper, "SUBJECT_FETCH_CONCURRENCY", 4), \
+                patch.object(CourseDataScraper, "_parse_course_objects", side_effect=parse):
+            result = scraper._extract_courses_from_subjects(subjects)
+
+        assert [course._id for course in result] == [f"SUBJ{i} 1" for i in range(8)]
+        assert len(thread_names) > 1
+
+    @patch.object(CourseDataScraper, "_parse_course_objects", return_value=[])
+    def test_extract_courses_from_subjects_sequential_when_concurrency_is_one(self, mock_parse):
+        subjects = [AnchorLink(text="COMP", url="http://comp.com"), AnchorLink(text="MATH", url="http://math.com")]
+        with patch.object(CourseDataScraper, "SUBJECT_FETCH_CONCURRENCY", 1), \
+                patch("scraper.course_data_scraper.ThreadPoolExecutor") as mock_executor:
+            CourseDataScraper()._extract_courses_from_subjects(subjects)
+        mock_executor.assert_not_called()
+        assert mock_parse.call_count == 2
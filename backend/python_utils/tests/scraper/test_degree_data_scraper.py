@@ -2,13 +2,17 @@ import pytest
 import sys
 import os
 import json
+import threading
+import time
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from scraper.degree_data_scraper import DegreeDataScraper
 from scraper.gina_cody_degree_scraper import GinaCodyDegreeScraper
 from scraper.course_data_scraper import CourseDataScraper
+from scraper.shared_results import get_shared_result
 import scraper.course_data_scraper as course_data_scraper_module
 from models import ECPDegreeIDs, Course, AnchorLink, ProgramRequirements, serialize
 
@@ -191,4 +195,82 @@ class TestDegreeDataScraper:
         for result in results:
             assert isinstance(result, ProgramRequirements)
             expected = expected_fixture_loader(f"{result.degree.name.replace(' ', '_').replace(':', '')}.json")
-            assert serialize(result) == expected
\ No newline at end of file
+            assert serialize(result) == expected
+
+    def test_scrape_all_degrees_in_parallel_keeps_order_and_shares_results(self, mock_get_degree_links, monkeypatch):
+        """Test that degrees scraped concurrently come back in config order and share intermediate results"""
+        computed = []
+        thread_names = set()
+
+        def make_scraper(name):
+            def scrape_degree():
+                thread_names.add(threading.current_thread().name)
+                get_shared_result("engineering_core_courses", lambda: computed.append(1) or ["ENGR 201"])
+                time.sleep(0.02)
+                return name
+            return MagicMock(degree_name=name, scrape_degree=scrape_degree)
+
+        monkeypatch.setattr(DegreeDataScraper, "DEGREE_SCRAPE_CONCURRENCY", 4)
+        scraper = DegreeDataScraper()
+        names = [f"Degree {i}" for i in range(8)]
+        scraper.degree_scrapers = {name: make_scraper(name) for name in names}
+
+        assert scraper.scrape_all_degrees() == names
+        assert len(computed) == 1
+        assert len(thread_names) > 1
+
+    def test_scrape_all_degrees_reports_progress(self, mock_get_degree_links, monkeypatch):
+        """Test that on_progress is called once per finished degree with the running count"""
+
+        monkeypatch.setattr(DegreeDataScraper, "DEGREE_SCRAPE_CONCURRENCY", 2)
+        scraper = DegreeDataScraper()
+        names = [f"Degree {i}" for i in range(5)]
+        scraper.degree_scrapers = {name: MagicMock(degree_name=name, scrape_degree=MagicMock(return_value=name)) for name in names}
+        progress = []
+
+        scraper.scrape_all_degrees(on_progress=lambda done, total: progress.append((done, total)))
+
+        assert progress == [(i, len(names)) for i in range(1, len(names) + 1)]
+
+    def test_iter_all_degrees_yields_in_order_and_stops_early(self, mock_get_degree_links, monkeypatch):
+        """Test that the degree generator yields in config order and can be closed before the end"""
+
+        monkeypatch.setattr(DegreeDataScraper, "DEGREE_SCRAPE_CONCURRENCY", 2)
+        scraper = DegreeDataScraper()
+        names = [f"Degree {i}" for i in range(6)]
+        scraper.degree_scrapers = {name: MagicMock(degree_name=name, scrape_degree=MagicMock(return_value=name)) for name in names}
+
+        degrees = scraper.iter_all_degrees()
+        assert next(degrees) == names[0]
+        assert next(degrees) == names[1]
+        degrees.close()
+        assert list(scraper.iter_all_degrees()) == names
+
+    def test_scrape_degree_uses_requirements_shared_by_another_worker(self, mock_get_degree_links):
+        """Test that requirements found in the shared cache are returned without scraping"""
+
+        scraper = DegreeDataScraper()
+        degree_scraper = MagicMock(degree_name="BEng in Software Engineering")
+        scraper.degree_scrapers = {"BEng in Software Engineering": degree_scraper}
+        shared = MagicMock(name="ProgramRequirements")
+        with patch('scraper.degree_data_scraper.get_or_compute_shared', return_value=shared) as mock_shared:
+            assert scraper.scrape_degree_by_name("BEng in Software Engineering") is shared
+
+        name = mock_shared.call_args.args[0]
+        assert name == f"degree_requirements:v{DegreeDataScraper.SHARED_REQUIREMENTS_VERSION}:BEng in Software Engineering"
+        degree_scraper.scrape_degree.assert_not_called()
+
+    def test_invalidate_shared_requirements_deletes_every_degree(self, mock_get_degree_links):
+        """Test that invalidating deletes the shared requirements of each degree and changes the requirements version"""
+        scraper = DegreeDataScraper()
+        names = ["BEng in Software Engineering", "BCompSc in Computer Science"]
+        scraper.degree_scrapers = {name: MagicMock(degree_name=name) for name in names}
+        version = scraper.requirements_version()
+        with patch('scraper.degree_data_scraper.delete_shared') as mock_delete, \
+                patch('scraper.degree_data_scraper.bump_shared_generation') as mock_bump:
+            scraper.invalidate_shared_requirements()
+        mock_bump.assert_called_once_with(DegreeDataScraper.SHARED_REQUIREMENTS_GENERATION)
+        assert scraper.requirements_version() != version
+
+        version = DegreeDataScraper.SHARED_REQUIREMENTS_VERSION
+        assert [c.args[0] for c in mock_delete.call_args_list] == [f"degree_requirements:v{version}:{name}" for name in names]
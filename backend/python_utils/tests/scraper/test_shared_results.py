@@ -0,0 +1,63 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import scraper.shared_results as shared_results
+from scraper.shared_results import SharedResults, get_shared_result, shared_results_scope
+from models import CoursePool
+
+
+class TestSharedResults:
+    def test_get_computes_once_and_returns_copies(self):
+        shared = SharedResults()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return CoursePool(_id="pool", name="Pool", creditsRequired=3.0, courses=["COMP 248"])
+
+        first = shared.get("pool", compute)
+        first.courses.append("COMP 249")
+        second = shared.get("pool", compute)
+
+        assert len(calls) == 1
+        assert second.courses == ["COMP 248"]
+        assert shared.stats == {"hits": 1, "misses": 1}
+
+    def test_concurrent_requests_for_same_key_compute_once(self):
+        shared = SharedResults()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return ["ENGR 201"]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(shared.get("key", compute))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [["ENGR 201"]] * 5
+
+    def test_get_shared_result_outside_scope_always_computes(self):
+        calls = []
+        get_shared_result("key", lambda: calls.append(1))
+        get_shared_result("key", lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_nested_scopes_share_store_until_outermost_exit(self):
+        calls = []
+        with shared_results_scope() as outer:
+            get_shared_result("key", lambda: calls.append(1) or "value")
+            with shared_results_scope() as inner:
+                assert inner is outer
+                assert get_shared_result("key", lambda: calls.append(1) or "value") == "value"
+        assert len(calls) == 1
+        assert shared_results._active_shared_results is None
@@ -8,20 +8,40 @@ from io import BytesIO
 import json
 import time
 import threading
+import gzip
+import tarfile
+import zipfile
+import pytest
 
 # Mock main module dependencies before importing it, since main initializes on import.
 _mock_concordia_api = MagicMock()
 _mock_concordia_api.download_datasets.return_value = None
+_mock_course_scraper = MagicMock()
+_mock_course_scraper.scraped_at = None
 
-with patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379"}, clear=False), \
+with patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379", "TRANSCRIPT_PARSER_PROCESSES": "0"}, clear=False), \
     patch('utils.concordia_api_utils.init_concordia_api_instance', return_value=None), \
     patch('utils.concordia_api_utils.get_concordia_api_instance', return_value=_mock_concordia_api), \
     patch('scraper.course_data_scraper.init_course_scraper_instance', return_value=None), \
-    patch('scraper.course_data_scraper.get_course_scraper_instance', return_value=MagicMock()), \
+    patch('scraper.course_data_scraper.get_course_scraper_instance', return_value=_mock_course_scraper), \
     patch('scraper.degree_data_scraper.DegreeDataScraper', return_value=MagicMock()), \
     patch('threading.Timer'):
     from main import app
     import main
+    # Warm-up runs in a background thread; let it finish while the dependencies are still mocked
+    main.warmup_thread.join()
+
+from parser.transcript_parser import InvalidTranscriptError
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # Cached bodies are keyed by catalog version, which stays the same across tests using the shared mocks
+    main.response_cache.invalidate()
+
+@pytest.fixture(autouse=True)
+def clear_transcript_cache():
+    # Tests upload the same fake PDF bytes with different mocked parse results
+    main.transcript_cache.clear()
 
 class TestParseTranscript:
     @patch('main.init_instances')
@@ -93,6 +113,268 @@ class TestParseTranscript:
                 data = response.get_json()
                 assert 'error' in data
 
+    @patch('main.init_instances')
+    def test_parse_transcript_timeout(self, mock_init):
+        """Test transcript parsing that exceeds the pool's task timeout returns 504"""
+        with app.test_client() as client:
+            with patch.object(main.transcript_parser_pool, 'run', side_effect=TimeoutError()):
+                data = {"file": (BytesIO(b"%PDF-1.4 fake pdf content"), "test.pdf")}
+
+                response = client.post("/parse-transcript", data=data, content_type='multipart/form-data')
+
+                assert response.status_code == 504
+                assert 'too long' in response.get_json()['error']
+
+def make_zip(members):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def make_tar_gz(members):
+    buffer = BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, BytesIO(content))
+    return buffer.getvalue()
+
+def fake_parse(pdf_bytes, **options):
+    if b"broken" in pdf_bytes:
+        raise Exception("PyMuPDF parsing error")
+    return {"content": pdf_bytes.decode()}
+
+class TestParseTranscriptUploadLimits:
+    def test_checks_page_limit_and_student_record(self):
+        """Test uploads are parsed with the page limit and the Student Record check"""
+        with app.test_client() as client, patch('main.parse_transcript', return_value={}) as mock_parse:
+            client.post("/parse-transcript", data={"file": (BytesIO(b"%PDF-1.4"), "t.pdf")},
+                        content_type='multipart/form-data')
+
+            mock_parse.assert_called_once_with(bytearray(b"%PDF-1.4"), max_pages=main.TRANSCRIPT_MAX_PAGES,
+                                               require_student_record=True)
+
+    def test_rejected_transcript_returns_422(self):
+        """Test a PDF rejected by the transcript checks returns 422 with the reason"""
+        with app.test_client() as client, \
+                patch('main.parse_transcript', side_effect=InvalidTranscriptError("PDF is not a student record transcript")):
+            response = client.post("/parse-transcript", data={"file": (BytesIO(b"%PDF-1.4"), "t.pdf")},
+                                   content_type='multipart/form-data')
+
+            assert response.status_code == 422
+            assert response.get_json()["error"] == "PDF is not a student record transcript"
+
+    def test_file_over_limit_returns_413(self):
+        """Test a PDF over TRANSCRIPT_MAX_UPLOAD_BYTES returns 413 without being parsed"""
+        with app.test_client() as client, patch('main.TRANSCRIPT_MAX_UPLOAD_BYTES', 100), \
+                patch('main.parse_transcript') as mock_parse:
+            response = client.post("/parse-transcript", data={"file": (BytesIO(b"x" * 101), "t.pdf")},
+                                   content_type='multipart/form-data')
+
+            assert response.status_code == 413
+            mock_parse.assert_not_called()
+
+    def test_body_over_limit_rejected_while_streaming(self):
+        """Test a request body far over the limit is rejected before the form is parsed"""
+        with app.test_client() as client, patch('main.TRANSCRIPT_MAX_UPLOAD_BYTES', 100), \
+                patch('main.parse_transcript') as mock_parse:
+            data = {"file": (BytesIO(b"x" * (main.MULTIPART_OVERHEAD_BYTES + 1000)), "t.pdf")}
+
+            response = client.post("/parse-transcript", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 413
+            assert 'error' in response.get_json()
+            mock_parse.assert_not_called()
+
+    def test_batch_file_over_limit_returns_413(self):
+        """Test a batch containing a PDF over the per-file limit returns 413"""
+        with app.test_client() as client, patch('main.TRANSCRIPT_MAX_UPLOAD_BYTES', 100):
+            data = {"files": [(BytesIO(b"x" * 10), "a.pdf"), (BytesIO(b"x" * 101), "b.pdf")]}
+
+            response = client.post("/parse-transcripts", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 413
+            assert "b.pdf" in response.get_json()["error"]
+
+    def test_batch_rejected_transcript_reports_reason(self):
+        """Test a batch item rejected by the transcript checks carries the reason"""
+        def parse(pdf_bytes, **options):
+            if pdf_bytes == b"invoice":
+                raise InvalidTranscriptError("PDF is not a student record transcript")
+            return fake_parse(pdf_bytes)
+
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=parse):
+            data = {"files": [(BytesIO(b"invoice"), "a.pdf"), (BytesIO(b"first"), "b.pdf")]}
+
+            results = client.post("/parse-transcripts", data=data, content_type='multipart/form-data').get_json()
+
+            assert results[0]["error"] == "PDF is not a student record transcript"
+            assert results[1]["data"] == {"content": "first"}
+
+class TestParseTranscriptBatch:
+    def test_files_parsed_in_submission_order(self):
+        """Test each uploaded PDF gets a result or an error, in submission order"""
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=fake_parse):
+            data = {"files": [(BytesIO(b"first"), "a.pdf"), (BytesIO(b"broken"), "b.pdf"), (BytesIO(b"third"), "c.pdf")]}
+
+            response = client.post("/parse-transcripts", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 200
+            results = response.get_json()
+            assert [item["filename"] for item in results] == ["a.pdf", "b.pdf", "c.pdf"]
+            assert [item["index"] for item in results] == [0, 1, 2]
+            assert results[0]["data"] == {"content": "first"}
+            assert "data" not in results[1] and "error" in results[1]
+            assert results[2]["data"] == {"content": "third"}
+
+    def test_rejects_non_pdf_files(self):
+        """Test a batch containing a non-PDF file returns 400"""
+        with app.test_client() as client:
+            data = {"files": [(BytesIO(b"first"), "a.pdf"), (BytesIO(b"text"), "notes.txt")]}
+
+            response = client.post("/parse-transcripts", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 400
+            assert "notes.txt" in response.get_json()["error"]
+
+    def test_rejects_empty_batch(self):
+        """Test a batch without PDFs returns 400"""
+        with app.test_client() as client:
+            response = client.post("/parse-transcripts", data={}, content_type='multipart/form-data')
+
+            assert response.status_code == 400
+            assert "No PDF files" in response.get_json()["error"]
+
+    def test_rejects_batch_over_file_limit(self):
+        """Test a batch with more files than TRANSCRIPT_BATCH_MAX_FILES returns 400"""
+        with app.test_client() as client, patch('main.TRANSCRIPT_BATCH_MAX_FILES', 1):
+            data = {"files": [(BytesIO(b"first"), "a.pdf"), (BytesIO(b"second"), "b.pdf")]}
+
+            response = client.post("/parse-transcripts", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 400
+
+    def test_zip_archive_upload(self):
+        """Test the PDFs of an uploaded zip archive are parsed, other members are skipped"""
+        archive = make_zip([("2023/a.pdf", b"first"), ("readme.txt", b"skip"), ("2024/b.pdf", b"second")])
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=fake_parse):
+            data = {"archive": (BytesIO(archive), "transcripts.zip")}
+
+            response = client.post("/parse-transcripts", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 200
+            results = response.get_json()
+            assert [item["filename"] for item in results] == ["2023/a.pdf", "2024/b.pdf"]
+            assert [item["data"]["content"] for item in results] == ["first", "second"]
+
+    def test_tar_request_body(self):
+        """Test a gzipped tar sent as the request body is parsed"""
+        archive = make_tar_gz([("a.pdf", b"first"), ("b.pdf", b"second")])
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=fake_parse):
+            response = client.post("/parse-transcripts", data=archive, content_type="application/gzip")
+
+            assert response.status_code == 200
+            assert [item["data"]["content"] for item in response.get_json()] == ["first", "second"]
+
+    def test_invalid_archive(self):
+        """Test a corrupt or unsupported archive returns 400"""
+        with app.test_client() as client:
+            corrupt = client.post("/parse-transcripts", data={"archive": (BytesIO(b"not a zip"), "t.zip")},
+                                  content_type='multipart/form-data')
+            unsupported = client.post("/parse-transcripts", data={"archive": (BytesIO(b"x"), "t.rar")},
+                                      content_type='multipart/form-data')
+
+            assert corrupt.status_code == 400
+            assert unsupported.status_code == 400
+
+    def test_timed_out_file_reports_error(self):
+        """Test a file whose parse times out gets the timeout error while the others succeed"""
+        def run(fn, pdf_bytes):
+            if pdf_bytes == b"slow":
+                raise TimeoutError()
+            return fn(pdf_bytes)
+
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=fake_parse), \
+                patch.object(main.transcript_parser_pool, 'run', side_effect=run):
+            data = {"files": [(BytesIO(b"slow"), "a.pdf"), (BytesIO(b"fast"), "b.pdf")]}
+
+            results = client.post("/parse-transcripts", data=data, content_type='multipart/form-data').get_json()
+
+            assert results[0]["error"] == main.ERROR_TRANSCRIPT_PARSE_TIMEOUT["error"]
+            assert results[1]["data"] == {"content": "fast"}
+
+    def test_stream_returns_ndjson(self):
+        """Test the streaming endpoint sends one NDJSON line per file"""
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=fake_parse):
+            data = {"files": [(BytesIO(b"first"), "a.pdf"), (BytesIO(b"second"), "b.pdf")]}
+
+            response = client.post("/parse-transcripts/stream", data=data, content_type='multipart/form-data')
+
+            assert response.status_code == 200
+            assert response.mimetype == "application/x-ndjson"
+            items = [json.loads(line) for line in response.get_data().splitlines()]
+            assert sorted((item["index"], item["data"]["content"]) for item in items) == [(0, "first"), (1, "second")]
+
+class TestTranscriptCache:
+    def test_identical_upload_is_parsed_once(self):
+        """Test a second upload of the same PDF is served from the transcript cache"""
+        with app.test_client() as client, patch('main.parse_transcript', return_value={"ok": True}) as mock_parse:
+            for _ in range(2):
+                response = client.post("/parse-transcript", data={"file": (BytesIO(b"same pdf"), "t.pdf")},
+                                       content_type='multipart/form-data')
+                assert response.get_json() == {"ok": True}
+
+            mock_parse.assert_called_once()
+
+    def test_cache_control_no_cache_bypasses(self):
+        """Test Cache-Control: no-cache parses the upload again"""
+        with app.test_client() as client, patch('main.parse_transcript', return_value={"ok": True}) as mock_parse:
+            for _ in range(2):
+                client.post("/parse-transcript", data={"file": (BytesIO(b"same pdf"), "t.pdf")},
+                            content_type='multipart/form-data', headers={"Cache-Control": "no-cache"})
+
+            assert mock_parse.call_count == 2
+
+    def test_failed_parse_is_not_cached(self):
+        """Test a parse error is not remembered for the next upload"""
+        with app.test_client() as client, \
+                patch('main.parse_transcript', side_effect=[Exception("boom"), {"ok": True}]):
+            first = client.post("/parse-transcript", data={"file": (BytesIO(b"same pdf"), "t.pdf")},
+                                content_type='multipart/form-data')
+            second = client.post("/parse-transcript", data={"file": (BytesIO(b"same pdf"), "t.pdf")},
+                                 content_type='multipart/form-data')
+
+            assert first.status_code == 500
+            assert second.get_json() == {"ok": True}
+
+    def test_batch_uses_and_fills_cache(self):
+        """Test batches serve cached transcripts and cache the ones they parse"""
+        with app.test_client() as client, patch('main.parse_transcript', side_effect=fake_parse) as mock_parse:
+            client.post("/parse-transcript", data={"file": (BytesIO(b"second"), "b.pdf")},
+                        content_type='multipart/form-data')
+            data = {"files": [(BytesIO(b"first"), "a.pdf"), (BytesIO(b"second"), "b.pdf")]}
+
+            results = client.post("/parse-transcripts", data=data, content_type='multipart/form-data').get_json()
+            client.post("/parse-transcript", data={"file": (BytesIO(b"first"), "a.pdf")},
+                        content_type='multipart/form-data')
+
+            assert [item["data"]["content"] for item in results] == ["first", "second"]
+            assert mock_parse.call_count == 2
+
+    def test_cache_stats(self):
+        """Test /cache-stats reports transcript cache hits and misses"""
+        with app.test_client() as client, patch('main.parse_transcript', return_value={"ok": True}):
+            before = client.get("/cache-stats").get_json()["transcript_cache"]
+            for _ in range(2):
+                client.post("/parse-transcript", data={"file": (BytesIO(b"same pdf"), "t.pdf")},
+                            content_type='multipart/form-data')
+            after = client.get("/cache-stats").get_json()["transcript_cache"]
+
+            assert after["misses"] - before["misses"] == 1
+            assert after["local_hits"] - before["local_hits"] == 1
+
 class TestDegreeEndpoints:
     @patch('main.init_instances')
     def test_get_degree_names_success(self, mock_init):
@@ -553,12 +835,30 @@ class TestRunDownloadDatasets:
         """Test that the next download is still scheduled even if download_datasets raises"""
         mock_instance = MagicMock()
         mock_instance.download_datasets.side_effect = Exception("Network error")
-        with patch('main.concordia_api_instance', mock_instance):
+        with patch('main.concordia_api_instance', mock_instance), \
+                patch.dict('main.module_status', {"concordia_api": "stale"}):
             with patch('main.write_last_run_timestamp') as mock_write:
                 with patch('main.schedule_next_download') as mock_schedule:
                     main.run_download_datasets()
                     mock_write.assert_not_called()
                     mock_schedule.assert_called_once_with(main.DOWNLOAD_INTERVAL_SECONDS)
+                    assert main.module_status["concordia_api"] == "stale"
+
+    def test_retries_soon_when_no_datasets_are_served(self):
+        """Test that a failed download without datasets to serve marks the API failed and retries shortly"""
+        mock_instance = MagicMock()
+        mock_instance.download_datasets.side_effect = [Exception("Network error"), None]
+        with patch('main.concordia_api_instance', mock_instance), \
+                patch.dict('main.module_status', {"concordia_api": "loading"}):
+            with patch('main.write_last_run_timestamp'):
+                with patch('main.schedule_next_download') as mock_schedule:
+                    main.run_download_datasets()
+                    assert main.module_status["concordia_api"] == "failed"
+                    mock_schedule.assert_called_once_with(main.DOWNLOAD_RETRY_SECONDS)
+
+                    main.run_download_datasets()
+                    assert main.module_status["concordia_api"] == "ready"
+                    mock_schedule.assert_called_with(main.DOWNLOAD_INTERVAL_SECONDS)
 
     def test_logs_error_on_failure(self):
         """Test that an error is logged when download_datasets raises"""
@@ -675,4 +975,365 @@ class TestStartDownloadScheduler:
                 with patch.object(main.logger, 'info') as mock_log:
                     main.start_download_scheduler()
                     messages = [c[0][0] for c in mock_log.call_args_list]
-                    assert any('5000' in m or 'recent' in m.lower() for m in messages)
\ No newline at end of file
+                    assert any('5000' in m or 'recent' in m.lower() for m in messages)
+
+class TestWarmUpAndReadiness:
+    ALL_READY = {"concordia_api": "ready", "course_scraper": "ready", "degree_scraper": "ready"}
+
+    def test_ready_returns_200_when_all_modules_serving(self):
+        with app.test_client() as client:
+            with patch.dict('main.module_status', {**self.ALL_READY, "concordia_api": "stale"}):
+                response = client.get("/ready")
+                assert response.status_code == 200
+                assert response.get_json() == {
+                    "ready": True,
+                    "modules": {"concordia_api": "stale", "course_scraper": "ready", "degree_scraper": "ready"},
+                }
+
+    def test_ready_returns_503_with_retry_after_while_warming_up(self):
+        with app.test_client() as client:
+            with patch.dict('main.module_status', {**self.ALL_READY, "degree_scraper": "loading"}):
+                response = client.get("/ready")
+                assert response.status_code == 503
+                assert response.headers["Retry-After"] == str(main.RETRY_AFTER_SECONDS)
+                assert response.get_json()["modules"]["degree_scraper"] == "loading"
+
+    def test_data_endpoint_returns_503_until_module_is_serving(self):
+        with app.test_client() as client:
+            with patch('main.concordia_api_instance') as mock_instance:
+                mock_instance.get_course_schedule.return_value = []
+                with patch.dict('main.module_status', {"concordia_api": "loading"}):
+                    response = client.get("/get-course-schedule?subject=COMP&catalog=248")
+                    assert response.status_code == 503
+                    assert response.headers["Retry-After"] == str(main.RETRY_AFTER_SECONDS)
+                    mock_instance.get_course_schedule.assert_not_called()
+                with patch.dict('main.module_status', {"concordia_api": "stale"}):
+                    response = client.get("/get-course-schedule?subject=COMP&catalog=248")
+                    assert response.status_code == 200
+
+    def test_initialize_runs_init_instances_in_a_daemon_thread(self):
+        with patch('main.initialized', False), patch('main.warmup_thread', None), \
+                patch('threading.Thread') as mock_thread:
+            main.initialize()
+            mock_thread.assert_called_once_with(target=main.init_instances, daemon=True)
+            mock_thread.return_value.start.assert_called_once()
+
+    def test_init_concordia_api_serves_cached_datasets_before_downloading(self):
+        mock_api = MagicMock()
+        mock_api.load_cached_datasets.return_value = True
+        with patch('main.concordia_api_instance', None), \
+                patch('main.init_concordia_api_instance'), \
+                patch('main.get_concordia_api_instance', return_value=mock_api), \
+                patch('main.seconds_until_next_run', return_value=0), \
+                patch('main.start_download_scheduler') as mock_scheduler, \
+                patch.dict('main.module_status', {"concordia_api": "init"}):
+            main.init_concordia_api()
+            assert main.module_status["concordia_api"] == "stale"
+        mock_api.download_datasets.assert_not_called()
+        mock_scheduler.assert_called_once()
+
+    def test_init_concordia_api_downloads_in_background_when_no_cache(self):
+        mock_api = MagicMock()
+        mock_api.load_cached_datasets.return_value = False
+        with patch('main.concordia_api_instance', None), \
+                patch('main.init_concordia_api_instance'), \
+                patch('main.get_concordia_api_instance', return_value=mock_api), \
+                patch('threading.Thread') as mock_thread, \
+                patch.dict('main.module_status', {"concordia_api": "init"}):
+            main.init_concordia_api()
+            assert main.module_status["concordia_api"] == "loading"
+        mock_thread.assert_called_once_with(target=main.run_download_datasets, daemon=True)
+        mock_thread.return_value.start.assert_called_once()
+        mock_api.download_datasets.assert_not_called()
+
+    def test_course_scraper_is_ready_only_once_datasets_are_loaded(self):
+        mock_scraper = MagicMock()
+        mock_scraper.load_snapshot.return_value = False
+        with patch('main.course_scraper_instance', None), \
+                patch('main.init_course_scraper_instance'), \
+                patch('main.get_course_scraper_instance', return_value=mock_scraper), \
+                patch('main.start_catalog_refresh_scheduler') as mock_refresh_scheduler, \
+                patch('main.concordia_api_instance', MagicMock()), \
+                patch('main.write_last_run_timestamp'), \
+                patch('main.schedule_next_download'), \
+                patch.dict('main.module_status', {"concordia_api": "loading", "course_scraper": "init"}):
+            main.init_course_scraper()
+            assert main.module_status["course_scraper"] == "loading"
+            mock_refresh_scheduler.assert_not_called()
+
+            main.run_download_datasets()
+            assert main.module_status["concordia_api"] == "ready"
+            assert main.module_status["course_scraper"] == "ready"
+            mock_refresh_scheduler.assert_called_once()
+
+    def test_course_scraper_is_ready_at_once_with_cached_datasets(self):
+        with patch('main.course_scraper_instance', None), \
+                patch('main.init_course_scraper_instance'), \
+                patch('main.get_course_scraper_instance', return_value=MagicMock()), \
+                patch('main.start_catalog_refresh_scheduler'), \
+                patch.dict('main.module_status', {"concordia_api": "stale", "course_scraper": "init"}):
+            main.init_course_scraper()
+            assert main.module_status["course_scraper"] == "ready"
+
+    def test_init_instances_initializes_each_module_independently(self):
+        with patch('main.init_concordia_api', side_effect=Exception("boom")), \
+                patch('main.init_course_scraper') as mock_course_init, \
+                patch('main.init_degree_scraper') as mock_degree_init, \
+                patch.dict('main.module_status', {"concordia_api": "loading", "course_scraper": "ready", "degree_scraper": "ready"}):
+            main.init_instances()
+            assert main.module_status == {"concordia_api": "failed", "course_scraper": "ready", "degree_scraper": "ready"}
+        mock_course_init.assert_called_once()
+        mock_degree_init.assert_called_once()
+
+class TestCourseCatalogRefresh:
+    def test_invalidate_course_catalog_starts_background_refresh(self):
+        with app.test_client() as client:
+            with patch('main.course_scraper_instance') as mock_instance, \
+                    patch('main.degree_data_scraper_instance') as mock_degree_instance, \
+                    patch.dict('main.module_status', {"course_scraper": "ready"}), \
+                    patch('threading.Thread') as mock_thread:
+                response = client.post("/invalidate-course-catalog")
+                assert response.status_code == 202
+                mock_instance.invalidate_snapshot.assert_called_once()
+                mock_degree_instance.invalidate_shared_requirements.assert_called_once()
+                mock_thread.assert_called_once_with(target=mock_instance.refresh_all_courses, daemon=True)
+                mock_thread.return_value.start.assert_called_once()
+
+    def test_invalidate_course_catalog_not_initialized(self):
+        with app.test_client() as client:
+            with patch('main.course_scraper_instance', None):
+                response = client.post("/invalidate-course-catalog")
+                assert response.status_code == 503
+
+    def test_refresh_runs_immediately_without_snapshot(self):
+        with patch('main.course_scraper_instance', MagicMock(scraped_at=None)), \
+                patch('main.schedule_catalog_refresh') as mock_schedule:
+            main.start_catalog_refresh_scheduler()
+            mock_schedule.assert_called_once_with(0)
+
+    def test_refresh_scheduled_for_remaining_snapshot_lifetime(self):
+        now = time.time()
+        with patch('main.course_scraper_instance', MagicMock(scraped_at=now - 3600)), \
+                patch('time.time', return_value=now), \
+                patch('main.schedule_catalog_refresh') as mock_schedule:
+            main.start_catalog_refresh_scheduler()
+            delay = mock_schedule.call_args.args[0]
+            assert abs(delay - (main.CATALOG_REFRESH_INTERVAL_SECONDS - 3600)) < 1
+
+    def test_run_catalog_refresh_reschedules_even_on_failure(self):
+        mock_instance = MagicMock()
+        mock_instance.refresh_all_courses.side_effect = Exception("Network error")
+        with patch('main.course_scraper_instance', mock_instance), \
+                patch.dict('main.module_status', {"concordia_api": "ready"}), \
+                patch('main.schedule_catalog_refresh') as mock_schedule:
+            main.run_catalog_refresh()
+            mock_schedule.assert_called_once_with(main.CATALOG_REFRESH_INTERVAL_SECONDS)
+
+    def test_run_catalog_refresh_waits_for_datasets(self):
+        mock_instance = MagicMock()
+        with patch('main.course_scraper_instance', mock_instance), \
+                patch.dict('main.module_status', {"concordia_api": "failed"}), \
+                patch('main.schedule_catalog_refresh') as mock_schedule:
+            main.run_catalog_refresh()
+            mock_instance.refresh_all_courses.assert_not_called()
+            mock_schedule.assert_called_once_with(main.DOWNLOAD_RETRY_SECONDS)
+
+class TestJobEndpoints:
+    @staticmethod
+    def wait_for_job(client, job_id, timeout=5):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = client.get(f"/jobs/{job_id}").get_json()
+            if job["status"] not in ("queued", "running"):
+                return job
+            time.sleep(0.01)
+        raise AssertionError(f"Job {job_id} did not finish in {timeout}s")
+
+    def test_scrape_all_degrees_job_reports_progress_and_result(self, tmp_path):
+        def scrape_all_degrees(on_progress=None):
+            on_progress(1, 1)
+            return [{"degree": {"name": "BEng"}}]
+
+        with app.test_client() as client:
+            with patch('main.job_store', main.JobStore(str(tmp_path))), \
+                    patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.scrape_all_degrees.side_effect = scrape_all_degrees
+                response = client.post("/jobs/scrape-all-degrees")
+                assert response.status_code == 202
+                body = response.get_json()
+                assert response.headers["Location"] == body["statusUrl"] == f"/jobs/{body['id']}"
+
+                job = self.wait_for_job(client, body["id"])
+                assert job["status"] == "succeeded"
+                assert job["progress"]["degreesDone"] == job["progress"]["degreesTotal"] == 1
+
+                result = client.get(body["resultUrl"])
+                assert result.status_code == 200
+                assert result.mimetype == "application/json"
+                assert json.loads(result.data) == [{"degree": {"name": "BEng"}}]
+
+    def test_get_all_courses_job(self, tmp_path):
+        with app.test_client() as client:
+            with patch('main.job_store', main.JobStore(str(tmp_path))), \
+                    patch('main.course_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"course_scraper": "ready"}):
+                mock_instance.get_all_courses.return_value = [{"_id": "COMP 248"}]
+                body = client.post("/jobs/get-all-courses").get_json()
+
+                job = self.wait_for_job(client, body["id"])
+                assert job["progress"]["courses"] == 1
+                assert json.loads(client.get(body["resultUrl"]).data) == [{"_id": "COMP 248"}]
+                mock_instance.get_all_courses.assert_called_once_with(return_full_object=True)
+
+    def test_result_of_failed_job_returns_409(self, tmp_path):
+        with app.test_client() as client:
+            with patch('main.job_store', main.JobStore(str(tmp_path))), \
+                    patch('main.course_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"course_scraper": "ready"}):
+                mock_instance.get_all_courses.side_effect = Exception("Network error")
+                body = client.post("/jobs/get-all-courses").get_json()
+
+                job = self.wait_for_job(client, body["id"])
+                assert job["status"] == "failed"
+                response = client.get(body["resultUrl"])
+                assert response.status_code == 409
+                assert response.get_json()["status"] == "failed"
+
+    def test_job_start_returns_503_until_module_is_serving(self, tmp_path):
+        with app.test_client() as client:
+            with patch('main.job_store', main.JobStore(str(tmp_path))), \
+                    patch.dict('main.module_status', {"degree_scraper": "loading"}):
+                response = client.post("/jobs/scrape-all-degrees")
+                assert response.status_code == 503
+                assert response.headers["Retry-After"] == str(main.RETRY_AFTER_SECONDS)
+
+    def test_unknown_job_returns_404(self, tmp_path):
+        with app.test_client() as client:
+            with patch('main.job_store', main.JobStore(str(tmp_path))):
+                assert client.get(f"/jobs/{'0' * 32}").status_code == 404
+                assert client.get(f"/jobs/{'0' * 32}/result").status_code == 404
+
+class TestStreamingEndpoints:
+    def test_stream_all_degrees_yields_one_degree_per_line(self):
+        degrees = [{"degree": {"_id": "BEng"}}, {"degree": {"_id": "BCompSc"}}]
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.iter_all_degrees.return_value = iter(degrees)
+                response = client.get("/scrape-all-degrees/stream")
+                assert response.status_code == 200
+                assert response.mimetype == "application/x-ndjson"
+                lines = response.data.decode().splitlines()
+                assert [json.loads(line) for line in lines] == degrees
+
+    def test_stream_all_degrees_ends_with_error_line_on_failure(self):
+        def degrees():
+            yield {"degree": {"_id": "BEng"}}
+            raise Exception("Network error")
+
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.iter_all_degrees.return_value = degrees()
+                lines = client.get("/scrape-all-degrees/stream").data.decode().splitlines()
+                assert json.loads(lines[0]) == {"degree": {"_id": "BEng"}}
+                assert json.loads(lines[-1]) == main.ERROR_SCRAPING_DEGREE_DATA
+
+    def test_stream_all_degrees_not_initialized(self):
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance', None):
+                response = client.get("/scrape-all-degrees/stream")
+                assert response.status_code == 503
+
+    def test_stream_all_courses_matches_get_all_courses(self):
+        courses = [{"_id": "COMP 248", "title": "Object-Oriented Programming I"}, {"_id": "COMP 249", "title": "Object-Oriented Programming II"}]
+        with app.test_client() as client:
+            with patch('main.course_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"course_scraper": "ready"}):
+                mock_instance.get_all_courses.return_value = courses
+                streamed = client.get("/get-all-courses/stream")
+                assert streamed.mimetype == "application/x-ndjson"
+                lines = streamed.data.decode().splitlines()
+                assert len(lines) == len(courses)
+                assert [json.loads(line) for line in lines] == client.get("/get-all-courses").get_json()
+
+    def test_stream_all_courses_error(self):
+        with app.test_client() as client:
+            with patch('main.course_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"course_scraper": "ready"}):
+                mock_instance.get_all_courses.side_effect = Exception("Network error")
+                response = client.get("/get-all-courses/stream")
+                assert response.status_code == 500
+                assert response.get_json() == main.ERROR_RETRIEVING_COURSE_DATA
+
+class TestResponseCache:
+    def test_get_all_courses_is_encoded_once_per_catalog_version(self):
+        with app.test_client() as client:
+            with patch('main.course_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"course_scraper": "ready"}):
+                mock_instance.scraped_at = 1.0
+                mock_instance.get_all_courses.return_value = [{"_id": "COMP 248"}]
+                first = client.get("/get-all-courses")
+                second = client.get("/get-all-courses")
+                assert first.data == second.data
+                assert mock_instance.get_all_courses.call_count == 1
+
+                # A finished scrape changes the catalog version
+                mock_instance.scraped_at = 2.0
+                mock_instance.get_all_courses.return_value = [{"_id": "COMP 249"}]
+                assert client.get("/get-all-courses").get_json() == [{"_id": "COMP 249"}]
+                assert mock_instance.get_all_courses.call_count == 2
+
+    def test_etag_revalidation_returns_304(self):
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.get_degree_names.return_value = ["BEng in Software Engineering"]
+                response = client.get("/degree-names")
+                etag = response.headers["ETag"]
+                assert response.status_code == 200
+
+                revalidated = client.get("/degree-names", headers={"If-None-Match": etag})
+                assert revalidated.status_code == 304
+                assert revalidated.data == b""
+                assert client.get("/degree-names", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    def test_gzip_when_accepted(self):
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.scrape_degree_by_name.return_value = {"degree": {"_id": "SOEN"}, "coursePools": []}
+                plain = client.get("/scrape-degree?name=SOEN")
+                compressed = client.get("/scrape-degree?name=SOEN", headers={"Accept-Encoding": "gzip, deflate"})
+                assert compressed.headers["Content-Encoding"] == "gzip"
+                assert "Accept-Encoding" in compressed.headers["Vary"]
+                assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+                assert compressed.headers["ETag"] != plain.headers["ETag"]
+                mock_instance.scrape_degree_by_name.assert_called_once_with("SOEN")
+
+    def test_scrape_degree_is_cached_per_requirements_version(self):
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch('main.course_scraper_instance') as mock_course_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.requirements_version.return_value = (0, 0, 1)
+                mock_instance.scrape_degree_by_name.side_effect = lambda name: {"degree": {"_id": name}}
+                client.get("/scrape-degree?name=SOEN")
+                # A course catalog refresh leaves the degree bodies alone
+                mock_course_instance.scraped_at = 2.0
+                client.get("/scrape-degree?name=SOEN")
+                assert mock_instance.scrape_degree_by_name.call_count == 1
+
+                mock_instance.requirements_version.return_value = (1, 0, 1)
+                client.get("/scrape-degree?name=SOEN")
+                assert mock_instance.scrape_degree_by_name.call_count == 2
+
+    def test_scrape_degree_is_cached_per_name(self):
+        with app.test_client() as client:
+            with patch('main.degree_data_scraper_instance') as mock_instance, \
+                    patch.dict('main.module_status', {"degree_scraper": "ready"}):
+                mock_instance.scrape_degree_by_name.side_effect = lambda name: {"degree": {"_id": name}}
+                assert client.get("/scrape-degree?name=SOEN").get_json() == {"degree": {"_id": "SOEN"}}
+                assert client.get("/scrape-degree?name=COMP").get_json() == {"degree": {"_id": "COMP"}}
+                assert mock_instance.scrape_degree_by_name.call_count == 2
@@ -0,0 +1,94 @@
+import sys
+import os
+import io
+import tarfile
+import zipfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+from utils.archive_utils import archive_format, read_pdf_members
+from utils.upload_utils import UploadTooLargeError
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def make_tar(members, mode="w"):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+class NonSeekableStream(io.RawIOBase):
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._buffer.readinto(b)
+
+
+class TestArchiveFormat:
+    def test_from_extension(self):
+        assert archive_format("Transcripts.ZIP") == "zip"
+        assert archive_format("transcripts.tar.gz") == "tar"
+        assert archive_format("transcripts.tgz") == "tar"
+        assert archive_format("transcript.pdf") is None
+
+    def test_from_mimetype(self):
+        assert archive_format(mimetype="application/zip") == "zip"
+        assert archive_format(mimetype="application/x-tar") == "tar"
+        assert archive_format(mimetype="application/pdf") is None
+
+
+class TestReadPdfMembers:
+    def test_zip_keeps_pdfs_in_order(self):
+        stream = make_zip([("b.pdf", b"B"), ("notes.txt", b"x"), ("dir/a.PDF", b"A"), ("__MACOSX/dir/._a.PDF", b"")])
+        assert read_pdf_members(stream, "zip", 10) == [("b.pdf", b"B"), ("dir/a.PDF", b"A")]
+
+    def test_zip_from_non_seekable_stream(self):
+        data = make_zip([("a.pdf", b"A")]).getvalue()
+        assert read_pdf_members(NonSeekableStream(data), "zip", 10) == [("a.pdf", b"A")]
+
+    def test_compressed_tar_from_non_seekable_stream(self):
+        data = make_tar([("a.pdf", b"A"), ("b.txt", b"x"), ("c.pdf", b"C")], mode="w:gz").getvalue()
+        assert read_pdf_members(NonSeekableStream(data), "tar", 10) == [("a.pdf", b"A"), ("c.pdf", b"C")]
+
+    def test_too_many_pdfs(self):
+        stream = make_tar([("a.pdf", b"A"), ("b.pdf", b"B")])
+        with pytest.raises(ValueError, match="more than 1"):
+            read_pdf_members(stream, "tar", 1)
+
+    def test_corrupt_archive(self):
+        with pytest.raises(ValueError, match="Invalid zip"):
+            read_pdf_members(io.BytesIO(b"not a zip"), "zip", 10)
+        with pytest.raises(ValueError, match="Invalid tar"):
+            read_pdf_members(io.BytesIO(b"not a tar"), "tar", 10)
+
+    def test_pdf_over_file_limit(self):
+        stream = make_zip([("a.pdf", b"A" * 10), ("big.pdf", b"B" * 11)])
+        with pytest.raises(UploadTooLargeError, match="big.pdf"):
+            read_pdf_members(stream, "zip", 10, max_file_bytes=10)
+
+    def test_pdfs_over_total_limit(self):
+        stream = make_tar([("a.pdf", b"A" * 6), ("b.pdf", b"B" * 6)], mode="w:gz")
+        with pytest.raises(UploadTooLargeError, match="Archive contents"):
+            read_pdf_members(stream, "tar", 10, max_file_bytes=10, max_total_bytes=10)
+
+    def test_skipped_members_do_not_count_against_limits(self):
+        stream = make_zip([("notes.txt", b"x" * 100), ("a.pdf", b"A")])
+        assert read_pdf_members(stream, "zip", 10, max_file_bytes=10, max_total_bytes=10) == [("a.pdf", b"A")]
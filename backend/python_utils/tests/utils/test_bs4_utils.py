@@ -5,8 +5,12 @@ import os
 # Add the parent directory to the path to import the modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
+import threading
+import time
+import utils.bs4_utils as bs4_utils
 from utils.bs4_utils import (
     get_soup,
+    page_cache_scope,
     _get_all_links_from_element,
     get_all_links_from_div,
     extract_coursepool_and_required_credits,
@@ -336,4 +340,74 @@ def test_extract_coursepool_courses_duplicates_removed(mock_get_soup):
     assert len(course_pool.courses) == 2
     # Check courses are sorted (COMP comes before MATH)
     assert course_pool.courses[0] == "COMP 248"
-    assert course_pool.courses[1] == "MATH 204"
\ No newline at end of file
+    assert course_pool.courses[1] == "MATH 204"
+
+def _html_response(body=b'<html><body><h1>Test</h1></body></html>'):
+    mock_response = MagicMock()
+    mock_response.content = body
+    mock_response.headers = {'content-type': 'text/html; charset=utf-8'}
+    mock_response.encoding = 'utf-8'
+    return mock_response
+
+@patch('utils.bs4_utils.web_get')
+def test_page_cache_scope_fetches_and_parses_each_page_once(mock_web_get):
+    """Test that the same URL, with or without fragment, is fetched and parsed once inside a scope."""
+    mock_web_get.return_value = _html_response()
+
+    with page_cache_scope() as cache:
+        first = get_soup("http://example.com/page.html#1234")
+        second = get_soup("http://example.com/page.html")
+        get_soup("http://example.com/other.html")
+
+    assert first is second
+    assert mock_web_get.call_count == 2
+    assert cache.stats == {"fetch_hits": 0, "fetch_misses": 2, "parse_hits": 1, "parse_misses": 2}
+    assert bs4_utils._active_page_cache is None
+
+@patch('utils.bs4_utils.web_get')
+def test_get_soup_without_scope_or_with_use_cache_false_always_fetches(mock_web_get):
+    """Test that caching only applies inside a scope and can be bypassed."""
+    mock_web_get.return_value = _html_response()
+
+    get_soup("http://example.com")
+    get_soup("http://example.com")
+    with page_cache_scope() as cache:
+        get_soup("http://example.com", use_cache=False)
+
+    assert mock_web_get.call_count == 3
+    assert cache.stats["parse_misses"] == 0
+
+@patch('utils.bs4_utils.web_get')
+def test_nested_page_cache_scopes_share_one_cache(mock_web_get):
+    """Test that nested scopes reuse the outer cache and only the outermost exit drops it."""
+    mock_web_get.return_value = _html_response()
+
+    with page_cache_scope() as outer:
+        get_soup("http://example.com")
+        with page_cache_scope() as inner:
+            assert inner is outer
+            get_soup("http://example.com")
+        assert bs4_utils._active_page_cache is outer
+        get_soup("http://example.com")
+
+    assert mock_web_get.call_count == 1
+    assert outer.stats["parse_hits"] == 2
+
+@patch('utils.bs4_utils.web_get')
+def test_page_cache_concurrent_requests_for_same_page_fetch_once(mock_web_get):
+    """Test that threads asking for the same page wait for a single fetch."""
+    def slow_get(url):
+        time.sleep(0.05)
+        return _html_response()
+    mock_web_get.side_effect = slow_get
+
+    with page_cache_scope():
+        soups = []
+        threads = [threading.Thread(target=lambda: soups.append(get_soup("http://example.com"))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert mock_web_get.call_count == 1
+    assert all(soup is soups[0] for soup in soups)
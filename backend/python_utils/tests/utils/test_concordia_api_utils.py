@@ -1,6 +1,8 @@
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import pandas as pd
-from utils.concordia_api_utils import ConcordiaAPIUtils
+import pytest
+import json
+from utils.concordia_api_utils import ConcordiaAPIUtils, REDIS_STAGING_PREFIX, COURSE_DIGESTS_KEY
 import sys, os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -154,4 +156,390 @@ class TestConcordiaAPIUtils:
             # Empty response
             with patch.object(self.api, '_get_from_csv', return_value=[]):
                 empty_result = self.api.get_course_schedule("SOEN", "000")
-                assert empty_result == []
\ No newline at end of file
+                assert empty_result == []
+
+    def test__get_from_csv_uses_prebuilt_index(self):
+        df = pd.DataFrame({
+            "Subject": ["COMP", "SOEN", "COMP"],
+            "Catalog Nbr": ["248", "228", "248"],
+            "Term Code": ["202430", "202410", "202420"]
+        })
+        self.api.data_cache["course_schedule"] = df
+        index = self.api._build_index("course_schedule", df)
+        assert list(index[("COMP", "248")]) == [0, 2]
+
+        with patch.object(self.api, '_build_index') as mock_build:
+            result = self.api._get_from_csv("course_schedule", subject="COMP", catalog="248")
+            mock_build.assert_not_called()
+        assert [r["Term Code"] for r in result] == ["202430", "202420"]
+
+    def test__get_from_csv_rebuilds_index_when_dataframe_replaced(self):
+        old_df = pd.DataFrame({"Subject": ["COMP"], "Catalog Nbr": ["248"], "Term Code": ["202410"]})
+        self.api.data_cache["course_schedule"] = old_df
+        self.api._build_index("course_schedule", old_df)
+
+        self.api.data_cache["course_schedule"] = pd.DataFrame({"Subject": ["SOEN"], "Catalog Nbr": ["228"], "Term Code": ["202420"]})
+        assert self.api._get_from_csv("course_schedule", subject="COMP", catalog="248") == []
+        result = self.api._get_from_csv("course_schedule", subject="SOEN", catalog="228")
+        assert result == [{"Subject": "SOEN", "Catalog Nbr": "228", "Term Code": "202420"}]
+
+    def test__get_from_csv_missing_dataset_returns_empty(self):
+        self.api.data_cache.pop("course_section", None)
+        assert self.api._get_from_csv("course_section", subject="COMP", catalog="248") == []
+
+    def test_get_terms_for_all_courses_matches_get_term(self):
+        self.api.data_cache["course_section"] = pd.DataFrame({
+            "Subject": ["COMP", "COMP", "COMP", "SOEN"],
+            "Catalog Nbr": ["248", "248", "248", "228"],
+            "Term Code": ["2241", "2244", "2242", "2243"]
+        })
+        self.api.data_cache["course_schedule"] = pd.DataFrame({
+            "Subject": ["COMP", "ENGR", "ENGR"],
+            "Catalog Nbr": ["248", "391", "391"],
+            "Term Code": ["2245", "2244", "2244"]
+        })
+        result = self.api.get_terms_for_all_courses()
+
+        assert result == {
+            "COMP 248": ["Fall", "Winter", "Summer"],
+            "SOEN 228": ["Fall/Winter"],
+            "ENGR 391": ["Winter"],
+        }
+        for course_code, terms in result.items():
+            assert self.api.get_term(course_code) == terms
+
+    def test_get_terms_for_all_courses_skips_invalid_term_codes(self):
+        self.api.data_cache["course_section"] = pd.DataFrame({
+            "Subject": ["COMP", "COMP", "MATH"],
+            "Catalog Nbr": ["248", "248", "205"],
+            "Term Code": ["2242", "", "2249"]
+        })
+        self.api.data_cache["course_schedule"] = pd.DataFrame({"Subject": ["MATH"], "Catalog Nbr": ["205"], "Term Code": ["2242"]})
+        result = self.api.get_terms_for_all_courses()
+        # MATH 205 has rows in course_section, so course_schedule is not used for it
+        assert result == {"COMP 248": ["Fall"]}
+
+    def test_get_terms_for_all_courses_without_datasets(self):
+        self.api.data_cache.pop("course_section", None)
+        self.api.data_cache.pop("course_schedule", None)
+        assert self.api.get_terms_for_all_courses() == {}
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_write_to_redis_pipelines_in_chunks(self, mock_get_redis):
+        pipe = MagicMock()
+        mock_get_redis.return_value.pipeline.return_value = pipe
+        items = [(f"COMP{i}", f"[{i}]") for i in range(5)]
+
+        written = self.api.write_to_redis(items, chunk_size=2, atomic_swap=False)
+
+        assert written == 5
+        mock_get_redis.return_value.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.set.call_count == 5
+        pipe.set.assert_any_call("COMP0", "[0]")
+        assert pipe.execute.call_count == 3
+        mock_get_redis.return_value.set.assert_not_called()
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_write_to_redis_atomic_swap_renames_staged_keys(self, mock_get_redis):
+        write_pipe, swap_pipe = MagicMock(), MagicMock()
+        client = mock_get_redis.return_value
+        client.pipeline.side_effect = lambda transaction: swap_pipe if transaction else write_pipe
+
+        self.api.write_to_redis([("COMP248", "[]"), ("SOEN228", "[]")], chunk_size=10, atomic_swap=True)
+
+        staged_keys = [c.args[0] for c in write_pipe.set.call_args_list]
+        assert all(k.startswith(REDIS_STAGING_PREFIX) for k in staged_keys)
+        assert [c.args for c in swap_pipe.rename.call_args_list] == [
+            (staged_keys[0], "COMP248"),
+            (staged_keys[1], "SOEN228"),
+        ]
+        swap_pipe.execute.assert_called_once()
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_write_to_redis_queues_finish_commands_in_the_swap_transaction(self, mock_get_redis):
+        write_pipe, swap_pipe = MagicMock(), MagicMock()
+        client = mock_get_redis.return_value
+        client.pipeline.side_effect = lambda transaction: swap_pipe if transaction else write_pipe
+
+        self.api.write_to_redis([("COMP248", "[]")], atomic_swap=True, finish=lambda pipe: pipe.delete("ENGR201"))
+        swap_pipe.rename.assert_called_once()
+        swap_pipe.delete.assert_called_once_with("ENGR201")
+        swap_pipe.execute.assert_called_once()
+
+        # Removals alone still run, in a transaction of their own
+        swap_pipe.reset_mock()
+        self.api.write_to_redis([], atomic_swap=True, finish=lambda pipe: pipe.delete("SOEN228"))
+        swap_pipe.rename.assert_not_called()
+        swap_pipe.delete.assert_called_once_with("SOEN228")
+        swap_pipe.execute.assert_called_once()
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_write_to_redis_atomic_swap_cleans_up_on_failure(self, mock_get_redis):
+        write_pipe, swap_pipe = MagicMock(), MagicMock()
+        client = mock_get_redis.return_value
+        client.pipeline.side_effect = lambda transaction: swap_pipe if transaction else write_pipe
+        swap_pipe.execute.side_effect = Exception("Redis down")
+
+        with pytest.raises(Exception):
+            self.api.write_to_redis([("COMP248", "[]")], atomic_swap=True)
+
+        staged_key = write_pipe.set.call_args.args[0]
+        client.delete.assert_called_once_with(staged_key)
+
+    def test_iter_course_schedule_json_matches_row_formatter(self):
+        df = pd.DataFrame({
+            "Course ID": ["123", "10009", None],
+            "Subject": ["COMP", "COMP", "SOEN"],
+            "Catalog Nbr": ["248", "248", "999"],
+            "Enrollment Capacity": [30, 40, 50],
+            "Waitlist Capacity": [1.0, float('nan'), 2.0],
+            "Course Title": ["Éthique/Ethics", "Line\nbreak", None],
+        })
+        df["course_code"] = df["Subject"] + df["Catalog Nbr"]
+
+        result = {key: json.loads(value) for key, value in self.api.iter_course_schedule_json(df)}
+        expected = {
+            key: self.api.format_course_schedule_response(group.drop(columns=["course_code"]).fillna("").to_dict(orient="records"))
+            for key, group in df.groupby("course_code")
+        }
+
+        assert list(result) == ["COMP248", "SOEN999"]
+        assert result == expected
+        assert result["COMP248"][1]["courseID"] == "010009"
+        assert result["SOEN999"][0]["courseID"] == "000000"
+        assert result["SOEN999"][0]["roomCode"] == ""
+
+    def test_format_course_schedule_frame_renames_and_pads_columns(self):
+        df = pd.DataFrame({"Course ID": ["42"], "Room Code": ["H937"], "Mon": ["Y"], "Unused": ["x"]})
+        result = self.api.format_course_schedule_frame(df)
+        assert list(result.columns)[:3] == ["courseID", "termCode", "session"]
+        assert "Unused" not in result.columns
+        row = result.iloc[0]
+        assert row["courseID"] == "000042"
+        assert row["roomCode"] == "H937"
+        assert row["mondays"] == "Y"
+        assert row["termCode"] == ""
+
+    def test_iter_course_schedule_json_batches_do_not_change_output(self):
+        df = pd.DataFrame({
+            "Course ID": [str(i) for i in range(7)],
+            "Subject": ["COMP", "SOEN", "COMP", "ENGR", "SOEN", "COMP", "ENGR"],
+            "Catalog Nbr": ["248"] * 7,
+        })
+        df["course_code"] = df["Subject"] + df["Catalog Nbr"]
+        single_batch = list(self.api.iter_course_schedule_json(df, batch_rows=100))
+        small_batches = list(self.api.iter_course_schedule_json(df, batch_rows=1))
+        assert single_batch == small_batches
+        assert [json.loads(v)[0]["courseID"] for _, v in small_batches] == ["000000", "000003", "000001"]
+
+    def _fake_download(self, sha256, modified=True):
+        def download(url, file_path, validators=None):
+            validators.update({"modified": modified, "etag": '"v1"', "last_modified": None, "sha256": sha256})
+            return True
+        return download
+
+    @patch("utils.concordia_api_utils.ConcordiaAPIUtils.write_to_redis")
+    @patch("utils.concordia_api_utils.get_redis_client")
+    @patch("utils.concordia_api_utils.download_file")
+    @patch("utils.concordia_api_utils.pd.read_csv")
+    def test_download_datasets_records_validators_and_ingests(
+        self, mock_read_csv, mock_download_file, mock_get_redis, mock_write_to_redis, tmp_path
+    ):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        api.data_cache.clear()
+        mock_download_file.side_effect = self._fake_download("abc")
+        mock_read_csv.side_effect = lambda *args, **kwargs: pd.DataFrame(
+            {"Subject": ["COMP"], "Catalog Nbr": ["248"], "Term Code": ["2242"]}
+        )
+
+        api.download_datasets()
+
+        assert mock_read_csv.call_count == 2
+        mock_write_to_redis.assert_called_once()
+        mock_get_redis.return_value.set.assert_called_once_with("course_schedule:sha256", "abc")
+        with open(tmp_path / "dataset_metadata.json") as f:
+            metadata = json.load(f)
+        assert metadata["course_schedule"] == {"etag": '"v1"', "last_modified": None, "sha256": "abc"}
+
+    @pytest.mark.parametrize("modified", [False, True])
+    @patch("utils.concordia_api_utils.ConcordiaAPIUtils.write_to_redis")
+    @patch("utils.concordia_api_utils.get_redis_client")
+    @patch("utils.concordia_api_utils.download_file")
+    @patch("utils.concordia_api_utils.pd.read_csv")
+    def test_download_datasets_skips_unchanged_datasets(
+        self, mock_read_csv, mock_download_file, mock_get_redis, mock_write_to_redis, modified, tmp_path
+    ):
+        # A 304 and a re-download with the same content are both treated as unchanged
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        df = pd.DataFrame({"Subject": ["COMP"], "Catalog Nbr": ["248"], "Term Code": ["2242"]})
+        api.data_cache.update({"course_schedule": df, "course_section": df})
+        metadata = {name: {"etag": '"v1"', "last_modified": None, "sha256": "abc"} for name in api.data_cache}
+        (tmp_path / "dataset_metadata.json").write_text(json.dumps(metadata))
+        for name in metadata:
+            (tmp_path / f"{name}.csv").write_text("cached")
+        mock_download_file.side_effect = self._fake_download("abc", modified=modified)
+        mock_get_redis.return_value.get.return_value = b"abc"
+
+        api.download_datasets()
+
+        assert mock_download_file.call_args.args[2]["etag"] == '"v1"'
+        mock_read_csv.assert_not_called()
+        mock_write_to_redis.assert_not_called()
+        assert api.data_cache["course_schedule"] is df
+
+    @patch("utils.concordia_api_utils.ConcordiaAPIUtils.write_to_redis")
+    @patch("utils.concordia_api_utils.get_redis_client")
+    @patch("utils.concordia_api_utils.download_file")
+    @patch("utils.concordia_api_utils.pd.read_csv")
+    def test_download_datasets_reingests_when_redis_digest_missing(
+        self, mock_read_csv, mock_download_file, mock_get_redis, mock_write_to_redis, tmp_path
+    ):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        df = pd.DataFrame({"Subject": ["COMP"], "Catalog Nbr": ["248"], "Term Code": ["2242"]})
+        api.data_cache.update({"course_schedule": df, "course_section": df})
+        metadata = {name: {"etag": '"v1"', "sha256": "abc"} for name in api.data_cache}
+        (tmp_path / "dataset_metadata.json").write_text(json.dumps(metadata))
+        for name in metadata:
+            (tmp_path / f"{name}.csv").write_text("cached")
+        mock_download_file.side_effect = self._fake_download("abc", modified=False)
+        mock_get_redis.return_value.get.return_value = None
+
+        api.download_datasets()
+
+        mock_read_csv.assert_not_called()
+        mock_write_to_redis.assert_called_once()
+
+    def _run_incremental_update(self, mock_get_redis, previous_digests, items, live_keys=()):
+        client = mock_get_redis.return_value
+        client.hgetall.return_value = {k.encode(): v.encode() for k, v in previous_digests.items()}
+        client.scan_iter.return_value = [key.encode() for key in live_keys]
+        # Stands in for the transaction publishing the values, which finish() queues its commands on
+        pipe = MagicMock()
+        written = []
+
+        def write_to_redis(items, finish=None, **kwargs):
+            written.extend(items)
+            finish(pipe)
+            return len(written)
+
+        with patch.object(ConcordiaAPIUtils, "write_to_redis", side_effect=write_to_redis):
+            counts = self.api.update_redis_incrementally(items, chunk_size=2)
+        digests = {}
+        for c in pipe.hset.call_args_list:
+            digests.update(c.kwargs["mapping"])
+        return counts, written, digests, pipe
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_update_redis_incrementally_writes_everything_on_first_run(self, mock_get_redis):
+        items = [("COMP248", b"[1]"), ("SOEN228", b"[2]"), ("ENGR201", b"[3]")]
+
+        counts, written, digests, pipe = self._run_incremental_update(mock_get_redis, {}, items)
+
+        assert counts == {"added": 3, "changed": 0, "removed": 0, "unchanged": 0}
+        assert written == items
+        assert set(digests) == {"COMP248", "SOEN228", "ENGR201"}
+        pipe.delete.assert_not_called()
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_update_redis_incrementally_without_digests_removes_leftover_course_keys(self, mock_get_redis):
+        items = [("COMP248", b"[1]"), ("SOEN228", b"[2]")]
+        live_keys = ["COMP248", "ENGR201", "COMP490A", "course_schedule:sha256", "reset:abc"]
+
+        counts, written, digests, pipe = self._run_incremental_update(mock_get_redis, {}, items, live_keys)
+
+        assert counts == {"added": 2, "changed": 0, "removed": 2, "unchanged": 0}
+        assert written == items
+        assert set(digests) == {"COMP248", "SOEN228"}
+        pipe.delete.assert_called_once_with("COMP490A", "ENGR201")
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_update_redis_incrementally_writes_only_the_diff(self, mock_get_redis):
+        _, _, first_digests, _ = self._run_incremental_update(
+            mock_get_redis, {}, [("COMP248", b"[1]"), ("SOEN228", b"[2]"), ("ENGR201", b"[3]")]
+        )
+
+        counts, written, digests, pipe = self._run_incremental_update(
+            mock_get_redis, first_digests, [("COMP248", b"[1]"), ("SOEN228", b"[2, 2]"), ("COMP249", b"[4]")]
+        )
+
+        assert counts == {"added": 1, "changed": 1, "removed": 1, "unchanged": 1}
+        assert written == [("SOEN228", b"[2, 2]"), ("COMP249", b"[4]")]
+        assert set(digests) == {"SOEN228", "COMP249"}
+        assert digests["SOEN228"] != first_digests["SOEN228"]
+        pipe.delete.assert_called_once_with("ENGR201")
+        pipe.hdel.assert_called_once_with(COURSE_DIGESTS_KEY, "ENGR201")
+
+    @patch("utils.concordia_api_utils.get_redis_client")
+    def test_update_redis_incrementally_keeps_digests_when_write_fails(self, mock_get_redis):
+        client = mock_get_redis.return_value
+        client.hgetall.return_value = {}
+        with patch.object(ConcordiaAPIUtils, "write_to_redis", side_effect=Exception("Redis down")):
+            with pytest.raises(Exception):
+                self.api.update_redis_incrementally([("COMP248", b"[1]")])
+        client.pipeline.return_value.hset.assert_not_called()
+
+    def test_load_dataset_reuses_arrow_cache_for_same_source(self, tmp_path):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        csv_file_path = tmp_path / "course_section.csv"
+        csv_file_path.write_text("Subject,Catalog Nbr,Term Code,Room\nCOMP,248,2242,\nSOEN,228,2244,H937\n", encoding="utf-16")
+
+        first = api._load_dataset("course_section", str(csv_file_path), "abc")
+        assert (tmp_path / "course_section.arrow").exists()
+
+        with patch("utils.concordia_api_utils.pd.read_csv", side_effect=AssertionError("CSV should not be parsed")):
+            second = api._load_dataset("course_section", str(csv_file_path), "abc")
+        pd.testing.assert_frame_equal(first, second)
+
+    @patch("utils.concordia_api_utils.pd.read_csv")
+    def test_load_dataset_ignores_arrow_cache_for_other_source(self, mock_read_csv, tmp_path):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        mock_read_csv.return_value = pd.DataFrame({"Subject": ["COMP"], "Catalog Nbr": ["248"]})
+        api._load_dataset("course_section", "unused.csv", "abc")
+
+        api._load_dataset("course_section", "unused.csv", "def")
+        api._load_dataset("course_section", "unused.csv", None)
+
+        assert mock_read_csv.call_count == 3
+
+    @patch("utils.concordia_api_utils.pd.read_csv")
+    def test_load_dataset_falls_back_to_csv_on_corrupt_arrow_cache(self, mock_read_csv, tmp_path):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        (tmp_path / "course_section.arrow").write_bytes(b"not arrow")
+        mock_read_csv.return_value = pd.DataFrame({"Subject": ["COMP"], "Catalog Nbr": ["248"]})
+
+        df = api._load_dataset("course_section", "unused.csv", "abc")
+
+        assert df["Subject"].tolist() == ["COMP"]
+        assert api._read_arrow_cache(str(tmp_path / "course_section.arrow"), "abc") is not None
+
+    def test_load_cached_datasets_loads_previous_run_without_network(self, tmp_path):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        api.data_cache.clear()
+        for name in ("course_schedule", "course_section"):
+            (tmp_path / f"{name}.csv").write_text("Subject,Catalog Nbr,Term Code\nCOMP,248,2242\n", encoding="utf-16")
+
+        assert api.has_datasets() is False
+        with patch("utils.concordia_api_utils.download_file") as mock_download_file:
+            assert api.load_cached_datasets() is True
+        mock_download_file.assert_not_called()
+        assert api.has_datasets() is True
+        assert api._get_from_csv("course_section", subject="COMP", catalog=248)[0]["Term Code"] == "2242"
+
+    def test_load_cached_datasets_reports_missing_files(self, tmp_path):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        api.data_cache.clear()
+        (tmp_path / "course_section.csv").write_text("Subject,Catalog Nbr\nCOMP,248\n", encoding="utf-16")
+        assert api.load_cached_datasets() is False
+        assert api.has_datasets() is False
+
+    def test_get_dataset_version_changes_with_dataset_digests(self, tmp_path):
+        api = ConcordiaAPIUtils(cache_dir=str(tmp_path))
+        assert api.get_dataset_version() is None
+
+        api._write_dataset_metadata({"course_schedule": {"sha256": "aaa"}, "course_section": {"sha256": "bbb"}})
+        version = api.get_dataset_version()
+        assert version is not None
+        api._write_dataset_metadata({"course_schedule": {"sha256": "aaa"}, "course_section": {"sha256": "ccc"}})
+        assert api.get_dataset_version() != version
+        api._write_dataset_metadata({"course_schedule": {"sha256": "aaa"}})
+        assert api.get_dataset_version() is None
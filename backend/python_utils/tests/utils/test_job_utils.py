@@ -0,0 +1,108 @@
+import sys
+import os
+import json
+import threading
+import time
+from unittest.mock import patch
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import utils.job_utils as job_utils
+from utils.job_utils import JobStore
+
+
+def wait_for_job(store, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get_job(job_id)
+        if job["status"] not in job_utils.ACTIVE_JOB_STATUSES:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish in {timeout}s")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path))
+
+
+class TestJobStore:
+    def test_successful_job_persists_result_and_progress(self, store):
+        def run(report_progress):
+            report_progress(degreesDone=1, degreesTotal=2)
+            report_progress(degreesDone=2)
+            return [{"name": "BEng"}, {"name": "BCompSc"}]
+
+        job = store.start_job("scrape-all-degrees", run)
+        assert job["status"] == "queued"
+
+        finished = wait_for_job(store, job["id"])
+        assert finished["status"] == "succeeded"
+        assert finished["error"] is None
+        assert finished["progress"]["degreesDone"] == 2
+        assert finished["progress"]["degreesTotal"] == 2
+        assert "pagesFetched" in finished["progress"]
+        with open(store.get_result_path(job["id"])) as f:
+            assert json.load(f) == [{"name": "BEng"}, {"name": "BCompSc"}]
+
+    def test_failed_job_records_error_without_result(self, store):
+        def run(report_progress):
+            raise RuntimeError("catalog unreachable")
+
+        job = store.start_job("get-all-courses", run)
+        finished = wait_for_job(store, job["id"])
+        assert finished["status"] == "failed"
+        assert finished["error"] == "catalog unreachable"
+        assert store.get_result_path(job["id"]) is None
+
+    def test_pages_fetched_counts_requests_made_during_job(self, store):
+        counts = iter([10, 17, 17])
+        with patch('utils.job_utils.get_request_count', side_effect=lambda: next(counts)):
+            job = store.start_job("get-all-courses", lambda report_progress: [])
+            finished = wait_for_job(store, job["id"])
+        assert finished["progress"]["pagesFetched"] == 7
+
+    def test_active_job_of_same_type_is_reused(self, store):
+        release = threading.Event()
+        first = store.start_job("scrape-all-degrees", lambda report_progress: release.wait(5) and [])
+        second = store.start_job("scrape-all-degrees", lambda report_progress: [])
+        other = store.start_job("get-all-courses", lambda report_progress: [])
+        assert second["id"] == first["id"]
+        assert other["id"] != first["id"]
+        release.set()
+        wait_for_job(store, first["id"])
+        wait_for_job(store, other["id"])
+
+    def test_state_is_readable_by_another_store_instance(self, store, tmp_path):
+        job = store.start_job("get-all-courses", lambda report_progress: ["COMP 248"])
+        wait_for_job(store, job["id"])
+
+        restarted = JobStore(str(tmp_path))
+        assert restarted.get_job(job["id"])["status"] == "succeeded"
+        assert restarted.get_result_path(job["id"]) is not None
+
+    def test_job_abandoned_by_its_worker_is_reported_failed(self, store):
+        job = {"id": "a" * 32, "type": "scrape-all-degrees", "status": "running", "progress": {},
+               "error": None, "createdAt": 0, "updatedAt": time.time() - job_utils.JOB_STALE_SECONDS - 1}
+        store._write_state(job)
+
+        reloaded = store.get_job(job["id"])
+        assert reloaded["status"] == "failed"
+        assert reloaded["error"] == "Job was interrupted"
+        assert store.find_active_job("scrape-all-degrees") is None
+
+    def test_unknown_or_malformed_job_ids(self, store):
+        assert store.get_job("0" * 32) is None
+        assert store.get_job("../../secrets") is None
+        assert store.get_result_path("../../secrets") is None
+
+    def test_expired_jobs_are_cleaned_up(self, store):
+        old = {"id": "b" * 32, "type": "get-all-courses", "status": "succeeded", "progress": {},
+               "error": None, "createdAt": 0, "updatedAt": time.time() - job_utils.JOB_RETENTION_SECONDS - 1}
+        store._write_state(old)
+        store._write_json(store._result_path(old["id"]), [])
+
+        store.cleanup_expired_jobs()
+        assert store.get_job(old["id"]) is None
+        assert store.get_result_path(old["id"]) is None
@@ -455,4 +455,8 @@ def test_parse_coursepool_rules_combined_engineering_core_block():
     assert ("BEng in Building Engineering", "ENGR 392", "BLDG 482") in subs
 
     # Overrides
-    assert ("BEng in Industrial Engineering", "General Education Humanities and Social Sciences Electives", ("ACCO 220",)) in overrides
\ No newline at end of file
+    assert ("BEng in Industrial Engineering", "General Education Humanities and Social Sciences Electives", ("ACCO 220",)) in overrides
+
+def test_clean_text_converts_unicode_to_ascii_except_dashes():
+    assert clean_text("Café – Résumé — notes") == "Cafe – Resume – notes"
+    assert clean_text("") == ""
@@ -0,0 +1,99 @@
+import sys
+import os
+import math
+import time
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+from utils.process_pool_utils import ProcessPool
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def factory(size, task_timeout=30, max_tasks_per_child=0):
+        pool = ProcessPool("Test", size, task_timeout, max_tasks_per_child, warm_up_modules=("json",))
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.shutdown()
+
+
+class TestProcessPool:
+    def test_size_zero_runs_inline(self, make_pool):
+        pool = make_pool(0)
+        assert pool.run(os.getpid) == os.getpid()
+
+    def test_runs_tasks_in_worker_processes(self, make_pool):
+        pool = make_pool(2)
+        pool.start()
+        assert pool.run(pow, 2, 10) == 1024
+        assert pool.run(os.getpid) != os.getpid()
+
+    def test_processes_are_spawned_on_the_first_task(self, make_pool):
+        pool = make_pool(1)
+        assert pool._executor is None
+        assert pool.run(pow, 2, 3) == 8
+        assert pool._executor is not None
+
+    def test_concurrent_callers_all_get_their_result(self, make_pool):
+        pool = make_pool(2)
+        results = {}
+
+        def call(n):
+            results[n] = pool.run(pow, n, 2)
+
+        threads = [threading.Thread(target=call, args=(n,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {n: n * n for n in range(6)}
+
+    def test_recycles_workers_after_max_tasks(self, make_pool):
+        pool = make_pool(1, max_tasks_per_child=1)
+        first = pool.run(os.getpid)
+        second = pool.run(os.getpid)
+        assert first != second
+
+    def test_task_exceptions_propagate(self, make_pool):
+        pool = make_pool(1)
+        with pytest.raises(ZeroDivisionError):
+            pool.run(divmod, 1, 0)
+        assert pool.run(divmod, 7, 2) == (3, 1)
+
+    def test_timeout_raises_and_pool_recovers(self, make_pool):
+        pool = make_pool(1, task_timeout=1)
+        slow_pid = pool.run(os.getpid)
+        with pytest.raises(TimeoutError):
+            pool.run(time.sleep, 30)
+        # The stuck worker was replaced rather than left running
+        assert pool.run(os.getpid) != slow_pid
+
+    def test_crashed_worker_raises_broken_pool_and_pool_recovers(self, make_pool):
+        pool = make_pool(1)
+        with pytest.raises(BrokenProcessPool):
+            pool.run(os._exit, 1)
+        assert pool.run(pow, 3, 2) == 9
+
+    def test_iter_results_in_order_with_errors(self, make_pool):
+        pool = make_pool(2)
+        results = list(pool.iter_results(math.factorial, [3, -1, 5]))
+        assert [(index, result) for index, result, _ in results] == [(0, 6), (1, None), (2, 120)]
+        assert isinstance(results[1][2], ValueError)
+        assert results[0][2] is None and results[2][2] is None
+
+    def test_iter_results_unordered_yields_every_item(self, make_pool):
+        pool = make_pool(2)
+        results = pool.iter_results(math.factorial, [6, 1, 4], ordered=False)
+        assert sorted((index, result) for index, result, _ in results) == [(0, 720), (1, 1), (2, 24)]
+
+    def test_iter_results_inline(self, make_pool):
+        pool = make_pool(0)
+        assert list(pool.iter_results(math.factorial, [0, 2])) == [(0, 1, None), (1, 2, None)]
@@ -0,0 +1,39 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.regex_utils import normalize_spacing, normalize_punctuation, COURSE_RE, TERM_HEADER_RE
+
+
+class TestNormalizeSpacing:
+    def test_collapses_whitespace(self):
+        assert normalize_spacing("  Programming\t\n  Methodology ") == " Programming Methodology "
+
+    def test_spaces_out_letters_and_numbers(self):
+        assert normalize_spacing("COMP248Programming, 3credits") == "COMP 248 Programming, 3 credits"
+        assert normalize_spacing("a1b2") == "a 1 b 2"
+
+    def test_leaves_non_ascii_letters_alone(self):
+        assert normalize_spacing("é1") == "é1"
+
+
+class TestNormalizePunctuation:
+    def test_joins_decimal_numbers(self):
+        assert normalize_punctuation("3 . 5 credits") == "3.5 credits"
+
+    def test_single_space_after_separators_and_dots(self):
+        assert normalize_punctuation("MATH 101 ,COMP 248 ;Important .Next") == "MATH 101, COMP 248; Important. Next"
+
+    def test_dot_after_separator_keeps_no_space_between(self):
+        assert normalize_punctuation("Prerequisite : . COMP") == "Prerequisite:. COMP"
+        assert normalize_punctuation("a, .5") == "a, .5"
+
+
+class TestPatterns:
+    def test_course_pattern(self):
+        assert COURSE_RE.findall("COMP 248 or SOEN  6011") == ["COMP 248", "SOEN  6011"]
+
+    def test_term_header_pattern(self):
+        assert TERM_HEADER_RE.match("Fall/Winter 2025-26").groups() == ("Fall/Winter", "2025-26")
+        assert TERM_HEADER_RE.match("Autumn 2025") is None
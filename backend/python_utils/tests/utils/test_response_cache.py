@@ -0,0 +1,95 @@
+import sys
+import os
+import gzip
+import threading
+import time
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    def test_body_is_built_once_per_version(self):
+        cache = ResponseCache()
+        version = {"value": 1}
+        builds = []
+        build = lambda: builds.append(1) or b'["COMP 248"]'
+
+        first = cache.get("courses", lambda: version["value"], build)
+        second = cache.get("courses", lambda: version["value"], build)
+        assert first is second
+        assert len(builds) == 1
+        assert cache.stats == {"hits": 1, "misses": 1}
+
+        version["value"] = 2
+        third = cache.get("courses", lambda: version["value"], build)
+        assert third is not first
+        assert len(builds) == 2
+
+    def test_version_is_read_after_building(self):
+        cache = ResponseCache()
+        version = {"value": None}
+
+        def build():
+            version["value"] = 1700000000.0  # e.g. the first scrape sets scraped_at
+            return b"[]"
+
+        cache.get("courses", lambda: version["value"], build)
+        cache.get("courses", lambda: version["value"], lambda: b"rebuilt")
+        assert cache.stats["hits"] == 1
+
+    def test_etag_and_gzip_body(self):
+        entry = ResponseCache().get("courses", lambda: 1, lambda: b'[{"_id": "COMP 248"}]' * 100)
+        assert len(entry.etag) == 32
+        assert gzip.decompress(entry.gzip_body) == entry.body
+        assert entry.gzip_body is entry.gzip_body
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.get("a", lambda: 1, lambda: b"a")
+        cache.get("b", lambda: 1, lambda: b"b")
+        cache.get("a", lambda: 1, lambda: b"a")
+        cache.get("c", lambda: 1, lambda: b"c")
+        builds = []
+        cache.get("a", lambda: 1, lambda: builds.append("a") or b"a")
+        cache.get("b", lambda: 1, lambda: builds.append("b") or b"b")
+        assert builds == ["b"]
+
+    def test_concurrent_requests_share_one_build(self):
+        cache = ResponseCache()
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.05)
+            return b"[]"
+
+        threads = [threading.Thread(target=cache.get, args=("courses", lambda: 1, build)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(builds) == 1
+        assert cache._key_locks == {}
+
+    def test_failed_build_leaves_no_key_lock(self):
+        cache = ResponseCache()
+
+        def build():
+            raise ValueError("Degree not found")
+
+        for name in ("XYZ", "ABC"):
+            with pytest.raises(ValueError):
+                cache.get(("degree", name), lambda: 1, build)
+        assert cache._key_locks == {}
+        assert len(cache._entries) == 0
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        cache.get("courses", lambda: 1, lambda: b"[]")
+        cache.invalidate()
+        builds = []
+        cache.get("courses", lambda: 1, lambda: builds.append(1) or b"[]")
+        assert builds == [1]
@@ -0,0 +1,135 @@
+import sys
+import os
+import json
+import threading
+import time
+from unittest.mock import patch
+import pytest
+import redis
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import utils.shared_cache as shared_cache
+from utils.shared_cache import get_or_compute_shared, delete_shared, get_shared_key, get_shared_generation, \
+    bump_shared_generation
+
+
+class FakeLock:
+    def __init__(self, lock, blocking_timeout):
+        self._lock = lock
+        self._blocking_timeout = blocking_timeout
+
+    def acquire(self):
+        return self._lock.acquire(timeout=-1 if self._blocking_timeout is None else self._blocking_timeout)
+
+    def release(self):
+        self._lock.release()
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the shared cache uses, shared by all 'workers' of a test."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+        self._locks = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+        return int(self.values[key])
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        return FakeLock(self._locks.setdefault(name, threading.Lock()), blocking_timeout)
+
+
+JSON_CODEC = dict(encode=lambda value: json.dumps(value).encode(), decode=json.loads)
+
+
+@pytest.fixture
+def fake_redis():
+    client = FakeRedis()
+    with patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379"}), \
+            patch("utils.shared_cache.get_redis_client", return_value=client):
+        yield client
+
+
+class TestGetOrComputeShared:
+    def test_computes_locally_without_redis_url(self):
+        with patch.dict(os.environ, {}, clear=True), patch("utils.shared_cache.get_redis_client") as mock_get_redis:
+            assert get_or_compute_shared("courses:v1", lambda: ["COMP 248"], **JSON_CODEC) == ["COMP 248"]
+            mock_get_redis.assert_not_called()
+
+    def test_publishes_once_and_reads_back(self, fake_redis):
+        computed = []
+        compute = lambda: computed.append(1) or {"COMP 248": ["Fall"]}
+
+        assert get_or_compute_shared("course_terms:abc", compute, ttl=60, **JSON_CODEC) == {"COMP 248": ["Fall"]}
+        assert get_or_compute_shared("course_terms:abc", compute, ttl=60, **JSON_CODEC) == {"COMP 248": ["Fall"]}
+        assert len(computed) == 1
+        assert fake_redis.ttls[get_shared_key("course_terms:abc")] == 60
+
+    def test_concurrent_workers_compute_once(self, fake_redis):
+        computed = []
+        results = []
+
+        def compute():
+            computed.append(1)
+            time.sleep(0.05)
+            return ["COMP 248"]
+
+        def worker():
+            results.append(get_or_compute_shared("courses:v1", compute, **JSON_CODEC))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(computed) == 1
+        assert results == [["COMP 248"]] * 4
+
+    def test_rejected_value_is_recomputed(self, fake_redis):
+        get_or_compute_shared("courses:v1", lambda: {"scrapedAt": 1}, **JSON_CODEC)
+        value = get_or_compute_shared("courses:v1", lambda: {"scrapedAt": 2},
+                                      accept=lambda value: value["scrapedAt"] >= 2, **JSON_CODEC)
+        assert value == {"scrapedAt": 2}
+        assert json.loads(fake_redis.values[get_shared_key("courses:v1")]) == {"scrapedAt": 2}
+
+    def test_redis_errors_fall_back_to_local_compute(self, fake_redis):
+        with patch.object(fake_redis, "get", side_effect=redis.ConnectionError("down")):
+            assert get_or_compute_shared("courses:v1", lambda: ["COMP 248"], **JSON_CODEC) == ["COMP 248"]
+
+    def test_lock_wait_timeout_falls_back_to_local_compute(self, fake_redis):
+        with patch.object(shared_cache, "SHARED_CACHE_WAIT_SECONDS", 0.01):
+            holder = fake_redis.lock(f"{get_shared_key('courses:v1')}:lock")
+            holder.acquire()
+            try:
+                assert get_or_compute_shared("courses:v1", lambda: ["COMP 248"], **JSON_CODEC) == ["COMP 248"]
+            finally:
+                holder.release()
+        assert get_shared_key("courses:v1") not in fake_redis.values
+
+    def test_delete_shared(self, fake_redis):
+        get_or_compute_shared("courses:v1", lambda: ["COMP 248"], **JSON_CODEC)
+        delete_shared("courses:v1")
+        assert get_shared_key("courses:v1") not in fake_redis.values
+
+    def test_generation_is_shared_between_workers(self, fake_redis):
+        assert get_shared_generation("degree_requirements") == 0
+        bump_shared_generation("degree_requirements")
+        bump_shared_generation("degree_requirements")
+        assert get_shared_generation("degree_requirements") == 2
+
+    def test_generation_is_zero_without_redis(self):
+        bump_shared_generation("degree_requirements")
+        assert get_shared_generation("degree_requirements") == 0
@@ -0,0 +1,113 @@
+import sys
+import os
+import hashlib
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import redis
+from utils.transcript_cache import TranscriptCache, transcript_digest, TRANSCRIPT_CACHE_PREFIX
+
+
+def local_cache(**kwargs):
+    options = {"max_entries": 4, "ttl_seconds": 60, "enabled": True, "use_redis": False}
+    options.update(kwargs)
+    return TranscriptCache(**options)
+
+
+class TestTranscriptCache:
+    def test_digest_is_sha256_of_bytes(self):
+        assert transcript_digest(b"pdf") == hashlib.sha256(b"pdf").hexdigest()
+
+    def test_get_or_parse_parses_once(self):
+        cache = local_cache()
+        parse = MagicMock(return_value={"courses": [1]})
+        assert cache.get_or_parse(b"pdf", parse) == {"courses": [1]}
+        assert cache.get_or_parse(b"pdf", parse) == {"courses": [1]}
+        parse.assert_called_once_with(b"pdf")
+        assert cache.stats["misses"] == 1 and cache.stats["local_hits"] == 1
+
+    def test_hits_return_copies(self):
+        cache = local_cache()
+        cache.put("digest", {"courses": [1]})
+        cache.get("digest")["courses"].append(2)
+        assert cache.get("digest") == {"courses": [1]}
+
+    def test_bypass_skips_cache(self):
+        cache = local_cache()
+        parse = MagicMock(return_value={})
+        cache.get_or_parse(b"pdf", parse, bypass=True)
+        cache.get_or_parse(b"pdf", parse, bypass=True)
+        assert parse.call_count == 2
+        assert cache.stats["bypassed"] == 2
+        assert cache.get(transcript_digest(b"pdf")) is None
+
+    def test_disabled_cache_always_parses(self):
+        cache = local_cache(enabled=False)
+        parse = MagicMock(return_value={})
+        cache.get_or_parse(b"pdf", parse)
+        cache.get_or_parse(b"pdf", parse)
+        assert parse.call_count == 2
+
+    def test_entries_expire(self):
+        cache = local_cache(ttl_seconds=10)
+        with patch("utils.transcript_cache.time.monotonic", return_value=100):
+            cache.put("digest", {})
+        with patch("utils.transcript_cache.time.monotonic", return_value=109):
+            assert cache.get("digest") == {}
+        with patch("utils.transcript_cache.time.monotonic", return_value=111):
+            assert cache.get("digest") is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = local_cache(max_entries=2)
+        cache.put("a", {"a": 1})
+        cache.put("b", {"b": 1})
+        cache.get("a")
+        cache.put("c", {"c": 1})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"a": 1} and cache.get("c") == {"c": 1}
+
+    @patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379"})
+    @patch("utils.transcript_cache.get_redis_client")
+    def test_redis_tier_stores_with_ttl_and_serves_other_workers(self, mock_get_client):
+        client = MagicMock()
+        mock_get_client.return_value = client
+        local_cache(use_redis=True, ttl_seconds=30).put("digest", {"courses": []})
+        client.set.assert_called_once_with(f"{TRANSCRIPT_CACHE_PREFIX}:digest", b'{"courses":[]}', ex=30)
+
+        pipe = client.pipeline.return_value
+        pipe.execute.return_value = [b'{"courses":[]}', 20000]
+        other_worker = local_cache(use_redis=True)
+        assert other_worker.get("digest") == {"courses": []}
+        assert other_worker.stats["redis_hits"] == 1
+        pipe.get.assert_called_once_with(f"{TRANSCRIPT_CACHE_PREFIX}:digest")
+        pipe.pttl.assert_called_once_with(f"{TRANSCRIPT_CACHE_PREFIX}:digest")
+        # Promoted to the local tier
+        pipe.execute.return_value = [None, -2]
+        assert other_worker.get("digest") == {"courses": []}
+        assert other_worker.stats["local_hits"] == 1
+
+    @patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379"})
+    @patch("utils.transcript_cache.get_redis_client")
+    def test_redis_hit_expires_locally_with_its_remaining_redis_ttl(self, mock_get_client):
+        pipe = mock_get_client.return_value.pipeline.return_value
+        pipe.execute.return_value = [b'{}', 5000]
+        cache = local_cache(use_redis=True, ttl_seconds=60)
+        with patch("utils.transcript_cache.time.monotonic", return_value=100):
+            assert cache.get("digest") == {}
+        pipe.execute.return_value = [None, -2]
+        with patch("utils.transcript_cache.time.monotonic", return_value=104):
+            assert cache.get("digest") == {}
+        with patch("utils.transcript_cache.time.monotonic", return_value=106):
+            assert cache.get("digest") is None
+
+    @patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379"})
+    @patch("utils.transcript_cache.get_redis_client")
+    def test_redis_errors_fall_back_to_parsing(self, mock_get_client):
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        client.set.side_effect = redis.ConnectionError("down")
+        mock_get_client.return_value = client
+        cache = local_cache(use_redis=True)
+        assert cache.get_or_parse(b"pdf", lambda pdf_bytes: {"ok": True}) == {"ok": True}
+        assert cache.get_or_parse(b"pdf", lambda pdf_bytes: {"ok": False}) == {"ok": True}
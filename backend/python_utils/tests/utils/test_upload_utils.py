@@ -0,0 +1,37 @@
+import sys
+import os
+import io
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+from utils import upload_utils
+from utils.upload_utils import UploadTooLargeError, format_size, read_limited
+
+
+class TestReadLimited:
+    def test_reads_whole_stream_under_limit(self):
+        data = read_limited(io.BytesIO(b"%PDF-1.4 content"), 100)
+        assert isinstance(data, bytearray)
+        assert data == b"%PDF-1.4 content"
+
+    def test_stream_of_exactly_the_limit_is_accepted(self):
+        assert read_limited(io.BytesIO(b"x" * 10), 10) == b"x" * 10
+
+    def test_raises_past_limit(self):
+        with pytest.raises(UploadTooLargeError, match="Transcript is larger than the 10 bytes limit"):
+            read_limited(io.BytesIO(b"x" * 11), 10, "Transcript")
+
+    def test_stops_reading_once_past_limit(self, monkeypatch):
+        monkeypatch.setattr(upload_utils, "READ_CHUNK_BYTES", 4)
+        stream = io.BytesIO(b"x" * 100)
+        with pytest.raises(UploadTooLargeError):
+            read_limited(stream, 10)
+        assert stream.tell() == 11
+
+
+class TestFormatSize:
+    def test_units(self):
+        assert format_size(512) == "512 bytes"
+        assert format_size(64 * 1024) == "64 KB"
+        assert format_size(10 * 1024 * 1024) == "10 MB"
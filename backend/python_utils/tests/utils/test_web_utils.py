@@ -2,6 +2,11 @@ import unittest
 from unittest.mock import patch, MagicMock, mock_open, call
 import sys
 import os
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
 import requests
 
 # Add the parent directory to the path to import the modules
@@ -158,4 +163,105 @@ def test_get_max_retries(mock_session):
             get("http://example.com")
         assert mock_session.get.call_count == 3
     finally:
-        web_utils.max_retries = original_max_retries
\ No newline at end of file
+        web_utils.max_retries = original_max_retries
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    body = b"Subject,Catalog Nbr\nCOMP,248\n"
+    etag = '"v1"'
+    last_modified = "Wed, 01 Oct 2025 00:00:00 GMT"
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag or self.headers.get("If-Modified-Since") == self.last_modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def conditional_server():
+    _ConditionalHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/data.csv"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_file_conditional_request_against_local_server(conditional_server, tmp_path):
+    file_path = tmp_path / "data.csv"
+    validators = {}
+
+    assert download_file(conditional_server, str(file_path), validators) is True
+    assert validators["modified"] is True
+    assert validators["etag"] == '"v1"'
+    assert validators["last_modified"] == _ConditionalHandler.last_modified
+    assert validators["sha256"] == hashlib.sha256(_ConditionalHandler.body).hexdigest()
+    assert file_path.read_bytes() == _ConditionalHandler.body
+
+    file_path.write_bytes(b"local copy")
+    assert download_file(conditional_server, str(file_path), validators) is True
+    assert validators["modified"] is False
+    assert file_path.read_bytes() == b"local copy"
+    assert _ConditionalHandler.requests_seen[-1]["If-None-Match"] == '"v1"'
+    assert _ConditionalHandler.requests_seen[-1]["If-Modified-Since"] == _ConditionalHandler.last_modified
+
+
+def test_download_file_without_validators_is_unconditional(conditional_server, tmp_path):
+    file_path = tmp_path / "data.csv"
+    assert download_file(conditional_server, str(file_path)) is True
+    assert "If-None-Match" not in _ConditionalHandler.requests_seen[-1]
+    assert file_path.read_bytes() == _ConditionalHandler.body
+
+
+def test_get_limits_concurrent_requests_per_host():
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_get(url, timeout, **kwargs):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return MagicMock()
+
+    with patch.object(web_utils, "max_requests_per_host", 2), \
+            patch.dict(web_utils._host_semaphores, clear=True), \
+            patch('utils.web_utils.session') as mock_session:
+        mock_session.get.side_effect = fake_get
+        threads = [threading.Thread(target=get, args=(f"http://example.com/{i}",)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert mock_session.get.call_count == 8
+    assert in_flight["max"] == 2
+
+
+def test_get_spaces_requests_to_the_same_host():
+    starts = []
+    with patch.object(web_utils, "min_request_interval", 0.05), \
+            patch.dict(web_utils._host_next_start, clear=True), \
+            patch('utils.web_utils.session') as mock_session:
+        mock_session.get.side_effect = lambda url, timeout, **kwargs: starts.append(time.monotonic()) or MagicMock()
+        for i in range(3):
+            get(f"http://example.com/{i}")
+        get("http://other.example.com/")
+
+    assert starts[1] - starts[0] >= 0.045
+    assert starts[2] - starts[1] >= 0.045
+    assert starts[3] - starts[2] < 0.045
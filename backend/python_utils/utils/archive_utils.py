@@ -0,0 +1,112 @@
+"""
+ArchiveUtils - Reads the PDF files out of a zip or tar upload for batch transcript parsing.
+Tar archives (plain or compressed) are read as a stream; zip archives need a seekable file, so a non-seekable
+stream is first spooled to a temporary file.
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from typing import BinaryIO, Optional
+from .logging_utils import get_logger
+from .upload_utils import UploadTooLargeError, format_size, read_limited
+
+logger = get_logger("ArchiveUtils")
+
+ZIP_EXTENSIONS = (".zip",)
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_MIMETYPES = {"application/zip", "application/x-zip-compressed"}
+TAR_MIMETYPES = {"application/x-tar", "application/x-gtar", "application/gzip", "application/x-gzip"}
+# Spooled zip uploads stay in memory up to this size, then move to a temporary file
+ZIP_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+def archive_format(filename: str = "", mimetype: str = "") -> Optional[str]:
+    """Returns "zip" or "tar" from the file name's extension, else from the mimetype, or None for neither."""
+    name = (filename or "").lower()
+    if name.endswith(ZIP_EXTENSIONS):
+        return "zip"
+    if name.endswith(TAR_EXTENSIONS):
+        return "tar"
+    if mimetype in ZIP_MIMETYPES:
+        return "zip"
+    if mimetype in TAR_MIMETYPES:
+        return "tar"
+    return None
+
+
+def _is_pdf_member(name: str) -> bool:
+    base = os.path.basename(name)
+    # Skips macOS resource forks ("__MACOSX/._file.pdf") and other hidden files
+    return base.lower().endswith(".pdf") and not base.startswith(".") and "__MACOSX/" not in name
+
+
+class _Limits:
+    def __init__(self, max_files: int, max_file_bytes: Optional[int], max_total_bytes: Optional[int]):
+        self.max_files = max_files
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.total_bytes = 0
+
+    def read_member(self, name: str, size: int, file: BinaryIO, members: list) -> None:
+        """Appends (name, data), checking the member's declared size before decompressing it."""
+        if len(members) >= self.max_files:
+            raise ValueError(f"Archive contains more than {self.max_files} PDF files")
+        if self.max_file_bytes is not None and size > self.max_file_bytes:
+            raise UploadTooLargeError(f"{name} is larger than the {format_size(self.max_file_bytes)} limit")
+        if self.max_total_bytes is not None and self.total_bytes + size > self.max_total_bytes:
+            raise UploadTooLargeError(f"Archive contents are larger than the {format_size(self.max_total_bytes)} limit")
+        # Reading stops at the declared size, in case the archive lies about it
+        data = read_limited(file, size, name)
+        self.total_bytes += len(data)
+        members.append((name, data))
+
+
+def read_pdf_members(stream: BinaryIO, fmt: str, max_files: int, max_file_bytes: Optional[int] = None,
+                     max_total_bytes: Optional[int] = None) -> list[tuple[str, bytearray]]:
+    """
+    Returns (member name, bytes) of every PDF in the archive, in archive order; other members are skipped.
+    Raises ValueError for a corrupt archive or one holding more than max_files PDFs, and UploadTooLargeError
+    for a PDF over max_file_bytes or PDFs adding up to more than max_total_bytes (checked before decompressing).
+    """
+    limits = _Limits(max_files, max_file_bytes, max_total_bytes)
+    try:
+        if fmt == "zip":
+            return _read_zip(stream, limits)
+        return _read_tar(stream, limits)
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+        raise ValueError(f"Invalid {fmt} archive: {e}") from e
+
+
+def _read_tar(stream: BinaryIO, limits: _Limits) -> list[tuple[str, bytearray]]:
+    members = []
+    with tarfile.open(fileobj=stream, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not _is_pdf_member(member.name):
+                continue
+            limits.read_member(member.name, member.size, archive.extractfile(member), members)
+    return members
+
+
+def _read_zip(stream: BinaryIO, limits: _Limits) -> list[tuple[str, bytearray]]:
+    seekable = getattr(stream, "seekable", None)
+    if seekable and seekable():
+        return _read_zip_file(stream, limits)
+    with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_MEMORY) as spooled:
+        shutil.copyfileobj(stream, spooled)
+        spooled.seek(0)
+        return _read_zip_file(spooled, limits)
+
+
+def _read_zip_file(file: BinaryIO, limits: _Limits) -> list[tuple[str, bytearray]]:
+    members = []
+    with zipfile.ZipFile(file) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_pdf_member(info.filename):
+                continue
+            with archive.open(info) as member:
+                limits.read_member(info.filename, info.file_size, member, members)
+    logger.debug(f"Read {len(members)} PDF files from zip archive")
+    return members
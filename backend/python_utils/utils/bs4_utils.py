@@ -1,26 +1,115 @@
 from bs4 import BeautifulSoup, ResultSet
 from bs4.dammit import EncodingDetector
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urldefrag
+from contextlib import contextmanager
 from .web_utils import get as web_get
+from .logging_utils import get_logger
 import re
 import sys
 import os
-from typing import Any
+import threading
+from typing import Any, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from models import AnchorLink, CoursePool
 from .parsing_utils import REGEX_ALL, REGEX_NONE, COURSE_REGEX, clean_text, get_course_sort_key, parse_coursepool_rules
 
-def get_soup(url: str) -> BeautifulSoup:
+logger = get_logger("BS4Utils")
+
+class PageCache:
     """
-    Fetches the content from the URL and returns a BeautifulSoup object.
+    Caches fetched page bytes and parsed BeautifulSoup trees by URL (fragment stripped), so each distinct
+    page is downloaded and parsed once. Cached soups are shared and must be treated as read-only.
     """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._url_locks: dict[str, threading.Lock] = {}
+        self._pages: dict[str, tuple[bytes, Optional[str]]] = {}
+        self._soups: dict[str, BeautifulSoup] = {}
+        self.stats = {"fetch_hits": 0, "fetch_misses": 0, "parse_hits": 0, "parse_misses": 0}
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _url_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(key, threading.Lock())
+
+    def get_page(self, url: str) -> tuple[bytes, Optional[str]]:
+        key = urldefrag(url).url
+        # Per-URL lock so concurrent callers asking for the same page wait for a single fetch
+        with self._url_lock(key):
+            return self._get_page_locked(url, key)
+
+    def _get_page_locked(self, url: str, key: str) -> tuple[bytes, Optional[str]]:
+        page = self._pages.get(key)
+        if page is not None:
+            self._count("fetch_hits")
+            return page
+        self._count("fetch_misses")
+        page = _fetch_page(url)
+        self._pages[key] = page
+        return page
+
+    def get_soup(self, url: str) -> BeautifulSoup:
+        key = urldefrag(url).url
+        with self._url_lock(key):
+            soup = self._soups.get(key)
+            if soup is not None:
+                self._count("parse_hits")
+                return soup
+            self._count("parse_misses")
+            content, encoding = self._get_page_locked(url, key)
+            soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
+            self._soups[key] = soup
+            return soup
+
+_active_page_cache: Optional[PageCache] = None
+_active_page_cache_scopes = 0
+_page_cache_scope_lock = threading.Lock()
+
+@contextmanager
+def page_cache_scope():
+    """
+    Makes get_soup serve pages from a shared PageCache until the outermost scope exits.
+    Nested or concurrent scopes share the same cache; its hit/miss counters are logged when it is dropped.
+    """
+    global _active_page_cache, _active_page_cache_scopes
+    with _page_cache_scope_lock:
+        if _active_page_cache is None:
+            _active_page_cache = PageCache()
+        _active_page_cache_scopes += 1
+        cache = _active_page_cache
+    try:
+        yield cache
+    finally:
+        with _page_cache_scope_lock:
+            _active_page_cache_scopes -= 1
+            if _active_page_cache_scopes == 0:
+                logger.info(f"Page cache released: {len(cache._pages)} pages, {cache.stats}")
+                _active_page_cache = None
+
+def _fetch_page(url: str) -> tuple[bytes, Optional[str]]:
     resp = web_get(url)
     encoding = (
         EncodingDetector.find_declared_encoding(resp.content, is_html=True)
         or (resp.encoding if 'charset' in resp.headers.get('content-type', '').lower() else None)
     )
-    return BeautifulSoup(resp.content, 'lxml', from_encoding=encoding)
+    return resp.content, encoding
+
+def get_soup(url: str, use_cache: bool = True) -> BeautifulSoup:
+    """
+    Fetches the content from the URL and returns a BeautifulSoup object.
+    Inside a page_cache_scope the page is fetched and parsed once and the same soup is returned afterwards;
+    use_cache=False always fetches, for pages that are read only once per run.
+    """
+    cache = _active_page_cache
+    if use_cache and cache is not None:
+        return cache.get_soup(url)
+    content, encoding = _fetch_page(url)
+    return BeautifulSoup(content, 'lxml', from_encoding=encoding)
 
 def _get_all_links_from_element(
         url: str,
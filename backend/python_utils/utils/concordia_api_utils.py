@@ -1,9 +1,15 @@
 import sys
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import os
 import redis
 import json
-from typing import Optional
+import time
+import hashlib
+import re
+import uuid
+from typing import Any, Callable, Optional
 from dotenv import load_dotenv
 
 env_file = os.getenv("ENV_FILE", os.path.join(os.path.dirname(__file__), "../../../secrets/.env"))
@@ -23,8 +29,87 @@ from utils.web_utils import download_file
 from utils.logging_utils import get_logger
 
 
+# Number of SET commands sent to Redis per pipeline round trip during ingestion
+REDIS_WRITE_CHUNK_SIZE = int(os.getenv("REDIS_WRITE_CHUNK_SIZE", "1000"))
+# Stage ingested keys under a versioned prefix and rename them into place in one transaction,
+# so readers never see a half-written dataset
+REDIS_ATOMIC_SWAP = os.getenv("REDIS_ATOMIC_SWAP", "false").lower() in ("1", "true", "yes")
+REDIS_STAGING_PREFIX = "course_schedule:staging"
+# ETag / Last-Modified / content hash of each downloaded dataset, kept in the cache dir
+DATASET_METADATA_FILENAME = "dataset_metadata.json"
+# Schema metadata key recording the sha256 of the CSV an Arrow IPC cache file was built from
+ARROW_SOURCE_DIGEST_KEY = b"source_sha256"
+# Content hash of the course_schedule dataset currently ingested in Redis
+SCHEDULE_DIGEST_KEY = "course_schedule:sha256"
+# Rows formatted and serialized together when converting the schedule dataset to JSON
+SCHEDULE_JSON_BATCH_ROWS = 1000
+# Redis hash of course code -> digest of the JSON stored under that course code, used to write only changed courses
+COURSE_DIGESTS_KEY = "course_schedule:digests"
+# Course schedules are stored under bare course codes ("COMP248"); without digests, the ones left from an
+# earlier run are found by SCANning for this pattern and checked against COURSE_CODE_KEY_REGEX
+COURSE_CODE_KEY_PATTERN = "[A-Z][A-Z][A-Z][A-Z][0-9]*"
+COURSE_CODE_KEY_REGEX = re.compile(r"[A-Z]{4}\d+[A-Z]*")
+
 TERM = ["0", "Summer", "Fall", "Fall/Winter", "Winter", "Spring (for CCCE career only)", "Summer (for CCCE career only)"]
+# Sort terms with custom priority, then keep any others afterward.
+TERM_ORDER = {
+    "Fall": 0,
+    "Fall/Winter": 1,
+    "Winter": 2,
+    "Summer": 3,
+}
+
+def sort_terms(terms):
+    return sorted(set(terms), key=lambda x: (TERM_ORDER.get(x, 99), x))
+
+# Position of each TERM entry in the sorted order, so whole term columns can be sorted at once
+TERM_RANK = np.array([sort_terms(TERM).index(term) for term in TERM])
 CATALOG_NBR="Catalog Nbr"
+# Response field -> Open Data column of a course schedule entry
+SCHEDULE_COLUMNS = {
+    "courseID": "Course ID",
+    "termCode": "Term Code",
+    "session": "Session",
+    "subject": "Subject",
+    "catalog": CATALOG_NBR,
+    "section": "Section",
+    "componentCode": "Component Code",
+    "componentDescription": "Component Descr",
+    "classNumber": "Class Nbr",
+    "classAssociation": "Class Association",
+    "courseTitle": "Course Title",
+    "topicID": "Topic ID",
+    "topicDescription": "Topic Descr",
+    "classStatus": "Class Status",
+    "locationCode": "Location Code",
+    "instructionModeCode": "Instruction Mode code",
+    "instructionModeDescription": "Instruction Mode Descr",
+    "meetingPatternNumber": "Meeting Pattern Nbr",
+    "roomCode": "Room Code",
+    "buildingCode": "Building Code",
+    "room": "Room",
+    "classStartTime": "Class Start Time",
+    "classEndTime": "Class End Time",
+    "mondays": "Mon",
+    "tuesdays": "Tues",
+    "wednesdays": "Wed",
+    "thursdays": "Thurs",
+    "fridays": "Fri",
+    "saturdays": "Sat",
+    "sundays": "Sun",
+    "classStartDate": "Start Date (DD/MM/YYYY)",
+    "classEndDate": "End Date (DD/MM/YYYY)",
+    "career": "Career",
+    "departmentCode": "Dept. Code",
+    "departmentDescription": "Dept. Descr",
+    "facultyCode": "Faculty Code",
+    "facultyDescription": "Faculty Descr",
+    "enrollmentCapacity": "Enrollment Capacity",
+    "currentEnrollment": "Current Enrollment",
+    "waitlistCapacity": "Waitlist Capacity",
+    "currentWaitlistTotal": "Current Waitlist Total",
+    "hasSeatReserved": "Has some/all seats reserved?",
+}
 CSV_SOURCES = {
     "course_schedule": {
         "url": "https://opendata.concordia.ca/datasets/sis/CU_SR_OPEN_DATA_SCHED.csv",
@@ -39,34 +124,269 @@ CSV_SOURCES = {
 class ConcordiaAPIUtils:
 
     data_cache = {}
+    # csv_name -> (indexed DataFrame, {(subject, catalog): row positions})
+    data_index = {}
 
     def __init__(self, cache_dir: str):
         self.logger = get_logger("ConcordiaAPIUtils")
         self.cache_dir = cache_dir
 
     def download_datasets(self):
+        metadata = self._read_dataset_metadata()
         for csv_name, csv_info in CSV_SOURCES.items():
             csv_file_path = os.path.join(self.cache_dir, f"{csv_name}.csv")
-            
+            previous = metadata.get(csv_name, {})
+            # Only make the request conditional if the file the validators describe is still on disk
+            validators = dict(previous) if os.path.exists(csv_file_path) else {}
+
             self.logger.info(f"Downloading CSV dataset: {csv_name} from {csv_info['url']}")
-            download_file(csv_info["url"], csv_file_path)
-            self.logger.info(f"Downloaded and saved {csv_name} to {csv_file_path}")
-            self.logger.info(f"Loading {csv_name} into DataFrame...")
-            df = pd.read_csv(csv_file_path, engine="pyarrow", encoding="utf-16")
-            self.data_cache[csv_name] = df
+            downloaded = download_file(csv_info["url"], csv_file_path, validators)
+            modified = validators.pop("modified", True)
+            digest = validators.get("sha256")
+            unchanged = downloaded and (not modified or (digest is not None and digest == previous.get("sha256")))
+            if downloaded:
+                metadata[csv_name] = validators
+                self.logger.info(f"Downloaded and saved {csv_name} to {csv_file_path}" if modified else f"{csv_name} not modified on the server")
 
-            if csv_name == "course_schedule":
-                self.logger.info(f"Storing {csv_name} in Redis by course code...")
-                df["course_code"] = df["Subject"].str.strip() + df[CATALOG_NBR].astype(str).str.strip()
+            if unchanged and csv_name in self.data_cache:
+                self.logger.info(f"{csv_name} is unchanged, keeping the loaded DataFrame")
+            else:
+                df = self._load_dataset(csv_name, csv_file_path, digest)
+                self.data_cache[csv_name] = df
+                self._build_index(csv_name, df)
 
-                for course_code, group in df.groupby("course_code"):
-                    raw_sections = group.drop(columns=["course_code"]).fillna("").to_dict(orient="records")
-                    formatted_sections = self.format_course_schedule_response(raw_sections)  
-                    get_redis_client().set(course_code, json.dumps(formatted_sections))
-                
+            if csv_name == "course_schedule":
+                if unchanged and self._get_ingested_digest() == digest:
+                    self.logger.info(f"{csv_name} is unchanged and already stored in Redis, skipping ingestion")
+                else:
+                    self._store_course_schedules(self.data_cache[csv_name], digest)
 
+        self._write_dataset_metadata(metadata)
         self.logger.info("All datasets downloaded and cached successfully.")
 
+    def load_cached_datasets(self) -> bool:
+        """
+        Loads the datasets left in cache_dir by a previous download_datasets run, without any network access.
+        Returns True if every dataset could be loaded.
+        """
+        metadata = self._read_dataset_metadata()
+        loaded = True
+        for csv_name in CSV_SOURCES:
+            csv_file_path = os.path.join(self.cache_dir, f"{csv_name}.csv")
+            if not os.path.exists(csv_file_path):
+                loaded = False
+                continue
+            try:
+                df = self._load_dataset(csv_name, csv_file_path, metadata.get(csv_name, {}).get("sha256"))
+            except Exception as e:
+                self.logger.warning(f"Failed to load cached {csv_name}: {e}")
+                loaded = False
+                continue
+            self.data_cache[csv_name] = df
+            self._build_index(csv_name, df)
+        return loaded
+
+    def _load_dataset(self, csv_name, csv_file_path, digest):
+        """
+        Loads a dataset from its memory-mapped Arrow IPC copy when that copy was built from the same CSV
+        (by sha256), otherwise parses the UTF-16 CSV and writes a fresh Arrow copy for the next startup.
+        """
+        arrow_file_path = os.path.join(self.cache_dir, f"{csv_name}.arrow")
+        if digest:
+            df = self._read_arrow_cache(arrow_file_path, digest)
+            if df is not None:
+                self.logger.info(f"Loaded {csv_name} from Arrow cache {arrow_file_path}")
+                return df
+
+        self.logger.info(f"Loading {csv_name} into DataFrame...")
+        df = pd.read_csv(csv_file_path, engine="pyarrow", encoding="utf-16")
+        if digest:
+            self._write_arrow_cache(df, arrow_file_path, digest)
+        return df
+
+    def _read_arrow_cache(self, arrow_file_path, digest):
+        if not os.path.exists(arrow_file_path):
+            return None
+        try:
+            with pa.memory_map(arrow_file_path, "r") as source:
+                reader = pa.ipc.open_file(source)
+                if (reader.schema.metadata or {}).get(ARROW_SOURCE_DIGEST_KEY) != digest.encode():
+                    return None
+                return reader.read_all().to_pandas()
+        except (pa.ArrowException, OSError) as e:
+            self.logger.warning(f"Ignoring unreadable Arrow cache {arrow_file_path}: {e}")
+            return None
+
+    def _write_arrow_cache(self, df, arrow_file_path, digest):
+        tmp_path = f"{arrow_file_path}.tmp"
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), ARROW_SOURCE_DIGEST_KEY: digest.encode()})
+            # Uncompressed so later startups can memory-map the file instead of decoding it
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, arrow_file_path)
+        except (pa.ArrowException, OSError) as e:
+            self.logger.warning(f"Failed to write Arrow cache {arrow_file_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _store_course_schedules(self, df, digest):
+        self.logger.info("Storing course_schedule in Redis by course code...")
+        df["course_code"] = df["Subject"].str.strip() + df[CATALOG_NBR].astype(str).str.strip()
+
+        self.update_redis_incrementally(self.iter_course_schedule_json(df, key_column="course_code"))
+        if digest:
+            get_redis_client().set(SCHEDULE_DIGEST_KEY, digest)
+        else:
+            get_redis_client().delete(SCHEDULE_DIGEST_KEY)
+
+    def has_datasets(self) -> bool:
+        """True once every dataset is loaded, from a download or from the cache of a previous run."""
+        return all(csv_name in self.data_cache for csv_name in CSV_SOURCES)
+
+    def get_dataset_version(self) -> Optional[str]:
+        """Identifies the datasets on disk by their content hashes, or None if one of them has no recorded hash."""
+        metadata = self._read_dataset_metadata()
+        digests = [metadata.get(csv_name, {}).get("sha256") for csv_name in CSV_SOURCES]
+        if not all(digests):
+            return None
+        return hashlib.sha256("".join(digests).encode()).hexdigest()[:16]
+
+    def _get_ingested_digest(self):
+        value = get_redis_client().get(SCHEDULE_DIGEST_KEY)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _get_dataset_metadata_path(self):
+        return os.path.join(self.cache_dir, DATASET_METADATA_FILENAME)
+
+    def _read_dataset_metadata(self) -> dict:
+        try:
+            with open(self._get_dataset_metadata_path(), "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_dataset_metadata(self, metadata: dict) -> None:
+        try:
+            with open(self._get_dataset_metadata_path(), "w") as f:
+                json.dump(metadata, f)
+        except OSError as e:
+            self.logger.warning(f"Could not save dataset metadata: {e}")
+
+    def write_to_redis(self, items, chunk_size: Optional[int] = None, atomic_swap: Optional[bool] = None,
+                       finish: Optional[Callable[[Any], None]] = None) -> int:
+        """
+        Writes (key, value) pairs to Redis with pipelined SETs of chunk_size commands per round trip.
+        With atomic_swap, the values are first written under a versioned staging prefix and then renamed
+        onto the live keys in a single MULTI/EXEC transaction.
+        finish(pipe) can queue more commands (deletes, digest updates) on that same transaction, run after every
+        value is written, so they take effect together with the new values.
+        Returns the number of keys written.
+        """
+        chunk_size = chunk_size or REDIS_WRITE_CHUNK_SIZE
+        atomic_swap = REDIS_ATOMIC_SWAP if atomic_swap is None else atomic_swap
+        client = get_redis_client()
+        prefix = f"{REDIS_STAGING_PREFIX}:{int(time.time())}-{uuid.uuid4().hex[:8]}:" if atomic_swap else ""
+
+        start = time.perf_counter()
+        keys = []
+        pipe = client.pipeline(transaction=False)
+        try:
+            pending = 0
+            for key, value in items:
+                pipe.set(prefix + key, value)
+                keys.append(key)
+                pending += 1
+                if pending >= chunk_size:
+                    pipe.execute()
+                    pending = 0
+            if pending:
+                pipe.execute()
+
+            if (atomic_swap and keys) or finish:
+                swap = client.pipeline(transaction=True)
+                if atomic_swap:
+                    for key in keys:
+                        swap.rename(prefix + key, key)
+                if finish:
+                    finish(swap)
+                swap.execute()
+        except Exception:
+            if atomic_swap and keys:
+                self._delete_keys(client, [prefix + key for key in keys], chunk_size)
+            raise
+
+        elapsed = time.perf_counter() - start
+        rate = len(keys) / elapsed if elapsed > 0 else float(len(keys))
+        self.logger.info(f"Stored {len(keys)} keys in Redis in {elapsed:.2f}s ({rate:.0f} keys/sec, chunk size {chunk_size}, atomic swap {'on' if atomic_swap else 'off'})")
+        return len(keys)
+
+    def update_redis_incrementally(self, items, chunk_size: Optional[int] = None) -> dict:
+        """
+        Writes only the (key, value) pairs whose value changed since the last update and deletes the keys
+        that are no longer present, using the per-key digests kept in the COURSE_DIGESTS_KEY hash. The deletes
+        and digest updates go in the transaction that publishes the values (see write_to_redis). Without any
+        digests, everything is rewritten and leftover course keys are found by a SCAN.
+        Returns the added/changed/removed/unchanged counts.
+        """
+        chunk_size = chunk_size or REDIS_WRITE_CHUNK_SIZE
+        client = get_redis_client()
+        previous = {k.decode(): v.decode() for k, v in client.hgetall(COURSE_DIGESTS_KEY).items()}
+        updated_digests = {}
+        seen = set()
+        counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+
+        def changed_items():
+            for key, value in items:
+                seen.add(key)
+                value_digest = hashlib.blake2b(value if isinstance(value, bytes) else value.encode(), digest_size=16).hexdigest()
+                old_digest = previous.get(key)
+                if old_digest == value_digest:
+                    counts["unchanged"] += 1
+                    continue
+                counts["added" if old_digest is None else "changed"] += 1
+                updated_digests[key] = value_digest
+                yield key, value
+
+        def queue_removals_and_digests(pipe):
+            # Runs once every item was seen; digests are only recorded along with their values,
+            # so a failed write is retried on the next run
+            if previous:
+                removed = [key for key in previous if key not in seen]
+            else:
+                removed = sorted(self._find_course_keys(client, chunk_size) - seen)
+            counts["removed"] = len(removed)
+            updated = list(updated_digests.items())
+            for i in range(0, len(updated), chunk_size):
+                pipe.hset(COURSE_DIGESTS_KEY, mapping=dict(updated[i:i + chunk_size]))
+            for i in range(0, len(removed), chunk_size):
+                pipe.delete(*removed[i:i + chunk_size])
+                pipe.hdel(COURSE_DIGESTS_KEY, *removed[i:i + chunk_size])
+
+        self.write_to_redis(changed_items(), chunk_size=chunk_size, finish=queue_removals_and_digests)
+
+        self.logger.info(
+            f"Incremental Redis update: {counts['added']} added, {counts['changed']} changed, "
+            f"{counts['removed']} removed, {counts['unchanged']} unchanged"
+        )
+        return counts
+
+    def _find_course_keys(self, client, chunk_size) -> set:
+        keys = set()
+        for key in client.scan_iter(match=COURSE_CODE_KEY_PATTERN, count=chunk_size):
+            key = key.decode() if isinstance(key, bytes) else key
+            if COURSE_CODE_KEY_REGEX.fullmatch(key):
+                keys.add(key)
+        return keys
+
+    def _delete_keys(self, client, keys, chunk_size):
+        try:
+            for i in range(0, len(keys), chunk_size):
+                client.delete(*keys[i:i + chunk_size])
+        except Exception as e:
+            self.logger.error(f"Failed to clean up staged Redis keys: {e}")
+
     def get_course_schedule(self, subject, catalog):
         response = self._get_from_csv("course_schedule", subject=subject, catalog=catalog)
         return self.format_course_schedule_response(response)
@@ -77,54 +397,50 @@ class ConcordiaAPIUtils:
 
         formatted_courses = []
         for course in response:
-            formatted_course = {
-                "courseID": str(course.get("Course ID", "")).zfill(6),  # Pad with leading zeros to 6 digits
-                "termCode": course.get("Term Code", ""),
-                "session": course.get("Session", ""),
-                "subject": course.get("Subject", ""),
-                "catalog": course.get(CATALOG_NBR, ""),
-                "section": course.get("Section", ""),
-                "componentCode": course.get("Component Code", ""),
-                "componentDescription": course.get("Component Descr", ""),
-                "classNumber": course.get("Class Nbr", ""),
-                "classAssociation": course.get("Class Association", ""),
-                "courseTitle": course.get("Course Title", ""),
-                "topicID": course.get("Topic ID", ""),
-                "topicDescription": course.get("Topic Descr", ""),
-                "classStatus": course.get("Class Status", ""),
-                "locationCode": course.get("Location Code", ""),
-                "instructionModeCode": course.get("Instruction Mode code", ""),
-                "instructionModeDescription": course.get("Instruction Mode Descr", ""),
-                "meetingPatternNumber": course.get("Meeting Pattern Nbr", ""),
-                "roomCode": course.get("Room Code", ""),
-                "buildingCode": course.get("Building Code", ""),
-                "room": course.get("Room", ""),
-                "classStartTime": course.get("Class Start Time", ""),
-                "classEndTime": course.get("Class End Time", ""),
-                "mondays": course.get("Mon", ""),
-                "tuesdays": course.get("Tues", ""),
-                "wednesdays": course.get("Wed", ""),
-                "thursdays": course.get("Thurs", ""),
-                "fridays": course.get("Fri", ""),
-                "saturdays": course.get("Sat", ""),
-                "sundays": course.get("Sun", ""),
-                "classStartDate": course.get("Start Date (DD/MM/YYYY)", ""),
-                "classEndDate": course.get("End Date (DD/MM/YYYY)", ""),
-                "career": course.get("Career", ""),
-                "departmentCode": course.get("Dept. Code", ""),
-                "departmentDescription": course.get("Dept. Descr", ""),
-                "facultyCode": course.get("Faculty Code", ""),
-                "facultyDescription": course.get("Faculty Descr", ""),
-                "enrollmentCapacity": course.get("Enrollment Capacity", ""),
-                "currentEnrollment": course.get("Current Enrollment", ""),
-                "waitlistCapacity": course.get("Waitlist Capacity", ""),
-                "currentWaitlistTotal": course.get("Current Waitlist Total", ""),
-                "hasSeatReserved": course.get("Has some/all seats reserved?", "")
-            }
+            formatted_course = {key: course.get(column, "") for key, column in SCHEDULE_COLUMNS.items()}
+            formatted_course["courseID"] = str(formatted_course["courseID"]).zfill(6)  # Pad with leading zeros to 6 digits
             formatted_courses.append(formatted_course)
         
         return formatted_courses
 
+    def format_course_schedule_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Columnar equivalent of format_course_schedule_response: selects, renames and pads the
+        schedule columns of the whole DataFrame at once instead of building a dict per row.
+        """
+        formatted = df.reindex(columns=list(SCHEDULE_COLUMNS.values())).fillna("")
+        formatted.columns = list(SCHEDULE_COLUMNS.keys())
+        formatted["courseID"] = formatted["courseID"].astype(str).str.zfill(6)  # Pad with leading zeros to 6 digits
+        return formatted
+
+    def iter_course_schedule_json(self, df: pd.DataFrame, key_column: str = "course_code", batch_rows: int = SCHEDULE_JSON_BATCH_ROWS):
+        """
+        Yields (key, JSON bytes) for each group of rows sharing the same key_column value, in key order.
+        Groups are formatted and serialized a batch of about batch_rows rows at a time, and each
+        group's JSON array is assembled from the pre-encoded rows of its batch.
+        """
+        groups = df.groupby(key_column, sort=True).indices
+        batch = []
+        batch_size = 0
+        for key, positions in groups.items():
+            batch.append((key, positions))
+            batch_size += len(positions)
+            if batch_size >= batch_rows:
+                yield from self._encode_schedule_batch(df, batch)
+                batch = []
+                batch_size = 0
+        if batch:
+            yield from self._encode_schedule_batch(df, batch)
+
+    def _encode_schedule_batch(self, df, batch):
+        positions = np.concatenate([group_positions for _, group_positions in batch])
+        rows = self.format_course_schedule_frame(df.iloc[positions]).to_json(orient="records", lines=True).splitlines()
+        offset = 0
+        for key, group_positions in batch:
+            end = offset + len(group_positions)
+            yield key, ("[" + ",".join(rows[offset:end]) + "]").encode()
+            offset = end
+
     def get_term(self, course_code):
         subject_and_catalog = course_code.split()
         terms = []
@@ -135,21 +451,36 @@ class ConcordiaAPIUtils:
             response = self._get_from_csv("course_schedule", subject=subject_and_catalog[0], catalog=subject_and_catalog[1])
 
         for dict in response:
-            term_int = int(dict["Term Code"])
-            for i in range(3):
-                term_int = term_int % pow(10, 3-i)
-            
-            terms.append(TERM[term_int])
-        
-        # Sort terms with custom priority, then keep any others afterward.
-        custom_term_order = {
-            "Fall": 0,
-            "Fall/Winter": 1,
-            "Winter": 2,
-            "Summer": 3,
-        }
-        sorted_terms = sorted(set(terms), key=lambda x: (custom_term_order.get(x, 99), x))
-        return sorted_terms
+            # The last digit of the term code identifies the term
+            terms.append(TERM[int(dict["Term Code"]) % 10])
+
+        return sort_terms(terms)
+
+    def get_terms_for_all_courses(self) -> dict[str, list[str]]:
+        """
+        Computes the offeredIn terms of every course code (e.g. "COMP 248") in one pass over the datasets.
+        Equivalent to calling get_term for each course, including the course_section -> course_schedule fallback.
+        """
+        section = self._get_course_term_digits("course_section")
+        schedule = self._get_course_term_digits("course_schedule")
+        # Fall back to course_schedule only for courses with no rows in course_section
+        schedule = schedule[~schedule["course_code"].isin(section["course_code"])]
+
+        pairs = pd.concat([section, schedule], ignore_index=True)
+        pairs = pairs[pairs["term"].between(0, len(TERM) - 1)].astype({"term": "int64"}).drop_duplicates()
+        term_digits = pairs["term"].to_numpy()
+        pairs = pairs.assign(rank=TERM_RANK[term_digits], term=np.asarray(TERM, dtype=object)[term_digits])
+        pairs = pairs.sort_values(["course_code", "rank"], kind="stable")
+        return pairs.groupby("course_code", sort=False)["term"].agg(list).to_dict()
+
+    def _get_course_term_digits(self, csv_name) -> pd.DataFrame:
+        df = self.data_cache.get(csv_name)
+        if df is None or not {"Subject", CATALOG_NBR, "Term Code"}.issubset(df.columns):
+            return pd.DataFrame({"course_code": pd.Series(dtype=object), "term": pd.Series(dtype="float64")})
+
+        course_codes = df["Subject"].astype(str).str.strip() + " " + df[CATALOG_NBR].astype(str).str.strip()
+        term_codes = pd.to_numeric(df["Term Code"], errors="coerce")
+        return pd.DataFrame({"course_code": course_codes, "term": term_codes % 10})
 
     def _sanitize_data(self, data):
         if isinstance(data, list):
@@ -167,19 +498,34 @@ class ConcordiaAPIUtils:
         else:
             return str(data) if data is not None and not pd.isna(data) else ""
 
+    def _build_index(self, csv_name, df):
+        """Index the rows of a dataset by (Subject, Catalog Nbr) so lookups don't scan the whole DataFrame."""
+        if "Subject" in df.columns and CATALOG_NBR in df.columns:
+            index = df.groupby(["Subject", CATALOG_NBR], sort=False).indices
+        else:
+            index = {}
+        self.data_index[csv_name] = (df, index)
+        return index
+
+    def _get_index(self, csv_name):
+        df = self.data_cache.get(csv_name)
+        entry = self.data_index.get(csv_name)
+        # Rebuild if the cached DataFrame was replaced since the index was built
+        if entry is None or entry[0] is not df:
+            return self._build_index(csv_name, df)
+        return entry[1]
+
     def _get_from_csv(self, csv_name, subject=None, catalog=None):
         df = self.data_cache.get(csv_name)
 
-        if subject is not None and catalog is not None:
-            matches = df[(df["Subject"] == subject) & 
-                        (df[CATALOG_NBR] == catalog)]
-        else:
-            matches = pd.DataFrame()
+        if df is None or subject is None or catalog is None:
+            return []
 
-        if matches.empty:
+        positions = self._get_index(csv_name).get((subject, catalog))
+        if positions is None or len(positions) == 0:
             return []
 
-        records = matches.to_dict('records')
+        records = df.iloc[positions].to_dict('records')
         return self._sanitize_data(records)
 
 concordia_api_instance: Optional[ConcordiaAPIUtils] = None
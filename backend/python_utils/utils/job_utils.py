@@ -0,0 +1,161 @@
+"""
+JobUtils - Background jobs for long-running scrapes.
+Job state and results are kept as files in the cache directory, so any worker sharing it can report on a job
+and finished jobs survive a restart.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from typing import Any, Callable, Optional
+from .web_utils import get_request_count
+from .logging_utils import get_logger
+
+JOBS_DIRNAME = "jobs"
+JOB_HEARTBEAT_SECONDS = 10
+# A queued/running job whose state has not been touched for this long lost its worker (restart, crash...)
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "120"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(24 * 60 * 60)))
+ACTIVE_JOB_STATUSES = ("queued", "running")
+JOB_ID_REGEX = re.compile(r"^[0-9a-f]{32}$")
+
+logger = get_logger("JobUtils")
+
+class JobStore:
+    """
+    Runs scrape jobs in background threads and persists their state to {cache_dir}/jobs/{id}.json:
+      - status: queued -> running -> succeeded | failed
+      - progress: counters reported by the job, plus pagesFetched (requests made by this worker while the job ran)
+      - result: written to {id}.result.json once the job succeeds
+    """
+
+    def __init__(self, cache_dir: str):
+        self.jobs_dir = os.path.join(cache_dir, JOBS_DIRNAME)
+        self._lock = threading.Lock()
+
+    def start_job(self, job_type: str, run: Callable[[Callable[..., None]], Any]) -> dict:
+        """
+        Starts run(report_progress) in a background thread and returns the job state. An active job of the same
+        type is returned instead of starting a second one.
+        run must return JSON-serializable data or already encoded JSON bytes, and may call report_progress(**counters) as it goes.
+        """
+        with self._lock:
+            active = self.find_active_job(job_type)
+            if active:
+                return active
+            self.cleanup_expired_jobs()
+            now = time.time()
+            job = {
+                "id": uuid.uuid4().hex,
+                "type": job_type,
+                "status": "queued",
+                "progress": {"pagesFetched": 0},
+                "error": None,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+            self._write_state(job)
+            snapshot = json.loads(json.dumps(job))
+
+        threading.Thread(target=self._run_job, args=(job, run), daemon=True, name=f"job-{job['id'][:8]}").start()
+        return snapshot
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        if not JOB_ID_REGEX.match(job_id):
+            return None
+        try:
+            with open(self._state_path(job_id), "r") as f:
+                job = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if job["status"] in ACTIVE_JOB_STATUSES and time.time() - job["updatedAt"] > JOB_STALE_SECONDS:
+            job.update(status="failed", error="Job was interrupted", updatedAt=time.time())
+            self._write_state(job)
+        return job
+
+    def get_result_path(self, job_id: str) -> Optional[str]:
+        if not JOB_ID_REGEX.match(job_id):
+            return None
+        path = self._result_path(job_id)
+        return path if os.path.exists(path) else None
+
+    def find_active_job(self, job_type: str) -> Optional[dict]:
+        for job in self._list_jobs():
+            if job["type"] == job_type and job["status"] in ACTIVE_JOB_STATUSES:
+                return job
+        return None
+
+    def cleanup_expired_jobs(self) -> None:
+        for job in self._list_jobs():
+            if job["status"] not in ACTIVE_JOB_STATUSES and time.time() - job["updatedAt"] > JOB_RETENTION_SECONDS:
+                for path in (self._state_path(job["id"]), self._result_path(job["id"])):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+    def _run_job(self, job: dict, run: Callable[[Callable[..., None]], Any]) -> None:
+        start_requests = get_request_count()
+        stop_heartbeat = threading.Event()
+
+        def update(**fields):
+            with self._lock:
+                job["progress"]["pagesFetched"] = get_request_count() - start_requests
+                job.update(fields, updatedAt=time.time())
+                self._write_state(job)
+
+        def report_progress(**counters):
+            with self._lock:
+                job["progress"].update(counters)
+            update()
+
+        def heartbeat():
+            while not stop_heartbeat.wait(JOB_HEARTBEAT_SECONDS):
+                update()
+
+        update(status="running")
+        threading.Thread(target=heartbeat, daemon=True).start()
+        try:
+            result = run(report_progress)
+            self._write_json(self._result_path(job["id"]), result)
+            update(status="succeeded")
+            logger.info(f"Job {job['id']} ({job['type']}) succeeded: {job['progress']}")
+        except Exception as e:
+            logger.error(f"Job {job['id']} ({job['type']}) failed: {e}")
+            update(status="failed", error=str(e))
+        finally:
+            stop_heartbeat.set()
+
+    def _list_jobs(self) -> list[dict]:
+        try:
+            names = os.listdir(self.jobs_dir)
+        except FileNotFoundError:
+            return []
+        jobs = []
+        for name in names:
+            job_id, ext = os.path.splitext(name)
+            if ext == ".json" and JOB_ID_REGEX.match(job_id):
+                job = self.get_job(job_id)
+                if job:
+                    jobs.append(job)
+        return jobs
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _result_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.result.json")
+
+    def _write_state(self, job: dict) -> None:
+        self._write_json(self._state_path(job["id"]), job)
+
+    def _write_json(self, path: str, data: Any) -> None:
+        # Readers in other workers only ever see a complete file
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data if isinstance(data, bytes) else json.dumps(data).encode())
+        os.replace(tmp_path, path)
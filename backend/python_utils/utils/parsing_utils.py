@@ -8,36 +8,34 @@ from models import (Rule, RuleType,
                     MinCoursesFromSetParams, MaxCoursesFromSetParams,
                     CourseAdditionParams, CourseRemovalParams, CourseSubstitutionParams, MinCreditsCompletedParams,
                     OverrideCoursePoolCoursesParams)
+from utils.regex_utils import (COURSE_RE, COURSE_SORT_KEY_RE, COURSE_SHORTHAND_RE, TITLE_RE, SENTENCE_SPLIT_RE,
+                               OR_WORD_RE, OR_SPLIT_RE, ELIGIBILITY_RE, MINIMUM_CREDITS_RE,
+                               normalize_spacing, normalize_punctuation)
 
-SPACE_REPLACEMENT = r'\1 \2'
 REGEX_ALL = r".*"
 REGEX_NONE = r"a^"  # regex to match nothing
-TITLE_REGEX = r"^(.*)\((\d+(?:\.\d+)?) credits\)"
-COURSE_REGEX = r'[A-Z]{3,4}\s+\d{3,4}'
+TITLE_REGEX = TITLE_RE.pattern
+COURSE_REGEX = COURSE_RE.pattern
 CATALOG_COURSE_TITLE_REGEX = rf'^({COURSE_REGEX})\s+(.+?)\s*\(\s*(\d+(?:\.\d+)?)\s*credits\s*\)$'
-EM_DASH_PLACEHOLDER = "EM_DASH"
+EM_DASH = '–'
 
 # Helper functions for parsing course data
 def clean_text(text):
     if not text:
         return ""
 
-    text = re.sub(r'\s+', ' ', text)  # Collapse multiple spaces into one
+    # Collapse whitespace, and space out letters and numbers
+    text = normalize_spacing(text)
     # Fix specific degree abbreviations
     text = text.replace('B Eng', 'BEng')
     text = text.replace('B Comp Sc', 'BCompSc')
-    text = re.sub(r'([a-zA-Z])(\d)', SPACE_REPLACEMENT, text)  # Space between letters and numbers
-    text = re.sub(r'(\d)([a-zA-Z])', SPACE_REPLACEMENT, text)  # Space between numbers and letters
-    text = text.replace('–', EM_DASH_PLACEHOLDER)  # Temporarily replace em-dash
-    text = unidecode(text) # Convert ALL unicode characters to ASCII equivalents
-    text = text.replace(EM_DASH_PLACEHOLDER, '–')  # Restore em-dash
-    text = text.replace("--", "–")  # Replace double hyphens with em-dash
-    text = re.sub(r'(\d+)\s*\.\s*(?=\d)', r'\1.', text)  # Remove spaces around dots when followed by digits
-    # Single space after punctuation, but exclude dots between numbers
-    text = re.sub(r'\s*([,:;])\s*', r'\1 ', text)  # Comma, colon, semicolon
-    text = re.sub(r'\s*(\.)(?!\d)\s*', r'\1 ', text)  # Dot not followed by digit
-    text = re.sub(r'\s+', ' ', text.strip())  # Final cleanup
-    return text
+    if not text.isascii():
+        # Convert ALL unicode characters to ASCII equivalents, except em-dashes
+        text = EM_DASH.join(map(unidecode, text.split(EM_DASH)))
+    text = text.replace("--", EM_DASH)  # Replace double hyphens with em-dash
+    # No spaces around dots between numbers, single space after other punctuation
+    text = normalize_punctuation(text)
+    return ' '.join(text.split())  # Final cleanup
 
 def extract_name_and_credits(title_element):
     """
@@ -48,7 +46,7 @@ def extract_name_and_credits(title_element):
         return None, 0
     
     title_text = "".join(title_element.stripped_strings)
-    match = re.match(TITLE_REGEX, title_text)
+    match = TITLE_RE.match(title_text)
     if match:
         name = match.group(1).strip()
         total_credits = float(match.group(2)) if '.' in match.group(2) else int(match.group(2))
@@ -62,7 +60,7 @@ def parse_course_title_and_credits(title_element):
     example: 'ELEC 342 Digital Systems Design (3 credits)' or 'BTM 200 Fundamentals of Information Technology (3 credits)'
     """
     name, course_credits = extract_name_and_credits(title_element)
-    course_id_match = re.match(COURSE_REGEX, name)
+    course_id_match = COURSE_RE.match(name)
     if course_id_match:
         course_id = course_id_match.group(0)
         title = name[len(course_id):].strip()
@@ -101,24 +99,25 @@ def expand_course_shorthand(match):
     number_only = match.group(2)  # e.g., "364"
     return f"{full_course} or {dept} {number_only}"
 
+_PREREQ_COREQ_PATTERNS = [
+    # (pattern, action)
+    (re.compile(r'must be completed? previously or concurrently[: ]+([^.]+)', re.I), lambda m: (None, None, m)),
+    (re.compile(r'must be completed? previously[: ]+([^.]+)', re.I), lambda m: (m, None, None)),
+    (re.compile(r'must be completed? concurrently[: ]+([^.]+)', re.I), lambda m: (None, m, None)),
+    (re.compile(r'by passing ([A-Z]{4}\s+\d{3})', re.I), lambda m: (m, None, None)),
+    (re.compile(r'must complete.*?including the following courses?[: ]+([^.]+)', re.I), lambda m: (m, None, None)),
+]
+
 def extract_prereq_coreq_from_sentence(sentences):
     prereq_parts = []
     coreq_parts = []
     prereq_or_coreq_parts = []
-    patterns = [
-        # (pattern, action)
-        (r'must be completed? previously or concurrently[: ]+([^.]+)', lambda m: (None, None, m)),
-        (r'must be completed? previously[: ]+([^.]+)', lambda m: (m, None, None)),
-        (r'must be completed? concurrently[: ]+([^.]+)', lambda m: (None, m, None)),
-        (r'by passing ([A-Z]{4}\s+\d{3})', lambda m: (m, None, None)),
-        (r'must complete.*?including the following courses?[: ]+([^.]+)', lambda m: (m, None, None)),
-    ]
     for sentence in sentences:
         sentence = sentence.strip()
         if not sentence:
             continue
-        for pat, act in patterns:
-            match = re.search(pat, sentence, re.I)
+        for pat, act in _PREREQ_COREQ_PATTERNS:
+            match = pat.search(sentence)
             if match:
                 course_text = clean_text(match.group(1))
                 if course_text:
@@ -138,13 +137,13 @@ def parse_prereq_coreq(text):
         return "", "", ""
         
     # Split the text by sentences (periods followed by capital letters or end)
-    sentences = re.split(r'\.\s*(?=[A-Z]|$)', text)
+    sentences = SENTENCE_SPLIT_RE.split(text)
     prereq_parts, coreq_parts, prereq_or_coreq_parts = extract_prereq_coreq_from_sentence(sentences)
  
     # if no previously/concurrently patterns found, assume all are prerequisites
     if not prereq_parts and not coreq_parts and not prereq_or_coreq_parts:
         # Avoid adding eligibility statements as prerequisites (see ENGR 490)
-        if not re.search(r'must be eligible to register in[: ]+([^:]+)', text, re.I):
+        if not ELIGIBILITY_RE.search(text):
             prereq_parts.append(text)
 
     # Join all parts with semicolons to separate different requirements
@@ -158,9 +157,8 @@ def make_prereq_coreq_into_array(s):
         return []
 
     # Expand course shorthands iteratively to handle multiple consecutive cases
-    pattern = r'(' + COURSE_REGEX + r')\s+or\s+(\d{3})'
     while True:
-        new_s = re.sub(pattern, expand_course_shorthand, s)
+        new_s = COURSE_SHORTHAND_RE.sub(expand_course_shorthand, s)
         if new_s == s:  # No changes made
             break
         s = new_s
@@ -171,7 +169,7 @@ def make_prereq_coreq_into_array(s):
     result = []
     
     for main_group in main_groups:
-        all_courses = re.findall(COURSE_REGEX, main_group)
+        all_courses = COURSE_RE.findall(main_group)
 
         if not all_courses:
             continue
@@ -180,20 +178,20 @@ def make_prereq_coreq_into_array(s):
         comma_parts = [part.strip() for part in main_group.split(',') if part.strip()]
 
         for comma_part in comma_parts:
-            part_courses = re.findall(COURSE_REGEX, comma_part)
+            part_courses = COURSE_RE.findall(comma_part)
 
             if not part_courses:
                 continue
 
             # Check if this part contains 'or' keywords (alternatives within this requirement)
-            if re.search(r'\bor\b', comma_part, re.I):
+            if OR_WORD_RE.search(comma_part):
                 # Split by 'or' to find alternatives
-                or_parts = re.split(r'\s+or\s+', comma_part, flags=re.I)
+                or_parts = OR_SPLIT_RE.split(comma_part)
                 alternatives = []
 
                 for or_part in or_parts:
                     # Find courses in this part
-                    or_part_courses = re.findall(COURSE_REGEX, or_part)
+                    or_part_courses = COURSE_RE.findall(or_part)
                     alternatives.extend(or_part_courses)
 
                 if alternatives:
@@ -214,14 +212,14 @@ def get_not_taken(s):
     if "not take this course for credit" not in s:
         return []
     
-    tokens = re.findall(COURSE_REGEX, s)
+    tokens = COURSE_RE.findall(s)
     # remove duplicates while preserving order
     seen = set()
     tokens = [x for x in tokens if not (x in seen or seen.add(x))]
     return tokens
 
 def parse_minimum_credits(s):
-    match = re.search(r'Students must (?:have )?complet(?:e|ed) (?:(?:a )?minimum (?:of )?)?(\d+(?:\.\d+)?) credits', s, re.I)
+    match = MINIMUM_CREDITS_RE.search(s)
     if match:
         return float(match.group(1))
     return 0.0
@@ -282,7 +280,7 @@ def parse_course_components(component_text: str) -> list[str]:
     return components
 
 def get_course_sort_key(course_id: str):
-    match = re.fullmatch(r'([A-Z]{3,4})\s+(\d{3,4})', course_id.strip())
+    match = COURSE_SORT_KEY_RE.fullmatch(course_id.strip())
     if match:
         dept = match.group(1)
         course_num = match.group(2)
@@ -393,7 +391,7 @@ def parse_coursepool_rules(coursepool_notes: str) -> list[Rule]:
         re.I
     )
     for m in no_more_one_of_re.finditer(coursepool_notes):
-        courses = re.findall(COURSE_REGEX, m.group(1))
+        courses = COURSE_RE.findall(m.group(1))
         if courses:
             msg = "Students may take no more than one of the following courses: " + ", ".join(courses) + "."
             rules.append(Rule(
@@ -412,7 +410,7 @@ def parse_coursepool_rules(coursepool_notes: str) -> list[Rule]:
     for m in cannot_credit_re.finditer(coursepool_notes):
         for pair_text in m.group(1).split(';'):
             pair_text = pair_text.strip()
-            courses = re.findall(COURSE_REGEX, pair_text)
+            courses = COURSE_RE.findall(pair_text)
             if len(courses) >= 2:
                 msg = "Students may take no more than one of the following courses: " + ", ".join(courses) + "."
                 rules.append(Rule(
@@ -431,7 +429,7 @@ def parse_coursepool_rules(coursepool_notes: str) -> list[Rule]:
     )
     for m in min_courses_re.finditer(coursepool_notes):
         count_str = m.group(1)
-        courses = sorted(re.findall(COURSE_REGEX, m.group(2)), key=get_course_sort_key)
+        courses = sorted(COURSE_RE.findall(m.group(2)), key=get_course_sort_key)
         if courses:
             min_count = _word_or_num_to_int(count_str)
             msg = (f"Students must take at least {count_str} courses from the following list: "
@@ -452,7 +450,7 @@ def parse_coursepool_rules(coursepool_notes: str) -> list[Rule]:
     )
     for m in max_courses_list_re.finditer(coursepool_notes):
         count_str = m.group(1)
-        courses = sorted(re.findall(COURSE_REGEX, m.group(2)), key=get_course_sort_key)
+        courses = sorted(COURSE_RE.findall(m.group(2)), key=get_course_sort_key)
         if courses:
             max_count = _word_or_num_to_int(count_str)
             msg = (f"Students may take no more than {count_str} course from the following list: "
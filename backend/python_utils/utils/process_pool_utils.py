@@ -0,0 +1,127 @@
+"""
+ProcessPoolUtils - Pre-warmed pool of worker processes for CPU-bound request work.
+Request threads hand a task to the pool and wait on its result, so the pure-Python work runs in parallel
+across cores instead of holding the GIL of the web worker.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, Optional
+from .logging_utils import get_logger
+
+logger = get_logger("ProcessPoolUtils")
+
+def _warm_up_worker(*modules: str) -> None:
+    # Import the task modules (and their native libraries) before the first real task arrives
+    for module in modules:
+        __import__(module)
+
+class ProcessPool:
+    """
+    Runs tasks in up to size worker processes:
+      - size 0 runs every task inline in the calling thread
+      - at most size tasks are handed to the processes at once, other callers wait for a free slot,
+        so a task's timeout only counts its own run time
+      - a task running longer than task_timeout raises TimeoutError; its worker is killed by restarting the pool,
+        and the tasks that were running next to it are retried once on the new pool
+      - each worker process is replaced after max_tasks_per_child tasks (0 = never)
+    """
+
+    def __init__(self, name: str, size: int, task_timeout: float, max_tasks_per_child: int, warm_up_modules=()):
+        self.name = name
+        self.size = max(0, size)
+        self.task_timeout = task_timeout
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.warm_up_modules = tuple(warm_up_modules)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, self.size))
+        self._executor = None
+        self._generation = 0
+
+    def start(self) -> None:
+        """Spawns the worker processes now instead of on the first task."""
+        if self.size:
+            self._current()
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Returns fn(*args) computed in a worker process. fn and args must be picklable."""
+        if not self.size:
+            return fn(*args)
+        with self._slots:
+            for attempt in range(2):
+                executor, generation = self._current()
+                try:
+                    return executor.submit(fn, *args).result(timeout=self.task_timeout)
+                except TimeoutError:
+                    logger.warning(f"{self.name} task timed out after {self.task_timeout}s, restarting the pool")
+                    self._restart(generation)
+                    raise
+                except BrokenProcessPool:
+                    # If the pool was already replaced, this task was killed along with another one that timed out
+                    # and is retried once. Otherwise a worker died while running it.
+                    killed_by_restart = not self._restart(generation)
+                    if attempt or not killed_by_restart:
+                        raise
+
+    def iter_results(self, fn: Callable[[Any], Any], items: Iterable[Any],
+                     ordered: bool = True) -> Iterator[tuple[int, Any, Optional[Exception]]]:
+        """
+        Yields (index, result, error) for fn(item) of every item, up to size running at once: in item order,
+        or as each one finishes when ordered is False. A failing item yields its exception instead of raising.
+        """
+        def call(item):
+            try:
+                return self.run(fn, item), None
+            except Exception as e:
+                return None, e
+
+        items = list(items)
+        if not self.size or len(items) <= 1:
+            for index, item in enumerate(items):
+                yield (index, *call(item))
+            return
+        executor = ThreadPoolExecutor(max_workers=min(self.size, len(items)), thread_name_prefix="process-pool-feed")
+        try:
+            futures = {executor.submit(call, item): index for index, item in enumerate(items)}
+            for future in (futures if ordered else as_completed(futures)):
+                yield (futures[future], *future.result())
+        finally:
+            # A consumer that stops early (e.g. a closed stream) does not wait for the remaining items
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _current(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            return self._executor, self._generation
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the web worker's threads and locks, and recycling requires it
+        executor = ProcessPoolExecutor(max_workers=self.size, mp_context=multiprocessing.get_context("spawn"),
+                                       max_tasks_per_child=self.max_tasks_per_child)
+        for _ in range(self.size):
+            executor.submit(_warm_up_worker, *self.warm_up_modules)
+        logger.info(f"Started {self.name} pool with {self.size} processes")
+        return executor
+
+    def _restart(self, generation: int) -> bool:
+        """Replaces the pool if it is still the given generation; returns False if it had already been replaced."""
+        with self._lock:
+            if generation != self._generation or self._executor is None:
+                return False
+            old = self._executor
+            self._executor = self._create_executor()
+            self._generation += 1
+        # ProcessPoolExecutor cannot cancel a running task, so its processes are killed directly
+        for process in list(getattr(old, "_processes", {}).values()):
+            process.terminate()
+        old.shutdown(wait=False, cancel_futures=True)
+        return True
@@ -0,0 +1,95 @@
+"""
+ResponseCache - Encoded response bodies of the catalog endpoints.
+Bodies are cached per endpoint key and catalog version, with their ETag and a lazily built gzip copy, so
+repeated requests skip sorting, serialization and compression until the catalog changes.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+from .logging_utils import get_logger
+
+GZIP_COMPRESS_LEVEL = 6
+
+logger = get_logger("ResponseCache")
+
+class CachedResponse:
+    def __init__(self, body: bytes, version: Hashable):
+        self.body = body
+        self.version = version
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self._gzip_body: Optional[bytes] = None
+        self._gzip_lock = threading.Lock()
+
+    @property
+    def gzip_body(self) -> bytes:
+        with self._gzip_lock:
+            if self._gzip_body is None:
+                self._gzip_body = gzip.compress(self.body, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+            return self._gzip_body
+
+class _KeyLock:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+class ResponseCache:
+    """
+    LRU of CachedResponse by key. An entry built for an older catalog version is rebuilt on its next
+    request; invalidate() drops everything. Concurrent requests for the same missing key wait for one build.
+    Per-key locks only exist while requests for the key are in flight, so keys whose build fails (unknown
+    degree names, say) leave nothing behind.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, _KeyLock] = {}
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable, get_version: Callable[[], Hashable], build: Callable[[], bytes]) -> CachedResponse:
+        """
+        Returns the cached body for key if it was built for the current get_version(), otherwise build()s it.
+        The version is read again after building, since building can itself load a new catalog (first scrape).
+        """
+        with self._lock:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = _KeyLock()
+            key_lock.users += 1
+        try:
+            with key_lock.lock:
+                entry = self._lookup(key, get_version())
+                if entry is not None:
+                    return entry
+                body = build()
+                entry = CachedResponse(body, get_version())
+                with self._lock:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return entry
+        finally:
+            with self._lock:
+                key_lock.users -= 1
+                if key_lock.users == 0:
+                    del self._key_locks[key]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        logger.info("Response cache invalidated")
+
+    def _lookup(self, key: Hashable, version: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+            self.stats["misses"] += 1
+            return None
@@ -0,0 +1,112 @@
+"""
+SharedCache - Catalog data shared by every worker process through Redis.
+Values live under versioned keys, and a Redis lock makes sure only one worker computes a missing value
+while the others wait for it and read the result. Without REDIS_URL, or while Redis is unreachable,
+values are simply computed locally.
+"""
+
+import os
+from typing import Any, Callable, Optional
+import redis
+from .concordia_api_utils import get_redis_client
+from .logging_utils import get_logger
+
+SHARED_CACHE_PREFIX = "catalog_cache"
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CATALOG_CACHE", "true").lower() in ("1", "true", "yes")
+# Expiry of the lock held while computing a value (so a crashed worker cannot hold it forever),
+# and how long other workers wait for that value before computing it themselves. Waiting happens on
+# request threads, so the wait stays below the gunicorn worker timeout (300s) to leave time to fall back
+SHARED_CACHE_LOCK_SECONDS = int(os.getenv("SHARED_CACHE_LOCK_SECONDS", "1800"))
+SHARED_CACHE_WAIT_SECONDS = int(os.getenv("SHARED_CACHE_WAIT_SECONDS", "240"))
+
+logger = get_logger("SharedCache")
+
+def is_shared_cache_enabled() -> bool:
+    return SHARED_CACHE_ENABLED and bool(os.getenv("REDIS_URL"))
+
+def get_shared_key(name: str) -> str:
+    return f"{SHARED_CACHE_PREFIX}:{name}"
+
+def get_shared_generation(name: str) -> int:
+    """Counter bumped by bump_shared_generation in any worker, e.g. to tell that shared values were invalidated."""
+    if not is_shared_cache_enabled():
+        return 0
+    try:
+        value = get_redis_client().get(get_shared_key(f"{name}:generation"))
+    except redis.RedisError as e:
+        logger.warning(f"Could not read shared generation {name}: {e}")
+        return 0
+    return int(value) if value else 0
+
+def bump_shared_generation(name: str) -> None:
+    if not is_shared_cache_enabled():
+        return
+    try:
+        get_redis_client().incr(get_shared_key(f"{name}:generation"))
+    except redis.RedisError as e:
+        logger.warning(f"Could not bump shared generation {name}: {e}")
+
+def delete_shared(name: str) -> None:
+    if not is_shared_cache_enabled():
+        return
+    try:
+        get_redis_client().delete(get_shared_key(name))
+    except redis.RedisError as e:
+        logger.warning(f"Could not delete shared value {name}: {e}")
+
+def get_or_compute_shared(
+    name: str,
+    compute: Callable[[], Any],
+    encode: Callable[[Any], bytes],
+    decode: Callable[[bytes], Any],
+    ttl: Optional[int] = None,
+    accept: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Returns the value shared under name, or compute()s and publishes it when it is missing (or not accept()ed).
+    Only one worker computes at a time; the others wait on the lock and then return what it published.
+    """
+    if not is_shared_cache_enabled():
+        return compute()
+
+    def read_shared():
+        payload = get_redis_client().get(get_shared_key(name))
+        if payload is None:
+            return None
+        value = decode(payload)
+        return value if accept is None or accept(value) else None
+
+    try:
+        value = read_shared()
+        if value is not None:
+            return value
+        lock = get_redis_client().lock(f"{get_shared_key(name)}:lock", timeout=SHARED_CACHE_LOCK_SECONDS,
+                                       blocking_timeout=SHARED_CACHE_WAIT_SECONDS)
+        acquired = lock.acquire()
+    except redis.RedisError as e:
+        logger.warning(f"Shared cache unavailable, computing {name} locally: {e}")
+        return compute()
+    if not acquired:
+        logger.warning(f"Timed out waiting for another worker to compute {name}, computing it locally")
+        return compute()
+
+    try:
+        try:
+            # Another worker may have published it while this one was waiting for the lock
+            value = read_shared()
+            if value is not None:
+                logger.info(f"Using {name} computed by another worker")
+                return value
+        except redis.RedisError as e:
+            logger.warning(f"Could not read shared value {name}: {e}")
+        value = compute()
+        try:
+            get_redis_client().set(get_shared_key(name), encode(value), ex=ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Could not publish shared value {name}: {e}")
+        return value
+    finally:
+        try:
+            lock.release()
+        except redis.RedisError:
+            pass  # The lock expired while computing; it is free again either way
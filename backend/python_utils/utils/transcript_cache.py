@@ -0,0 +1,141 @@
+"""
+TranscriptCache - Parsed transcripts by content hash, so uploading the same PDF again skips parse_transcript.
+A bounded in-process LRU sits in front of Redis (with REDIS_URL), which shares entries between workers.
+Transcripts hold personal data: entries expire after a short TTL in both tiers, and keys are derived only
+from the SHA-256 of the PDF bytes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+import redis
+from .concordia_api_utils import get_redis_client
+from .logging_utils import get_logger
+
+TRANSCRIPT_CACHE_PREFIX = "transcript_cache:v1"
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE", "true").lower() in ("1", "true", "yes")
+TRANSCRIPT_CACHE_REDIS = os.getenv("TRANSCRIPT_CACHE_REDIS", "true").lower() in ("1", "true", "yes")
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "256"))
+TRANSCRIPT_CACHE_TTL_SECONDS = int(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", "900"))
+
+logger = get_logger("TranscriptCache")
+
+def transcript_digest(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+class TranscriptCache:
+    """
+    Parsed transcript dicts by PDF digest, stored as JSON so every hit returns a fresh copy.
+    stats counts local hits, Redis hits, misses and bypassed lookups.
+    """
+
+    def __init__(self, max_entries: int = TRANSCRIPT_CACHE_MAX_ENTRIES, ttl_seconds: int = TRANSCRIPT_CACHE_TTL_SECONDS,
+                 enabled: bool = TRANSCRIPT_CACHE_ENABLED, use_redis: bool = TRANSCRIPT_CACHE_REDIS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and max_entries > 0 and ttl_seconds > 0
+        self.use_redis = use_redis
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "bypassed": 0}
+
+    def get(self, digest: str) -> Optional[dict]:
+        """Returns the parsed transcript stored for digest, or None."""
+        if not self.enabled:
+            return None
+        payload = self._get_local(digest)
+        if payload is not None:
+            self._count("local_hits")
+            return json.loads(payload)
+        entry = self._get_redis(digest)
+        if entry is not None:
+            payload, ttl_seconds = entry
+            self._count("redis_hits")
+            # Kept locally only as long as Redis still keeps it, so the transcript never outlives its TTL
+            self._put_local(digest, payload, ttl_seconds)
+            return json.loads(payload)
+        self._count("misses")
+        return None
+
+    def put(self, digest: str, parsed_data: dict) -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps(parsed_data, separators=(",", ":")).encode()
+        self._put_local(digest, payload)
+        if self._redis_enabled():
+            try:
+                get_redis_client().set(self._redis_key(digest), payload, ex=self.ttl_seconds)
+            except redis.RedisError as e:
+                logger.warning(f"Could not store parsed transcript in Redis: {e}")
+
+    def get_or_parse(self, pdf_bytes: bytes, parse: Callable[[bytes], Any], bypass: bool = False) -> dict:
+        """Returns the cached parse of pdf_bytes, or parse()s and stores it. bypass skips the cache entirely."""
+        if bypass or not self.enabled:
+            self.count_bypassed()
+            return parse(pdf_bytes)
+        digest = transcript_digest(pdf_bytes)
+        parsed_data = self.get(digest)
+        if parsed_data is None:
+            parsed_data = parse(pdf_bytes)
+            self.put(digest, parsed_data)
+        return parsed_data
+
+    def count_bypassed(self) -> None:
+        self._count("bypassed")
+
+    def clear(self) -> None:
+        """Drops the local entries; Redis entries expire on their own."""
+        with self._lock:
+            self._entries.clear()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _get_local(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return payload
+
+    def _put_local(self, digest: str, payload: bytes, ttl_seconds: Optional[float] = None) -> None:
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + ttl_seconds, payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_enabled(self) -> bool:
+        return self.use_redis and bool(os.getenv("REDIS_URL"))
+
+    def _redis_key(self, digest: str) -> str:
+        return f"{TRANSCRIPT_CACHE_PREFIX}:{digest}"
+
+    def _get_redis(self, digest: str) -> Optional[tuple[bytes, Optional[float]]]:
+        """Returns the payload stored in Redis with its remaining TTL in seconds (None if it has none), or None."""
+        if not self._redis_enabled():
+            return None
+        key = self._redis_key(digest)
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            payload, ttl_ms = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not read parsed transcript from Redis: {e}")
+            return None
+        if payload is None:
+            return None
+        # PTTL is -1 for a key without expiry
+        return payload, ttl_ms / 1000 if ttl_ms >= 0 else None
@@ -0,0 +1,33 @@
+"""
+UploadUtils - Size-capped reads of uploaded files.
+Uploads are read in chunks into a single growing buffer and abandoned as soon as they pass the cap, so an
+oversized file never gets fully buffered and a file under it is held exactly once.
+"""
+
+from typing import BinaryIO
+
+READ_CHUNK_BYTES = 256 * 1024
+
+class UploadTooLargeError(ValueError):
+    pass
+
+def read_limited(stream: BinaryIO, max_bytes: int, name: str = "Upload") -> bytearray:
+    """
+    Returns the rest of stream as a bytearray, raising UploadTooLargeError once it passes max_bytes.
+    Wrap the result in a memoryview to hand it to PyMuPDF without copying it.
+    """
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(min(READ_CHUNK_BYTES, max_bytes + 1 - len(buffer)))
+        if not chunk:
+            return buffer
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise UploadTooLargeError(f"{name} is larger than the {format_size(max_bytes)} limit")
+
+def format_size(num_bytes: int) -> str:
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):g} MB"
+    if num_bytes >= 1024:
+        return f"{num_bytes / 1024:g} KB"
+    return f"{num_bytes} bytes"
@@ -3,26 +3,71 @@ WebUtils - Web scraping and HTTP utilities module.
 Provides common functionality for web requests, parsing, and data extraction.
 """
 
+import os
 import requests
 import time
 import random
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
 from .logging_utils import get_logger
 
+# Politeness limits applied per host to every request made through get()
+max_requests_per_host = int(os.getenv("SCRAPER_MAX_REQUESTS_PER_HOST", "4"))
+min_request_interval = float(os.getenv("SCRAPER_MIN_REQUEST_INTERVAL", "0"))  # seconds between request starts
+
 session = requests.Session()
 default_headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 session.headers.update(default_headers)
+# Keep one pooled connection per concurrent request instead of reopening them
+_adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, max_requests_per_host))
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
 
 # Retry settings
 max_retries = 3
 retry_delay = 1.0
 logger = get_logger("WebUtils")
 
-def get(url: str) -> requests.Response:
+_host_limits_lock = threading.Lock()
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_next_start: dict[str, float] = {}
+_request_count = 0
+
+@contextmanager
+def _host_slot(url: str):
+    """
+    Holds one of the max_requests_per_host slots of the URL's host for the duration of a request,
+    and spaces request starts to the same host at least min_request_interval apart.
+    """
+    global _request_count
+    host = urlsplit(url).netloc
+    with _host_limits_lock:
+        _request_count += 1
+        semaphore = _host_semaphores.setdefault(host, threading.BoundedSemaphore(max(1, max_requests_per_host)))
+    with semaphore:
+        with _host_limits_lock:
+            now = time.monotonic()
+            start_at = max(now, _host_next_start.get(host, now))
+            _host_next_start[host] = start_at + min_request_interval
+        if start_at > now:
+            time.sleep(start_at - now)
+        yield
+
+def get_request_count() -> int:
+    """Number of requests (including retries) made through get() since the process started."""
+    return _request_count
+
+def get(url: str, headers: Optional[dict] = None) -> requests.Response:
+    kwargs = {"headers": headers} if headers else {}
     for attempt in range(max_retries + 1):
         try:
-            response = session.get(url, timeout=60)
+            with _host_slot(url):
+                response = session.get(url, timeout=60, **kwargs)
             response.raise_for_status()
             return response
             
@@ -42,14 +87,43 @@ def get_json(url: str) -> dict:
     response = get(url)
     return response.json()
 
-def download_file(url: str, file_path: str) -> bool:
+def download_file(url: str, file_path: str, validators: Optional[dict] = None) -> bool:
+    """
+    Downloads the file at url to file_path.
+
+    If validators is given, the request is conditional on the 'etag' / 'last_modified' values it holds
+    from a previous download, and it is updated in place:
+      - 'modified' is False if the server answered 304 Not Modified (file_path is left untouched)
+      - otherwise 'modified' is True and 'etag', 'last_modified' and the 'sha256' of the content are refreshed
+    """
     try:
-        response = get(url)
-        
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        response = get(url, headers=headers) if headers else get(url)
+
+        if validators is not None and response.status_code == 304:
+            validators["modified"] = False
+            logger.info(f"Not modified: {url} -> {file_path}")
+            return True
+
+        digest = hashlib.sha256()
         with open(file_path, 'wb') as f:
             for chunk in response.iter_content(chunk_size=8192):
                 if chunk:
                     f.write(chunk)
+                    digest.update(chunk)
+
+        if validators is not None:
+            validators.update(
+                modified=True,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                sha256=digest.hexdigest(),
+            )
         
         logger.info(f"Downloaded: {url} -> {file_path}")
         return True
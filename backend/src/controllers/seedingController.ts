@@ -2,7 +2,10 @@ import { degreeController } from '@controllers/degreeController';
 import { coursepoolController } from '@controllers/coursepoolController';
 import { courseController } from '@controllers/courseController';
 import { CourseData } from '@trackmydegree/shared';
-import { getDegreeNames, parseDegree, parseAllDegrees, getAllCourses, ParseDegreeResponse } from '@utils/pythonUtilsApi';
+import { getDegreeNames, parseDegree, streamAllDegrees, streamAllCourses, ParseDegreeResponse } from '@utils/pythonUtilsApi';
+
+// Courses written to the database per bulk upsert while they stream in
+const COURSE_SEED_BATCH_SIZE = 500;
 
 /* Seed degree data (without courses) in the database */
 export async function seedDegreeData(degreeName: string): Promise<string> {
@@ -26,13 +29,12 @@ export async function seedDegreeData(degreeName: string): Promise<string> {
 export async function seedAllDegreeData(): Promise<string> {
   
   console.log('Starting seeding process for all degrees...');
-  const allDegreeRequirements: ParseDegreeResponse[] = await parseAllDegrees();
-  const allCourses: CourseData[] = await getAllCourses();
   
   let successCount = 0;
   let failCount = 0;
 
-  for (const degreeData of allDegreeRequirements) {
+  // Each degree is saved as soon as the Python service has scraped it
+  for await (const degreeData of streamAllDegrees()) {
     const degreeName = degreeData.degree._id;
     console.log(`Processing degree: ${degreeName}`);
     
@@ -48,7 +50,17 @@ export async function seedAllDegreeData(): Promise<string> {
 
   let coursesSeeded = true;
   try {
-    await saveCoursesToDB(allCourses);
+    let batch: CourseData[] = [];
+    for await (const course of streamAllCourses()) {
+      batch.push(course);
+      if (batch.length >= COURSE_SEED_BATCH_SIZE) {
+        await saveCoursesToDB(batch);
+        batch = [];
+      }
+    }
+    if (batch.length > 0) {
+      await saveCoursesToDB(batch);
+    }
     console.log('Successfully seeded all courses.');
   } catch (err: any) {
     coursesSeeded = false;
@@ -20,14 +20,29 @@ export interface CatalogSnapshotPayload {
   courses: unknown[];
 }
 
+// The Python service binds before its warm-up finishes and answers /ready with
+// 503 + Retry-After until every module can serve data.
+const PYTHON_SERVICE_READY_TIMEOUT_MS = 10 * 60 * 1000;
+
 export async function ensurePythonServiceReady(): Promise<void> {
-  try {
-    await axios.get(`${PYTHON_SERVICE_BASE_URL}/health`, { timeout: 50000 });
-  } catch (error) {
-    const message = error instanceof Error ? error.message : String(error);
-    throw new Error(
-      `Python scraper service is not reachable at ${PYTHON_SERVICE_BASE_URL}. ${message}`,
-    );
+  const deadline = Date.now() + PYTHON_SERVICE_READY_TIMEOUT_MS;
+  for (;;) {
+    try {
+      await axios.get(`${PYTHON_SERVICE_BASE_URL}/ready`, { timeout: 50000 });
+      return;
+    } catch (error) {
+      const retryAfter = axios.isAxiosError(error) && error.response?.status === 503
+        ? Number(error.response.headers['retry-after'])
+        : NaN;
+      if (Number.isFinite(retryAfter) && Date.now() + retryAfter * 1000 < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+        continue;
+      }
+      const message = error instanceof Error ? error.message : String(error);
+      throw new Error(
+        `Python scraper service is not ready at ${PYTHON_SERVICE_BASE_URL}. ${message}`,
+      );
+    }
   }
 }
 
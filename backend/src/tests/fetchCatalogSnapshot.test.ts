@@ -20,6 +20,16 @@ const mockParseAllDegrees = parseAllDegrees as jest.MockedFunction<
   typeof parseAllDegrees
 >;
 const mockParseDegree = parseDegree as jest.MockedFunction<typeof parseDegree>;
+
+const notReady = (retryAfter?: string) => ({
+  isAxiosError: true,
+  message: 'Request failed with status code 503',
+  response: {
+    status: 503,
+    headers: retryAfter === undefined ? {} : { 'retry-after': retryAfter },
+  },
+});
+
 describe('fetchCatalogSnapshot', () => {
   const academicYear = '2026-2027';
   const degreeId = 'COMP';
@@ -30,6 +40,9 @@ describe('fetchCatalogSnapshot', () => {
     mockGetAllCourses.mockResolvedValue([{ _id: 'COMP 248' }] as never);
     mockParseAllDegrees.mockResolvedValue([{ degree: { _id: 'COMP' } }] as never);
     mockParseDegree.mockResolvedValue({ degree: { _id: 'COMP' } } as never);
+    (mockAxios.isAxiosError as unknown as jest.Mock).mockImplementation(
+      (error) => Boolean(error?.isAxiosError),
+    );
   });
 
   it('checks scraper health and throws when unavailable', async () => {
@@ -37,13 +50,62 @@ describe('fetchCatalogSnapshot', () => {
 
     mockAxios.get.mockRejectedValueOnce(new Error('timeout'));
     await expect(ensurePythonServiceReady()).rejects.toThrow(
-      'Python scraper service is not reachable',
+      'Python scraper service is not ready',
     );
 
     mockAxios.get.mockRejectedValueOnce('timeout');
     await expect(ensurePythonServiceReady()).rejects.toThrow('timeout');
   });
 
+  it('polls /ready again after Retry-After while the service warms up', async () => {
+    jest.useFakeTimers();
+    try {
+      mockAxios.get
+        .mockRejectedValueOnce(notReady('30'))
+        .mockRejectedValueOnce(notReady('30'))
+        .mockResolvedValueOnce({ data: { ready: true } } as never);
+
+      const ready = ensurePythonServiceReady();
+      await jest.advanceTimersByTimeAsync(60 * 1000);
+
+      await expect(ready).resolves.toBeUndefined();
+      expect(mockAxios.get).toHaveBeenCalledTimes(3);
+      expect(mockAxios.get).toHaveBeenCalledWith(
+        expect.stringMatching(/\/ready$/),
+        expect.anything(),
+      );
+    } finally {
+      jest.useRealTimers();
+    }
+  });
+
+  it('gives up once waiting for Retry-After would pass the deadline', async () => {
+    jest.useFakeTimers();
+    try {
+      mockAxios.get.mockRejectedValue(notReady('240'));
+
+      const ready = ensurePythonServiceReady();
+      const rejection = expect(ready).rejects.toThrow(
+        'Python scraper service is not ready',
+      );
+      // Two 4-minute waits fit in the 10-minute deadline, a third does not
+      await jest.advanceTimersByTimeAsync(8 * 60 * 1000);
+
+      await rejection;
+      expect(mockAxios.get).toHaveBeenCalledTimes(3);
+    } finally {
+      jest.useRealTimers();
+    }
+  });
+
+  it('does not retry a 503 without Retry-After', async () => {
+    mockAxios.get.mockRejectedValueOnce(notReady());
+    await expect(ensurePythonServiceReady()).rejects.toThrow(
+      'Python scraper service is not ready',
+    );
+    expect(mockAxios.get).toHaveBeenCalledTimes(1);
+  });
+
   it('scrapes all degrees or one degree', async () => {
     const allPayload = await fetchCatalogSnapshot({ academicYear });
     expect(mockParseAllDegrees).toHaveBeenCalled();
@@ -1,6 +1,7 @@
 const axios = require('axios');
 const pythonUtilsApi = require('../utils/pythonUtilsApi');
 const Buffer = require('node:buffer').Buffer;
+const { Readable } = require('node:stream');
 
 // Mocks
 jest.mock('axios', () => ({
@@ -91,4 +92,39 @@ describe('pythonUtilsApi', () => {
       );
     });
   });
+
+  describe('streamAllDegrees', () => {
+    const collect = async (generator) => {
+      const items = [];
+      for await (const item of generator) {
+        items.push(item);
+      }
+      return items;
+    };
+
+    test('Yields one degree per NDJSON line', async () => {
+      const degrees = [{ degree: { _id: 'BEng' }, coursePools: [] }, { degree: { _id: 'BCompSc' }, coursePools: [] }];
+      axios.get.mockResolvedValue({ data: Readable.from([degrees.map((d) => JSON.stringify(d)).join('\n') + '\n']) });
+
+      const result = await collect(pythonUtilsApi.streamAllDegrees());
+      expect(result).toEqual(degrees);
+      expect(axios.get).toHaveBeenCalledWith(expect.stringContaining('/scrape-all-degrees/stream'), { responseType: 'stream' });
+    });
+
+    test('Throws when the stream ends with an error line', async () => {
+      const body = JSON.stringify({ degree: { _id: 'BEng' } }) + '\n' + JSON.stringify({ error: 'Error scraping degree data.' }) + '\n';
+      axios.get.mockResolvedValue({ data: Readable.from([body]) });
+
+      await expect(collect(pythonUtilsApi.streamAllDegrees())).rejects.toThrow(
+        'Failed to stream all degrees: Error scraping degree data.',
+      );
+    });
+
+    test('Fail to start the stream', async () => {
+      axios.get.mockRejectedValue(new Error('Network Error'));
+      await expect(collect(pythonUtilsApi.streamAllCourses())).rejects.toThrow(
+        'Failed to stream all courses: Network Error',
+      );
+    });
+  });
 });
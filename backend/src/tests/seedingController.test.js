@@ -31,6 +31,10 @@ describe('seedingController', () => {
     consoleWarnSpy = jest.spyOn(console, 'warn').mockImplementation();
   });
 
+  async function* streamOf(items) {
+    yield* items;
+  }
+
   afterEach(() => {
     jest.clearAllMocks();
     consoleLogSpy.mockRestore();
@@ -137,8 +141,8 @@ describe('seedingController', () => {
         { _id: 'SOEN 101', title: 'Intro to Software Engineering' },
       ];
 
-      pythonUtilsApi.parseAllDegrees.mockResolvedValue(mockDegreeData);
-      pythonUtilsApi.getAllCourses.mockResolvedValue(mockCourses);
+      pythonUtilsApi.streamAllDegrees.mockReturnValue(streamOf(mockDegreeData));
+      pythonUtilsApi.streamAllCourses.mockReturnValue(streamOf(mockCourses));
 
       DegreeControllerModule.degreeController.upsert.mockResolvedValue(true);
       CoursePoolControllerModule.coursepoolController.bulkCreateCoursePools.mockResolvedValue(true);
@@ -162,8 +166,8 @@ describe('seedingController', () => {
         { _id: 'SOEN 101', title: 'Intro to Software Engineering' },
       ];
 
-      pythonUtilsApi.parseAllDegrees.mockResolvedValue(mockDegreeData);
-      pythonUtilsApi.getAllCourses.mockResolvedValue(mockCourses);
+      pythonUtilsApi.streamAllDegrees.mockReturnValue(streamOf(mockDegreeData));
+      pythonUtilsApi.streamAllCourses.mockReturnValue(streamOf(mockCourses));
 
       DegreeControllerModule.degreeController.upsert
         .mockResolvedValueOnce(true)
@@ -189,8 +193,8 @@ describe('seedingController', () => {
         { _id: 'COMP 101', title: 'Intro to Programming' },
       ];
 
-      pythonUtilsApi.parseAllDegrees.mockResolvedValue(mockDegreeData);
-      pythonUtilsApi.getAllCourses.mockResolvedValue(mockCourses);
+      pythonUtilsApi.streamAllDegrees.mockReturnValue(streamOf(mockDegreeData));
+      pythonUtilsApi.streamAllCourses.mockReturnValue(streamOf(mockCourses));
 
       DegreeControllerModule.degreeController.upsert.mockResolvedValue(true);
       CoursePoolControllerModule.coursepoolController.bulkCreateCoursePools.mockResolvedValue(true);
@@ -204,5 +208,35 @@ describe('seedingController', () => {
       );
       expect(result).toBe('Seeding completed for all degrees. Success: 1, Failed: 0. Failed to seed courses.');
     });
+
+    it('saves streamed courses in batches', async () => {
+      const mockCourses = Array.from({ length: 501 }, (_, i) => ({ _id: `COMP ${i}`, title: `Course ${i}` }));
+
+      pythonUtilsApi.streamAllDegrees.mockReturnValue(streamOf([]));
+      pythonUtilsApi.streamAllCourses.mockReturnValue(streamOf(mockCourses));
+      CourseControllerModule.courseController.bulkCreateCourses.mockResolvedValue(true);
+
+      const result = await seedAllDegreeData();
+
+      expect(CourseControllerModule.courseController.bulkCreateCourses).toHaveBeenCalledTimes(2);
+      expect(CourseControllerModule.courseController.bulkCreateCourses).toHaveBeenNthCalledWith(1, mockCourses.slice(0, 500));
+      expect(CourseControllerModule.courseController.bulkCreateCourses).toHaveBeenNthCalledWith(2, mockCourses.slice(500));
+      expect(result).toBe('Seeding completed for all degrees. Success: 0, Failed: 0. All courses seeded successfully.');
+    });
+
+    it('reports a course stream failure as a course seeding failure', async () => {
+      async function* failingStream() {
+        yield { _id: 'COMP 101', title: 'Intro to Programming' };
+        throw new Error('Failed to stream all courses: boom');
+      }
+
+      pythonUtilsApi.streamAllDegrees.mockReturnValue(streamOf([]));
+      pythonUtilsApi.streamAllCourses.mockReturnValue(failingStream());
+
+      const result = await seedAllDegreeData();
+
+      expect(consoleErrorSpy).toHaveBeenCalledWith('Failed to seed courses', expect.any(Error));
+      expect(result).toBe('Seeding completed for all degrees. Success: 0, Failed: 0. Failed to seed courses.');
+    });
   });
 });
\ No newline at end of file
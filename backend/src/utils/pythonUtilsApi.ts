@@ -3,6 +3,7 @@ import { ParsedData } from '../types/transcript';
 import { PYTHON_SERVICE_BASE_URL } from '@utils/constants';
 import axios from 'axios';
 import FormData from 'form-data';
+import readline from 'node:readline';
 import redisClient from '@lib/redisClient'; // import the Redis client instance
 
 export interface ParseDegreeResponse {
@@ -88,6 +89,51 @@ export async function getAllCourses(): Promise<CourseData[]> {
   }
 }
 
+/**
+ * Read an NDJSON response from the Python service, yielding each item as soon as its line arrives
+ * @param path - Streaming endpoint of the Python service
+ * @param failureMessage - Prefix of the errors thrown by the request or by an error line ending the stream
+ */
+async function* streamNdjson<T>(path: string, failureMessage: string): AsyncGenerator<T> {
+  let response;
+  try {
+    response = await axios.get(`${PYTHON_SERVICE_BASE_URL}${path}`, { responseType: 'stream' });
+  } catch (error: any) {
+    if (error.response) {
+      const status = error.response?.status;
+      throw new Error(`${failureMessage}: status=${status}, message=${error.message}`);
+    }
+    throw new Error(`${failureMessage}: ${error.message || error}`);
+  }
+
+  const lines = readline.createInterface({ input: response.data, crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    const item = JSON.parse(line);
+    // The service reports a failure after the response has started as a final {"error": ...} line
+    if (item?.error) {
+      throw new Error(`${failureMessage}: ${item.error}`);
+    }
+    yield item as T;
+  }
+}
+
+/**
+ * Stream all degrees from the Python service, one degree at a time as each is scraped
+ * @returns Async generator of parsed degree data
+ */
+export function streamAllDegrees(): AsyncGenerator<ParseDegreeResponse> {
+  return streamNdjson<ParseDegreeResponse>('/scrape-all-degrees/stream', 'Failed to stream all degrees');
+}
+
+/**
+ * Stream all courses from the Python service, one course at a time
+ * @returns Async generator of course data
+ */
+export function streamAllCourses(): AsyncGenerator<CourseData> {
+  return streamNdjson<CourseData>('/get-all-courses/stream', 'Failed to stream all courses');
+}
+
 export async function getCourseSchedule(subject: string, catalog: string): Promise<CourseData[]> {
   const courseCode = `${subject}${catalog}`;
 